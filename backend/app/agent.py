@@ -5,18 +5,38 @@ This module defines tools for searching, retrieving, and comparing universities,
 using the existing backend services and database for data access.
 """
 
-import json
-from typing import Optional
-
+import functools
+import inspect
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 from langchain_openai import ChatOpenAI
 from langchain_core.tools import tool
 from langgraph.prebuilt import create_react_agent
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.core import metrics
+from app.core.cache import TTLCache
+from app.core.catalog import get_catalog_version
+from app.core.config import get_settings
+from app.core.encoding import encode_tool_output
 from app.core.database import SessionLocal
+from app.core.timeouts import StatementBudget
 from app.models import Country, Exam, Program
-from app.services.university_service import UniversityFilters, UniversityService
+from app.services.university_service import (
+    FieldSelection,
+    UniversityFilters,
+    UniversityService,
+)
 
 
 def _get_session() -> Session:
@@ -24,6 +44,179 @@ def _get_session() -> Session:
     return SessionLocal()
 
 
+# Columns and related data each tool renders; nothing else is loaded.
+_LIST_VIEW = FieldSelection(
+    fields=frozenset({"name", "city"}), include=frozenset({"country", "programs_count"})
+)
+_DESCRIPTION_VIEW = FieldSelection(
+    fields=frozenset({"name", "city", "description"}), include=frozenset({"country"})
+)
+_DETAIL_VIEW = FieldSelection(
+    fields=frozenset({"name", "city", "description"}), include=frozenset({"country", "programs"})
+)
+
+# Comparisons load in a constant number of queries; the cap only bounds prompt size.
+MAX_COMPARE_UNIVERSITIES = 10
+
+_settings = get_settings()
+_tool_cache: TTLCache[str] = TTLCache(
+    maxsize=_settings.tool_cache_maxsize,
+    ttl=_settings.tool_cache_ttl_seconds,
+)
+metrics.register_provider(
+    "tool_cache",
+    lambda: {**_tool_cache.stats.as_dict(), "size": len(_tool_cache)},
+)
+
+
+def _normalize_arg(value: Any) -> Any:
+    """Normalize a tool argument so equivalent calls share a cache key."""
+    if isinstance(value, str):
+        return value.strip().lower() or None
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize_arg(item) for item in value)
+    return value
+
+
+def _cached_tool(func):
+    """Cache a tool's output keyed by catalog version and normalized arguments."""
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = (
+            get_catalog_version(),
+            func.__name__,
+            tuple((name, _normalize_arg(value)) for name, value in bound.arguments.items()),
+        )
+        return _tool_cache.get_or_set(key, lambda: func(*args, **kwargs))
+
+    return wrapper
+
+
+# Prefix of answers cut short by a turn budget.
+PARTIAL_ANSWER_MARKER = "[partial answer]"
+_EXHAUSTED_REASONS = {
+    "deadline": "the time limit for this answer was reached",
+    "steps": "the reasoning step limit for this answer was reached",
+    "tool_calls": "the lookup limit for this answer was reached",
+}
+
+
+@dataclass(eq=False)
+class TurnBudget:
+    """Deadline and step/tool-call limits shared by one chat turn.
+
+    Model calls and tools check it before running and receive the remaining
+    time as their timeout. ``exhausted`` names the first limit that ran out.
+    """
+
+    deadline: float  # time.monotonic() value
+    max_steps: int
+    max_tool_calls: int
+    steps: int = 0
+    tool_calls: int = 0
+    exhausted: Optional[str] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline (never negative)."""
+        return max(self.deadline - time.monotonic(), 0.0)
+
+    def expire(self, reason: str) -> None:
+        with self._lock:
+            self.exhausted = self.exhausted or reason
+
+    def begin_step(self) -> bool:
+        """Claim one model call; ``False`` once time or steps are used up."""
+        return self._claim("steps", self.max_steps)
+
+    def claim_tool_call(self) -> bool:
+        """Claim one tool call; ``False`` once time or tool calls are used up."""
+        return self._claim("tool_calls", self.max_tool_calls)
+
+    def _claim(self, counter: str, limit: int) -> bool:
+        with self._lock:
+            if self.remaining() <= 0:
+                self.exhausted = self.exhausted or "deadline"
+                return False
+            if getattr(self, counter) >= limit:
+                self.exhausted = self.exhausted or counter
+                return False
+            setattr(self, counter, getattr(self, counter) + 1)
+            return True
+
+
+_turn_budget: ContextVar[Optional[TurnBudget]] = ContextVar("turn_budget", default=None)
+
+
+@contextmanager
+def turn_budget(
+    seconds: Optional[float] = None,
+    max_steps: Optional[int] = None,
+    max_tool_calls: Optional[int] = None,
+) -> Iterator[TurnBudget]:
+    """Limit agent runs inside this context; defaults come from the settings."""
+    budget = TurnBudget(
+        deadline=time.monotonic() + (_settings.chat_turn_deadline_seconds if seconds is None else seconds),
+        max_steps=_settings.chat_max_agent_steps if max_steps is None else max_steps,
+        max_tool_calls=_settings.chat_max_tool_calls if max_tool_calls is None else max_tool_calls,
+    )
+    token = _turn_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _turn_budget.reset(token)
+
+
+def _timed_tool(func):
+    """Run a tool under a deadline and return an error payload if it overruns.
+
+    The tool runs inline on the caller's thread (LangGraph's tool pool), so a
+    call never holds a second thread. The deadline is enforced by a statement
+    budget: statements running past it are interrupted and later ones fail,
+    which ends the tool. Tools do their heavy lifting in SQL; Python work
+    between statements is not interrupted.
+
+    Inside a turn budget the call counts against the tool-call limit and its
+    timeout shrinks to the time left.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        budget = _turn_budget.get()
+        timeout = _settings.tool_timeout_seconds
+        if budget is not None:
+            if not budget.claim_tool_call():
+                metrics.increment("tool.budget_refusals")
+                return _encode({
+                    "error": f"Not run: {_EXHAUSTED_REASONS[budget.exhausted]}.",
+                    "tip": "Answer now with the results you already have."
+                })
+            timeout = min(timeout, budget.remaining())
+        statements = StatementBudget(timeout, deadline=time.monotonic() + timeout)
+        try:
+            with statements.applied():
+                return func(*args, **kwargs)
+        except Exception as exc:
+            if statements.outcome(exc) != "timeout":
+                raise
+            metrics.increment("tool.timeouts")
+            return _encode({
+                "error": f"{func.__name__} timed out after {timeout:g}s.",
+                "tip": "Try narrower filters or fewer IDs."
+            })
+
+    return wrapper
+
+
+def _encode(payload: dict, count_key: Optional[str] = None) -> str:
+    """Encode a tool payload compactly within the configured token budget."""
+    return encode_tool_output(payload, token_budget=_settings.tool_output_token_budget, count_key=count_key)
+
+
 def _serialize_university_list(universities, program_counts: dict) -> list[dict]:
     """Convert University ORM objects to serializable dicts for list view."""
     return [
@@ -68,6 +261,8 @@ def _serialize_university_detail(university) -> dict:
 
 
 @tool
+@_timed_tool
+@_cached_tool
 def get_available_filters() -> str:
     """
     Get all available filter options: countries, programs, and exams.
@@ -84,7 +279,7 @@ def get_available_filters() -> str:
         programs = session.scalars(select(Program).order_by(Program.name)).all()
         exams = session.scalars(select(Exam).order_by(Exam.name)).all()
 
-        return json.dumps({
+        return _encode({
             "countries": [
                 {"code": c.code, "name": c.name}
                 for c in countries
@@ -97,13 +292,15 @@ def get_available_filters() -> str:
                 {"id": e.id, "name": e.name}
                 for e in exams
             ]
-        }, indent=2)
+        })
 
     finally:
         session.close()
 
 
 @tool
+@_timed_tool
+@_cached_tool
 def search_universities(
     country: Optional[str] = None,
     program: Optional[str] = None,
@@ -119,7 +316,7 @@ def search_universities(
         program: Filter by program name (e.g., "Computer Science", "Medicine")
         exam: Filter by exam name (e.g., "SAT", "IELTS", "TOEFL")
         min_score: Filter by minimum required exam score
-        query: Search university name (case-insensitive substring match)
+        query: Search university name; tolerates typos and ranks the closest names first
 
     Returns:
         JSON string with matching universities or suggestions if none found.
@@ -133,30 +330,78 @@ def search_universities(
             exam=exam,
             min_score=min_score,
             query=query,
+            fuzzy=bool(query),
             page=1,
             limit=20
         )
-        universities, program_counts, total = service.list_universities(filters)
+        universities, program_counts, total = service.list_universities(filters, _LIST_VIEW)
 
         if not universities:
-            return json.dumps({
+            return _encode({
                 "found": 0,
                 "message": "No universities match your criteria.",
                 "tip": "Use get_available_filters to see valid country codes, programs, and exams."
-            }, indent=2)
+            })
 
         results = _serialize_university_list(universities, program_counts)
-        return json.dumps({
+        return _encode({
             "found": total,
             "showing": len(results),
             "universities": results
-        }, indent=2)
+        }, count_key="showing")
 
     finally:
         session.close()
 
 
 @tool
+@_timed_tool
+@_cached_tool
+def search_by_description(text: str, limit: int = 10) -> str:
+    """
+    Find universities whose description, name and programs best match free text.
+
+    Args:
+        text: What the student is looking for (e.g., "strong in research", "engineering school by the sea")
+        limit: Maximum number of results (1-20)
+
+    Returns:
+        JSON string with the best matching universities, their descriptions and similarity scores.
+    """
+    session = _get_session()
+    try:
+        service = UniversityService(session)
+        hits = service.search_text(text, limit=max(1, min(limit, 20)), selection=_DESCRIPTION_VIEW)
+
+        if not hits:
+            return _encode({
+                "found": 0,
+                "message": "No university descriptions match that text.",
+                "tip": "Try other wording or use search_universities with filters."
+            })
+
+        return _encode({
+            "found": len(hits),
+            "universities": [
+                {
+                    "id": university.id,
+                    "name": university.name,
+                    "city": university.city,
+                    "country_code": university.country.code if university.country else None,
+                    "description": university.description,
+                    "score": round(score, 3),
+                }
+                for university, score in hits
+            ]
+        })
+
+    finally:
+        session.close()
+
+
+@tool
+@_timed_tool
+@_cached_tool
 def get_university(university_id: int) -> str:
     """
     Get detailed information about a specific university by its ID.
@@ -170,21 +415,23 @@ def get_university(university_id: int) -> str:
     session = _get_session()
     try:
         service = UniversityService(session)
-        university = service.get_university(university_id)
+        university = service.get_university(university_id, _DETAIL_VIEW)
 
         if not university:
-            return json.dumps({
+            return _encode({
                 "error": f"University with ID {university_id} not found.",
                 "tip": "Use search_universities to find valid university IDs."
-            }, indent=2)
+            })
 
-        return json.dumps(_serialize_university_detail(university), indent=2)
+        return _encode(_serialize_university_detail(university))
 
     finally:
         session.close()
 
 
 @tool
+@_timed_tool
+@_cached_tool
 def compare_universities(university_ids: list[int]) -> str:
     """
     Compare multiple universities side by side.
@@ -195,30 +442,28 @@ def compare_universities(university_ids: list[int]) -> str:
     Returns:
         JSON string with comparison of universities including programs and requirements.
     """
+    university_ids = list(dict.fromkeys(university_ids))
     if len(university_ids) < 2:
-        return json.dumps({"error": "Please provide at least 2 university IDs to compare."})
+        return _encode({"error": "Please provide at least 2 university IDs to compare."})
 
-    if len(university_ids) > 5:
-        return json.dumps({"error": "Please compare at most 5 universities at a time."})
+    if len(university_ids) > MAX_COMPARE_UNIVERSITIES:
+        return _encode({
+            "error": f"Please compare at most {MAX_COMPARE_UNIVERSITIES} universities at a time."
+        })
 
     session = _get_session()
     try:
         service = UniversityService(session)
-        found = []
-        not_found = []
-
-        for uid in university_ids:
-            university = service.get_university(uid)
-            if university:
-                found.append(_serialize_university_detail(university))
-            else:
-                not_found.append(uid)
+        universities = service.get_universities(university_ids, _DETAIL_VIEW)
+        found = [_serialize_university_detail(u) for u in universities]
+        found_ids = {u.id for u in universities}
+        not_found = [uid for uid in university_ids if uid not in found_ids]
 
         if not found:
-            return json.dumps({
+            return _encode({
                 "error": "None of the provided IDs were found.",
                 "tip": "Use search_universities to find valid university IDs."
-            }, indent=2)
+            })
 
         comparison = {
             "universities_compared": len(found),
@@ -228,14 +473,20 @@ def compare_universities(university_ids: list[int]) -> str:
         if not_found:
             comparison["not_found_ids"] = not_found
 
-        return json.dumps(comparison, indent=2)
+        return _encode(comparison)
 
     finally:
         session.close()
 
 
 # All available tools
-TOOLS = [get_available_filters, search_universities, get_university, compare_universities]
+TOOLS = [
+    get_available_filters,
+    search_universities,
+    search_by_description,
+    get_university,
+    compare_universities,
+]
 
 
 SYSTEM_PROMPT = """You are a helpful university admissions assistant. Your job is to help students find and compare universities based on their preferences and qualifications.
@@ -249,43 +500,135 @@ You have access to these tools:
    - program: Program name (e.g., "Computer Science", "Medicine")
    - exam: Exam name (e.g., "SAT", "IELTS", "TOEFL")
    - min_score: Minimum exam score requirement
-   - query: Search by university name
+   - query: Search by university name (typos are tolerated)
+
+3. **search_by_description** - Find universities matching free text such as "strong in research" or "business school", ranked by similarity of their descriptions and programs
 
-3. **get_university** - Get full details by numeric ID (includes programs and exam requirements)
+4. **get_university** - Get full details by numeric ID (includes programs and exam requirements)
 
-4. **compare_universities** - Compare 2-5 universities side by side
+5. **compare_universities** - Compare 2-10 universities side by side
 
 IMPORTANT RULES:
 - ALWAYS use tools to look up information. Never guess or make up data.
 - If user asks what countries/programs/exams are available, use get_available_filters.
 - Use search_universities to find matching universities and their IDs.
+- For qualitative questions (reputation, focus, atmosphere), use search_by_description instead of fetching many full records.
 - Use get_university with the numeric ID to get detailed requirements.
 - If no results found, use get_available_filters to suggest valid options.
+- Tool results are compact JSON. Lists of records may be tables with "columns" and "rows"; a "truncated" note means more results exist, so narrow the filters if needed.
+- When you need several independent lookups (e.g. details for multiple IDs), request them in the same step; they run in parallel.
 - Be concise but helpful. Format results clearly for easy reading.
 - When comparing, highlight key differences (location, programs, requirements)."""
 
 
-def create_university_agent(openai_api_key: str, model: str = "gpt-4o-mini"):
+def create_chat_model(
+    provider: str = "openai",
+    openai_api_key: str = "",
+    model: str = "gpt-4o-mini",
+    fake_latency_ms: float = 0.0,
+) -> BaseChatModel:
     """
-    Create a LangChain agent with university tools.
+    Create the chat model for the configured provider.
 
     Args:
-        openai_api_key: OpenAI API key for the LLM
-        model: Model name to use (default: gpt-4o-mini)
+        provider: "openai" for the hosted model or "fake" for the scripted local model
+        openai_api_key: OpenAI API key (openai provider only)
+        model: Model name to use (openai provider only)
+        fake_latency_ms: Simulated per-call latency (fake provider only)
 
     Returns:
-        Agent ready to handle user queries
+        Chat model supporting tool calls
     """
-    llm = ChatOpenAI(
+    if provider == "fake":
+        from app.fake_llm import ScriptedChatModel
+
+        return ScriptedChatModel(latency_ms=fake_latency_ms)
+
+    if provider != "openai":
+        raise ValueError(f"Unknown LLM provider: {provider}")
+
+    return ChatOpenAI(
         model=model,
         temperature=0,
         api_key=openai_api_key
     )
 
+
+def _partial_answer(messages: list[BaseMessage], reason: str) -> AIMessage:
+    """Best answer available when the turn budget runs out: drafts plus tool findings."""
+    turn_start = max((i for i, m in enumerate(messages) if m.type == "human"), default=-1) + 1
+    turn = messages[turn_start:]
+    drafts = [str(m.content) for m in turn if m.type == "ai" and m.content]
+    findings = [
+        str(m.content)[:600] for m in turn if m.type == "tool" and not str(m.content).startswith('{"error"')
+    ]
+
+    parts = [f"{PARTIAL_ANSWER_MARKER} I stopped early because {_EXHAUSTED_REASONS[reason]}."]
+    if drafts:
+        parts.append(drafts[-1])
+    if findings:
+        parts.append("Here is what I found so far:\n" + "\n".join(findings[-3:]))
+    if not drafts and not findings:
+        parts.append("I did not get any results yet. Please try again or ask a narrower question.")
+    return AIMessage(content="\n\n".join(parts))
+
+
+def _budgeted_model(llm: BaseChatModel) -> RunnableLambda:
+    """Wrap the tool-bound model so every call respects the current turn budget.
+
+    Out of time or steps, the call is replaced by a partial answer, which ends
+    the agent loop. Otherwise the remaining time is passed as the request
+    timeout, and a call that overruns the deadline also yields a partial answer.
+    """
+    bound = llm.bind_tools(TOOLS)
+
+    def call(messages: list[BaseMessage], config: RunnableConfig) -> AIMessage:
+        budget = _turn_budget.get()
+        if budget is None:
+            return bound.invoke(messages, config)
+        if not budget.begin_step():
+            return _partial_answer(messages, budget.exhausted)
+        try:
+            return bound.invoke(messages, config, timeout=budget.remaining())
+        except Exception:
+            if budget.remaining() > 0:
+                raise
+            budget.expire("deadline")
+            return _partial_answer(messages, "deadline")
+
+    return RunnableLambda(call, name="budgeted_model")
+
+
+def create_university_agent(
+    openai_api_key: str = "",
+    model: str = "gpt-4o-mini",
+    llm: Optional[BaseChatModel] = None,
+):
+    """
+    Create a LangChain agent with university tools.
+
+    Runs inside ``turn_budget()`` stop at its deadline, step limit and
+    tool-call limit and end with a partial answer marked with
+    ``PARTIAL_ANSWER_MARKER``.
+
+    Args:
+        openai_api_key: OpenAI API key for the LLM
+        model: Model name to use (default: gpt-4o-mini)
+        llm: Pre-built chat model; overrides the OpenAI defaults when given
+
+    Returns:
+        Agent ready to handle user queries
+    """
+    if llm is None:
+        llm = create_chat_model(openai_api_key=openai_api_key, model=model)
+
+    budgeted = _budgeted_model(llm)
     agent = create_react_agent(
-        model=llm,
+        model=lambda state, runtime: budgeted,
         tools=TOOLS,
         prompt=SYSTEM_PROMPT,
     )
 
-    return agent
+    # Independent tool calls from one model step run concurrently (results keep
+    # their original order); this bounds how many run at once per turn.
+    return agent.with_config(max_concurrency=_settings.tool_max_parallel_calls)
@@ -0,0 +1,163 @@
+"""Admin endpoints for batch operations."""
+
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.database import get_db_session
+from app.core.security import require_admin
+from app.schemas import BulkUniversityItem, BulkUniversityRequest, BulkUniversityResponse
+from app.services.catalog_writer import (
+    WRITABLE_FIELDS,
+    ProgramWrite,
+    UniversityWrite,
+    apply_university_writes,
+)
+from app.services.cohort import CohortJob, CohortJobRegistry
+from app.services.matching import get_requirement_matrix
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+_settings = get_settings()
+_cohort_jobs = CohortJobRegistry(
+    Path(_settings.cohort_job_dir or Path(tempfile.gettempdir()) / "cohort_jobs"),
+    workers=_settings.cohort_workers,
+    ttl_seconds=_settings.cohort_job_ttl_seconds,
+)
+
+
+class CohortJobSchema(BaseModel):
+    """Polling view of a cohort matching job."""
+
+    id: str
+    status: str
+    students: int
+    matches: int
+    elapsed_seconds: float
+    students_per_second: float
+    error: str | None = None
+    result_url: str | None = None
+
+
+def _job_schema(job: CohortJob) -> CohortJobSchema:
+    return CohortJobSchema(
+        id=job.id,
+        status=job.status,
+        students=job.stats.students,
+        matches=job.stats.matches,
+        elapsed_seconds=round(job.stats.elapsed_seconds, 3),
+        students_per_second=round(job.stats.students_per_second, 1),
+        error=job.error,
+        result_url=f"/api/admin/cohort-match/{job.id}/result" if job.status == "completed" else None,
+    )
+
+
+def _upload_too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413, detail=f"Cohort CSV is larger than {max_bytes} bytes"
+    )
+
+
+def _get_job(job_id: str) -> CohortJob:
+    job = _cohort_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
+
+
+@router.post(
+    "/cohort-match",
+    response_model=CohortJobSchema,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def start_cohort_match(
+    request: Request,
+    session: Session = Depends(get_db_session),
+) -> CohortJobSchema:
+    """Start matching a cohort CSV sent as the raw ``text/csv`` request body.
+
+    The CSV needs a ``student_id`` column plus one column per exam name and
+    may be at most ``COHORT_MAX_UPLOAD_BYTES`` long. Poll the returned job until
+    it completes, then download ``result_url``.
+    """
+
+    max_bytes = get_settings().cohort_max_upload_bytes
+    declared = request.headers.get("content-length")
+    if declared is not None and declared.isdigit() and int(declared) > max_bytes:
+        raise _upload_too_large(max_bytes)
+
+    job = _cohort_jobs.create()
+    target = await run_in_threadpool(open, job.input_path, "wb")
+    try:
+        received = 0
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > max_bytes:
+                raise _upload_too_large(max_bytes)
+            await run_in_threadpool(target.write, chunk)
+    except BaseException:
+        await run_in_threadpool(target.close)
+        await run_in_threadpool(_cohort_jobs.discard, job)
+        raise
+    await run_in_threadpool(target.close)
+
+    matrix = await run_in_threadpool(get_requirement_matrix, session)
+    _cohort_jobs.start(job, matrix)
+    return _job_schema(job)
+
+
+@router.get("/cohort-match/{job_id}", response_model=CohortJobSchema)
+def get_cohort_match(job_id: str) -> CohortJobSchema:
+    """Return progress and throughput for a cohort job."""
+
+    return _job_schema(_get_job(job_id))
+
+
+@router.get("/cohort-match/{job_id}/result")
+def download_cohort_match(job_id: str) -> FileResponse:
+    """Download the matches CSV of a completed job."""
+
+    job = _get_job(job_id)
+    if job.status != "completed":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Job is {job.status}")
+    return FileResponse(job.output_path, media_type="text/csv", filename=f"matches-{job.id}.csv")
+
+
+def _university_write(item: BulkUniversityItem) -> UniversityWrite:
+    return UniversityWrite(
+        op=item.op,
+        id=item.id,
+        values={name: getattr(item, name) for name in WRITABLE_FIELDS if name in item.model_fields_set},
+        programs=None
+        if item.programs is None
+        else [
+            ProgramWrite(name=program.name, degree_level=program.degree_level, requirements=program.requirements)
+            for program in item.programs
+        ],
+    )
+
+
+@router.post("/universities/bulk", response_model=BulkUniversityResponse)
+def bulk_write_universities(
+    payload: BulkUniversityRequest,
+    response: Response,
+    session: Session = Depends(get_db_session),
+) -> BulkUniversityResponse:
+    """Create, update and delete universities with their programs and requirements.
+
+    All items are applied in one transaction. If any item is invalid, nothing
+    is written and the response is ``422`` with the error on each failing item.
+    """
+
+    result = apply_university_writes(session, [_university_write(item) for item in payload.items])
+    if not result.applied:
+        response.status_code = 422
+    return BulkUniversityResponse.model_validate(result)
@@ -0,0 +1,27 @@
+"""Incremental catalog sync endpoint."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db_session
+from app.schemas import ChangesResponse
+from app.services.changes import DEFAULT_LIMIT, load_changes
+
+router = APIRouter(prefix="/changes", tags=["changes"])
+
+
+@router.get("", response_model=ChangesResponse)
+def list_changes(
+    since: int = Query(0, ge=0, description="Catalog version the client already has"),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=10_000, description="Maximum change log entries to read"),
+    session: Session = Depends(get_db_session),
+) -> ChangesResponse:
+    """Return entities written or deleted after ``since``.
+
+    Store the returned ``version`` and pass it as ``since`` next time; repeat
+    immediately while ``has_more`` is true.
+    """
+
+    return ChangesResponse.model_validate(load_changes(session, since, limit))
@@ -5,102 +5,372 @@ This module exposes a /chat POST endpoint that accepts user messages
 and returns responses from the LangChain agent.
 """
 
-from fastapi import APIRouter, HTTPException
+import functools
+import hashlib
+import ipaddress
+import json
+import math
+import re
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
+from sqlalchemy.orm import Session
 
-from ..agent import create_university_agent
+from ..agent import PARTIAL_ANSWER_MARKER, create_chat_model, create_university_agent, turn_budget
+from ..core import metrics
+from ..core.admission import ConcurrencyGate, TokenBucketLimiter
+from ..core.cache import MISSING, CacheBackend, TTLCache
+from ..core.catalog import get_catalog_version
 from ..core.config import get_settings
+from ..core.database import get_db_session
+from ..services.conversation_store import (
+    Conversation,
+    ConversationStore,
+    InMemoryConversationBackend,
+)
+from ..services.intent_router import FastPathReply, IntentRouter
 
 router = APIRouter()
 
 
+class ChatHistoryMessage(BaseModel):
+    """One client-supplied history entry; only user and assistant turns are kept."""
+    role: str
+    content: str
+
+
 class ChatRequest(BaseModel):
     """Request body for chat endpoint."""
     message: str
-    chat_history: list[dict] | None = None
+    conversation_id: str | None = None
+    # Deprecated: only used to seed a new conversation
+    chat_history: list[ChatHistoryMessage] | None = None
 
 
 class ChatResponse(BaseModel):
     """Response body for chat endpoint."""
     response: str
+    conversation_id: str
     tool_calls: list[str] | None = None
+    # True when the turn budget ran out and the response is a partial answer
+    partial: bool = False
 
 
 # Cache agent instance (created on first request)
 _agent = None
 
+# Cache of final answers keyed by catalog version, message and history
+_response_cache: CacheBackend = TTLCache(
+    maxsize=get_settings().chat_cache_maxsize,
+    ttl=get_settings().chat_cache_ttl_seconds,
+)
+
+
+def _response_cache_metrics() -> dict:
+    """Expose response cache statistics when the backend tracks them."""
+    stats = getattr(_response_cache, "stats", None)
+    return stats.as_dict() if stats is not None else {}
+
+
+metrics.register_provider("chat_cache", _response_cache_metrics)
+
+# Server-side conversation history, trimmed and summarized per turn
+_conversations = ConversationStore(
+    InMemoryConversationBackend(
+        maxsize=get_settings().conversation_maxsize,
+        ttl=get_settings().conversation_ttl_seconds,
+    ),
+    token_budget=get_settings().conversation_token_budget,
+    summary_token_budget=get_settings().conversation_summary_token_budget,
+)
+
+
+# Admission control: bounded concurrent agent runs and per-client rate limits
+_gate = ConcurrencyGate(
+    limit=get_settings().chat_max_concurrent,
+    max_queue=get_settings().chat_max_queue,
+    queue_timeout=get_settings().chat_queue_timeout_seconds,
+)
+_rate_limiter = TokenBucketLimiter(
+    rate=get_settings().chat_rate_per_minute / 60,
+    burst=get_settings().chat_rate_burst,
+)
+metrics.register_provider(
+    "chat_fast_path",
+    lambda: {
+        "turns": metrics.counter("chat.turns"),
+        "fast_path": metrics.counter("chat.fast_path"),
+        "fraction": round(
+            metrics.counter("chat.fast_path") / max(metrics.counter("chat.turns"), 1), 4
+        ),
+    },
+)
+metrics.register_provider(
+    "chat_budget",
+    lambda: {
+        "agent_turns": metrics.counter("chat.agent_turns"),
+        "partial_answers": metrics.counter("chat.partial_answers"),
+        **{
+            f"exhausted_{reason}": metrics.counter(f"chat.budget_exhausted.{reason}")
+            for reason in ("deadline", "steps", "tool_calls")
+        },
+    },
+)
+metrics.register_provider(
+    "chat_admission",
+    lambda: {**_gate.as_dict(), "rate_limited": _rate_limiter.rejected},
+)
+
+
+def set_response_cache_backend(backend: CacheBackend) -> None:
+    """Replace the response cache store (e.g. with a shared Redis-backed one)."""
+    global _response_cache
+    _response_cache = backend
+
 
 def get_agent():
     """Get or create the agent instance."""
     global _agent
     if _agent is None:
         settings = get_settings()
-        if not settings.openai_api_key:
+        if settings.llm_provider == "openai" and not settings.openai_api_key:
             raise HTTPException(
                 status_code=500,
                 detail="OPENAI_API_KEY not configured. Please set it in .env file."
             )
-        _agent = create_university_agent(
+        llm = create_chat_model(
+            provider=settings.llm_provider,
             openai_api_key=settings.openai_api_key,
-            model=settings.openai_model
+            model=settings.openai_model,
+            fake_latency_ms=settings.fake_llm_latency_ms,
         )
+        _agent = create_university_agent(llm=llm)
     return _agent
 
 
+@functools.lru_cache(maxsize=8)
+def _proxy_networks(proxies: tuple[str, ...]) -> tuple:
+    """Parse configured proxies; entries that are not IPs/CIDRs match by name."""
+    networks = []
+    for proxy in proxies:
+        try:
+            networks.append(ipaddress.ip_network(proxy.strip(), strict=False))
+        except ValueError:
+            networks.append(proxy.strip())
+    return tuple(networks)
+
+
+def _is_trusted_proxy(host: str) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        address = None
+    for network in _proxy_networks(tuple(get_settings().trusted_proxies)):
+        if isinstance(network, str):
+            if network == host:
+                return True
+        elif address is not None and address.version == network.version and address in network:
+            return True
+    return False
+
+
+def _client_key(http_request: Request) -> str:
+    """Identify the caller for rate limiting.
+
+    X-Forwarded-For is only honoured when the peer is a trusted proxy, since
+    any client can set it. Hops are read from the nearest one back, and the
+    first address not belonging to a trusted proxy is the client.
+    """
+    peer = http_request.client.host if http_request.client else "unknown"
+    forwarded = http_request.headers.get("x-forwarded-for")
+    if not forwarded or not _is_trusted_proxy(peer):
+        return peer
+    hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted_proxy(hop):
+            return hop
+    return hops[0] if hops else peer
+
+
+def _too_many_requests(detail: str, retry_after: float) -> HTTPException:
+    """Build a 429 response carrying a Retry-After hint."""
+    return HTTPException(
+        status_code=429,
+        detail=detail,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+def _normalize_message(text: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation."""
+    return re.sub(r"\s+", " ", text).strip().lower().rstrip("?!. ")
+
+
+def _load_conversation(request: ChatRequest) -> Conversation:
+    """Load the server-side conversation, seeding new ones from chat_history."""
+    conversation = _conversations.get_or_create(request.conversation_id)
+    if not conversation.turns and not conversation.summary and request.chat_history:
+        _conversations.seed(
+            conversation,
+            [
+                {"role": msg.role, "content": msg.content}
+                for msg in request.chat_history
+                if msg.role in ("user", "assistant")
+            ],
+        )
+    return conversation
+
+
+def _try_fast_path(message: str, session: Session) -> FastPathReply | None:
+    """Answer pure catalog lookups directly, releasing the connection afterwards."""
+    try:
+        return IntentRouter(session).route(message)
+    finally:
+        # Don't hold a pooled connection while a slow agent run follows.
+        session.close()
+
+
+def _cache_key(messages: list[dict]) -> tuple:
+    """Key a turn by catalog version, normalized message and history fingerprint."""
+    *history, current = messages
+    fingerprint = hashlib.sha256(
+        json.dumps(
+            [(m["role"], _normalize_message(m["content"])) for m in history],
+            ensure_ascii=False,
+        ).encode("utf-8")
+    ).hexdigest()
+    return (get_catalog_version(), _normalize_message(current["content"]), fingerprint)
+
+
+def _extract_response(result: dict) -> str:
+    """Extract the final assistant text from an agent result."""
+    if "messages" not in result or not result["messages"]:
+        return ""
+
+    last_message = result["messages"][-1]
+    if hasattr(last_message, "content"):
+        return last_message.content
+    if hasattr(last_message, "text"):
+        return last_message.text
+    if isinstance(last_message, dict):
+        return last_message.get("content", str(last_message))
+    return str(last_message)
+
+
+def _count_llm_calls(result: dict, input_count: int) -> int:
+    """Count model responses produced during this turn."""
+    new_messages = result.get("messages", [])[input_count:]
+    return sum(1 for m in new_messages if getattr(m, "type", None) == "ai")
+
+
 @router.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(
+    request: ChatRequest,
+    http_request: Request,
+    session: Session = Depends(get_db_session),
+):
     """
     Send a message to the university admissions assistant.
 
     The assistant uses tools to search universities, get details,
     and compare options. It will never guess - always uses real data.
+    Simple lookups (available filters, a university by ID, search by
+    country/program/exam) are answered from templates without the LLM.
+    History is kept server-side per conversation_id and trimmed to a
+    token budget, with older turns folded into a summary. Repeated
+    questions with the same history are answered from a response cache
+    scoped to the current catalog version. Agent runs pass through a
+    bounded concurrency gate and a per-client token bucket; overload is
+    answered with 429 and Retry-After. Each agent run has a deadline and
+    step/tool-call limits; when they run out the reply is a partial answer
+    flagged with ``partial`` and never cached.
 
     Args:
-        request: ChatRequest with user message and optional chat history
+        request: ChatRequest with user message and optional conversation_id
+        http_request: Raw request, used to identify the client
+        session: Database session for fast-path lookups
 
     Returns:
-        ChatResponse with assistant's reply and list of tools used
+        ChatResponse with assistant's reply, conversation_id and tools used
     """
     if not request.message.strip():
         raise HTTPException(status_code=400, detail="Message cannot be empty")
 
-    agent = get_agent()
+    retry_after = _rate_limiter.acquire(_client_key(http_request))
+    if retry_after:
+        metrics.increment("chat.rate_limited")
+        raise _too_many_requests("Too many chat requests. Please slow down.", retry_after)
 
-    # Build messages list for LangChain v1 API
-    messages = []
-    if request.chat_history:
-        for msg in request.chat_history:
-            role = msg.get("role", "")
-            content = msg.get("content", "")
-            if role in ("user", "assistant"):
-                messages.append({"role": role, "content": content})
+    metrics.increment("chat.turns")
+    conversation = _load_conversation(request)
 
-    # Add current message
-    messages.append({"role": "user", "content": request.message})
+    fast_reply = await run_in_threadpool(_try_fast_path, request.message, session)
+    if fast_reply is not None:
+        metrics.increment("chat.fast_path")
+        metrics.increment(f"chat.fast_path.{fast_reply.intent}")
+        _conversations.append_turn(conversation, request.message, fast_reply.text)
+        return ChatResponse(
+            response=fast_reply.text,
+            conversation_id=conversation.id,
+            tool_calls=None,
+        )
 
-    try:
-        result = agent.invoke({"messages": messages})
-
-        # Extract response from messages
-        response_text = ""
-        if "messages" in result and result["messages"]:
-            last_message = result["messages"][-1]
-            if hasattr(last_message, "content"):
-                response_text = last_message.content
-            elif hasattr(last_message, "text"):
-                response_text = last_message.text
-            elif isinstance(last_message, dict):
-                response_text = last_message.get("content", str(last_message))
-            else:
-                response_text = str(last_message)
+    messages = [*conversation.messages(), {"role": "user", "content": request.message}]
+    key = _cache_key(messages)
 
+    cached = _response_cache.get(key, MISSING)
+    if cached is not MISSING:
+        response_text, llm_calls = cached
+        metrics.increment("chat.cache_hits")
+        metrics.increment("chat.llm_calls_avoided", llm_calls)
+        _conversations.append_turn(conversation, request.message, response_text)
         return ChatResponse(
             response=response_text,
-            tool_calls=None  # Tool calls tracking simplified for v1 API
+            conversation_id=conversation.id,
+            tool_calls=None,
         )
 
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Agent error: {str(e)}"
-        )
+    agent = get_agent()
+
+    # The deadline covers waiting for a slot as well as the agent run.
+    with turn_budget() as budget:
+        if not await _gate.acquire():
+            metrics.increment("chat.rejected")
+            raise _too_many_requests(
+                "Assistant is busy. Please retry shortly.",
+                get_settings().chat_retry_after_seconds,
+            )
+
+        try:
+            # Run the blocking agent off the event loop so other endpoints stay responsive.
+            # The copied context carries the turn budget into model and tool calls.
+            result = await run_in_threadpool(agent.invoke, {"messages": messages})
+            response_text = _extract_response(result)
+            llm_calls = _count_llm_calls(result, len(messages))
+            metrics.increment("chat.agent_turns")
+            metrics.increment("chat.llm_calls", llm_calls)
+            partial = response_text.startswith(PARTIAL_ANSWER_MARKER)
+            if budget.exhausted:
+                metrics.increment(f"chat.budget_exhausted.{budget.exhausted}")
+            if partial:
+                metrics.increment("chat.partial_answers")
+            elif response_text and not budget.exhausted:
+                _response_cache.set(key, (response_text, llm_calls))
+            _conversations.append_turn(conversation, request.message, response_text)
+
+            return ChatResponse(
+                response=response_text,
+                conversation_id=conversation.id,
+                tool_calls=None,  # Tool calls tracking simplified for v1 API
+                partial=partial,
+            )
+
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Agent error: {str(e)}"
+            )
+
+        finally:
+            _gate.release()
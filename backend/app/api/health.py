@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Any
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Request, status
+from fastapi.responses import JSONResponse
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -14,3 +16,16 @@ def health_check() -> dict[str, str]:
     """Return a simple payload confirming the API is running."""
 
     return {"status": "ok", "timestamp": datetime.utcnow().isoformat()}
+
+
+@router.get("/ready", summary="Readiness probe gated on warm-up")
+def readiness(request: Request) -> JSONResponse:
+    """Return 200 once warm-up has finished and 503 while it is still running."""
+
+    state = getattr(request.app.state, "warmup", None)
+    payload: dict[str, Any] = {"status": "ready"} if state is None else state.as_dict()
+    ready = state is None or state.ready
+    return JSONResponse(
+        payload,
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
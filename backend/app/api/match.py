@@ -0,0 +1,52 @@
+"""Eligibility matching endpoint."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db_session
+from app.schemas import (
+    CountrySchema,
+    MatchItem,
+    MatchRequest,
+    MatchRequirementSchema,
+    MatchResponse,
+)
+from app.services.matching import get_requirement_matrix
+
+router = APIRouter(prefix="/match", tags=["match"])
+
+
+@router.post("", response_model=MatchResponse)
+def match_programs(
+    payload: MatchRequest,
+    session: Session = Depends(get_db_session),
+) -> MatchResponse:
+    """Return every (university, program) whose requirements the scores satisfy.
+
+    Results are ranked by the tightest relative margin across required exams,
+    so programs the student clears most comfortably come first.
+    """
+
+    matrix = get_requirement_matrix(session)
+    matches, unknown = matrix.match(payload.scores)
+
+    items = [
+        MatchItem(
+            university_id=match.row.university_id,
+            university_name=match.row.university_name,
+            city=match.row.city,
+            country=CountrySchema(code=match.row.country_code, name=match.row.country_name),
+            program_id=match.row.program_id,
+            program_name=match.row.program_name,
+            degree_level=match.row.degree_level,
+            margin=round(match.margin, 4),
+            requirements=[
+                MatchRequirementSchema(exam=exam, min_score=min_score, score=score)
+                for exam, min_score, score in match.requirements
+            ],
+        )
+        for match in matches[: payload.limit]
+    ]
+    return MatchResponse(items=items, total=len(matches), unknown_exams=unknown)
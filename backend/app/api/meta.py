@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import Response
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.core.compression import cached_json_response
 from app.core.database import get_db_session
 from app.models import Country, Exam, Program
 from app.schemas import (
@@ -19,9 +21,13 @@ router = APIRouter(prefix="/meta", tags=["meta"])
 
 
 @router.get("", response_model=MetaResponse)
-def get_meta(session: Session = Depends(get_db_session)) -> MetaResponse:
-    """Return metadata collections for client filters."""
+def get_meta(request: Request, session: Session = Depends(get_db_session)) -> Response:
+    """Return metadata collections for client filters, cached per catalog version."""
 
+    return cached_json_response(request, "meta", lambda: _build_meta(session))
+
+
+def _build_meta(session: Session) -> MetaResponse:
     countries = session.scalars(select(Country).order_by(Country.name)).all()
     programs = session.scalars(select(Program).order_by(Program.name)).all()
     exams = session.scalars(select(Exam).order_by(Exam.name)).all()
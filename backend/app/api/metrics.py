@@ -0,0 +1,18 @@
+"""Runtime metrics endpoint."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import APIRouter
+
+from app.core import metrics
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("", summary="In-process runtime metrics")
+def get_metrics() -> dict[str, Any]:
+    """Return counters and cache statistics for this worker."""
+
+    return metrics.snapshot()
@@ -2,27 +2,68 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
+from app.core.compression import cached_json_response
 from app.core.database import get_db_session
 from app.schemas import (
     CountrySchema,
     ProgramDetailSchema,
     RequirementSchema,
+    SemanticSearchItem,
+    SemanticSearchResponse,
+    SuggestionSchema,
+    SuggestResponse,
     UniversityDetailSchema,
     UniversityListItem,
     UniversityListResponse,
 )
-from app.services.university_service import UniversityFilters, UniversityService
+from app.services.suggest import MAX_SUGGESTIONS, get_prefix_index
+from app.services.university_service import (
+    DETAIL_INCLUDES,
+    LIST_INCLUDES,
+    LIST_SELECTION,
+    UNIVERSITY_FIELDS,
+    FieldSelection,
+    UniversityFilters,
+    UniversityService,
+)
 
 router = APIRouter(prefix="/universities", tags=["universities"])
 
+FIELDS_DESCRIPTION = (
+    f"Comma-separated columns to return ({', '.join(UNIVERSITY_FIELDS)}); id is always returned"
+)
+
+
+def _parse_selection(
+    fields: str | None,
+    include: str | None,
+    default_fields: Sequence[str],
+    allowed_include: Sequence[str],
+) -> FieldSelection:
+    try:
+        return FieldSelection.parse(fields, include, default_fields, allowed_include)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+
+def _selected_columns(university, selection: FieldSelection) -> dict[str, Any]:
+    return {name: getattr(university, name) for name in selection.fields}
+
+
+def _country(university) -> CountrySchema:
+    return CountrySchema(code=university.country.code, name=university.country.name)
+
 
 @router.get("", response_model=UniversityListResponse)
 def list_universities(
+    request: Request,
     country: str | None = Query(
         default=None,
         min_length=2,
@@ -44,50 +85,134 @@ def list_universities(
         min_length=1,
         description="Case-insensitive substring search on university name",
     ),
+    fuzzy: bool = Query(
+        default=False,
+        description="Tolerate typos in q and rank results by closeness",
+    ),
     page: int = Query(default=1, ge=1),
     limit: int = Query(default=20, ge=1, le=100),
+    fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION + " (default: name,city)"),
+    include: str | None = Query(
+        default=None,
+        description=f"Comma-separated related data ({', '.join(LIST_INCLUDES)}; default: all)",
+    ),
     session: Session = Depends(get_db_session),
-) -> UniversityListResponse:
-    """Return paginated universities with optional filters."""
+) -> Response:
+    """Return paginated universities with optional filters.
+
+    ``fields``/``include`` prune the loaded columns and skip the program-count
+    query when it is not requested. Pages are cached per catalog version
+    together with their compressed bytes.
+    """
+
+    selection = _parse_selection(fields, include, sorted(LIST_SELECTION.fields), LIST_INCLUDES)
 
-    service = UniversityService(session)
     filters = UniversityFilters(
         country_code=country,
         program=program,
         exam=exam,
         min_score=min_score,
         query=q,
+        fuzzy=fuzzy,
         page=page,
         limit=limit,
     )
-    universities, program_counts, total = service.list_universities(filters)
+    key = ("universities", tuple(sorted(vars(filters).items())), selection.key())
+    return cached_json_response(request, key, lambda: _build_list(session, filters, selection))
+
+
+def _build_list(
+    session: Session, filters: UniversityFilters, selection: FieldSelection
+) -> UniversityListResponse:
+    universities, program_counts, total = UniversityService(session).list_universities(
+        filters, selection
+    )
+
+    items = []
+    for university in universities:
+        data = _selected_columns(university, selection)
+        if "country" in selection.include:
+            data["country"] = _country(university)
+        if "programs_count" in selection.include:
+            data["programs_count"] = program_counts.get(university.id, 0)
+        items.append(UniversityListItem(id=university.id, **data))
 
+    return UniversityListResponse(items=items, page=filters.page, limit=filters.limit, total=total)
+
+
+@router.get("/suggest", response_model=SuggestResponse)
+def suggest(
+    prefix: str = Query(min_length=1, max_length=100, description="Text typed so far"),
+    limit: int = Query(default=10, ge=1, le=MAX_SUGGESTIONS),
+    session: Session = Depends(get_db_session),
+) -> SuggestResponse:
+    """Return typed autocomplete suggestions (universities, cities, programs, countries)."""
+
+    index = get_prefix_index(session)
+    items = [SuggestionSchema.model_validate(item) for item in index.suggest(prefix, limit)]
+    return SuggestResponse(prefix=prefix, items=items)
+
+
+@router.get("/search", response_model=SemanticSearchResponse)
+def semantic_search(
+    text: str = Query(min_length=1, max_length=500, description="Free-text description of what to look for"),
+    limit: int = Query(default=10, ge=1, le=100),
+    approximate: bool = Query(
+        default=False,
+        description="Scan only the closest clusters of a large index (faster, may miss results)",
+    ),
+    session: Session = Depends(get_db_session),
+) -> SemanticSearchResponse:
+    """Rank universities by similarity of their name, description and programs to ``text``."""
+
+    service = UniversityService(session)
     items = [
-        UniversityListItem(
+        SemanticSearchItem(
             id=university.id,
             name=university.name,
             city=university.city,
-            country=CountrySchema(code=university.country.code, name=university.country.name),
-            programs_count=program_counts.get(university.id, 0),
+            description=university.description,
+            country=_country(university),
+            score=round(score, 4),
         )
-        for university in universities
+        for university, score in service.search_text(text, limit=limit, approximate=approximate)
     ]
+    return SemanticSearchResponse(text=text, items=items)
 
-    return UniversityListResponse(items=items, page=page, limit=limit, total=total)
 
-
-@router.get("/{university_id}", response_model=UniversityDetailSchema)
+@router.get(
+    "/{university_id}", response_model=UniversityDetailSchema, response_model_exclude_unset=True
+)
 def get_university(
     university_id: int,
+    fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION + " (default: all)"),
+    include: str | None = Query(
+        default=None,
+        description=f"Comma-separated related data ({', '.join(DETAIL_INCLUDES)}; default: all)",
+    ),
     session: Session = Depends(get_db_session),
 ) -> UniversityDetailSchema:
-    """Return detailed university payload or 404 if not found."""
+    """Return detailed university payload or 404 if not found.
+
+    Requirements, programs and exams are only loaded when ``programs`` is included.
+    """
 
+    selection = _parse_selection(fields, include, UNIVERSITY_FIELDS, DETAIL_INCLUDES)
     service = UniversityService(session)
-    university = service.get_university(university_id)
+    university = service.get_university(university_id, selection)
     if university is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="University not found")
 
+    data = _selected_columns(university, selection)
+    if "country" in selection.include:
+        data["country"] = _country(university)
+    if "programs" in selection.include:
+        data["programs"] = _program_details(university)
+    return UniversityDetailSchema(id=university.id, **data)
+
+
+def _program_details(university) -> list[ProgramDetailSchema]:
+
     program_map: dict[int, dict[str, Any]] = {}
     for requirement in university.requirements:
         program = requirement.program
@@ -108,19 +233,7 @@ def get_university(
             RequirementSchema(exam=exam.name, min_score=requirement.min_score)
         )
 
-    programs = [
+    return [
         ProgramDetailSchema(**data)
         for data in sorted(program_map.values(), key=lambda item: item["name"].lower())
     ]
-
-    return UniversityDetailSchema(
-        id=university.id,
-        name=university.name,
-        city=university.city,
-        description=university.description,
-        country=CountrySchema(
-            code=university.country.code,
-            name=university.country.name,
-        ),
-        programs=programs,
-    )
@@ -0,0 +1,53 @@
+"""Check the denormalized university_search table against the catalog tables.
+
+Example:
+    python backend/app/check_search_table.py [--repair]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+from app.core.database import SessionLocal
+from app.services.search_table import check_search_table, refresh_search_rows
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+LOGGER = logging.getLogger(__name__)
+
+
+def _sample(ids: list[int]) -> str:
+    return ", ".join(map(str, ids[:10])) + (" ..." if len(ids) > 10 else "")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--repair", action="store_true", help="Rebuild the rows of inconsistent universities"
+    )
+    args = parser.parse_args()
+
+    with SessionLocal() as session:
+        report = check_search_table(session)
+        LOGGER.info("Checked %d universities", report.checked)
+        for label, ids in (("missing", report.missing), ("stale", report.stale), ("orphaned", report.orphaned)):
+            if ids:
+                LOGGER.warning("%d %s: %s", len(ids), label, _sample(ids))
+        if report.consistent:
+            LOGGER.info("university_search is consistent")
+            return
+        if not args.repair:
+            sys.exit(1)
+        refresh_search_rows(session, [*report.missing, *report.stale, *report.orphaned])
+        session.commit()
+        LOGGER.info("Repaired; university_search is consistent: %s", check_search_table(session).consistent)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Match a cohort CSV of student exam scores against the catalog.
+
+Example:
+    python backend/app/cohort_match.py students.csv matches.csv --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+from app.core.database import SessionLocal
+from app.services.cohort import CohortStats, run_cohort_match
+from app.services.matching import RequirementMatrix
+from app.services.snapshot import CatalogSnapshot
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+LOGGER = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", type=Path, help="CSV with student_id and one column per exam")
+    parser.add_argument("output", type=Path, help="Destination CSV for eligible programs")
+    parser.add_argument("--workers", type=int, default=None, help="Processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--snapshot", type=Path, default=None, help="Read the catalog from a snapshot file")
+    args = parser.parse_args()
+
+    if args.snapshot is not None:
+        matrix = RequirementMatrix.from_snapshot(CatalogSnapshot(args.snapshot))
+    else:
+        with SessionLocal() as session:
+            matrix = RequirementMatrix.from_session(session)
+    LOGGER.info("Loaded %d programs x %d exams", len(matrix.rows), len(matrix.exams))
+
+    def report(stats: CohortStats) -> None:
+        LOGGER.info("%d students matched (%.0f students/s)", stats.students, stats.students_per_second)
+
+    stats = run_cohort_match(
+        matrix,
+        args.input,
+        args.output,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        progress=report,
+    )
+    LOGGER.info(
+        "Done: %d students, %d matches in %.2fs (%.0f students/s)",
+        stats.students,
+        stats.matches,
+        stats.elapsed_seconds,
+        stats.students_per_second,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Benchmark bytes on the wire and CPU per request for compressed API responses.
+
+Example:
+    python backend/app/compression_bench.py --requests 200 --universities 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+LOGGER = logging.getLogger(__name__)
+
+ENDPOINTS = [
+    ("meta (cached)", "/api/meta"),
+    ("list page (cached)", "/api/universities?limit=100"),
+    ("detail (on the fly)", "/api/universities/1"),
+    ("search (on the fly)", "/api/universities/search?text=computer+science&limit=100"),
+]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint and encoding")
+    parser.add_argument(
+        "--universities", type=int, default=2000, help="Pad the demo catalog with synthetic universities"
+    )
+    parser.add_argument("--database-url", default="sqlite:///./bench.db")
+    return parser.parse_args()
+
+
+def add_synthetic_universities(target: int) -> None:
+    """Top the catalog up to ``target`` universities with generated entries."""
+
+    import sqlalchemy as sa
+
+    from app.core.database import SessionLocal
+    from app.models import Country, Exam, Program, Requirement, University
+
+    with SessionLocal() as session:
+        existing = session.scalar(sa.select(sa.func.count(University.id))) or 0
+        countries = session.scalars(sa.select(Country)).all()
+        programs = session.scalars(sa.select(Program)).all()
+        exams = session.scalars(sa.select(Exam)).all()
+        for index in range(existing, target):
+            university = University(
+                name=f"Synthetic University {index:05d}",
+                city=f"City {index % 97}",
+                description="Generated entry used to benchmark payload sizes.",
+                country=countries[index % len(countries)],
+            )
+            session.add(university)
+            for offset in range(3):
+                session.add(
+                    Requirement(
+                        university=university,
+                        program=programs[(index + offset) % len(programs)],
+                        exam=exams[(index + offset) % len(exams)],
+                        min_score=5.0 + offset,
+                    )
+                )
+        session.commit()
+
+
+def run(args: argparse.Namespace) -> None:
+    from fastapi.testclient import TestClient
+
+    from app.core.compression import compress, supported_encodings
+    from app.core.config import get_settings
+    from app.main import create_app
+    from app.seed import seed
+
+    seed()
+    add_synthetic_universities(args.universities)
+    client = TestClient(create_app())
+
+    LOGGER.info("%-22s %-9s %10s %12s", "endpoint", "encoding", "wire bytes", "CPU ms/req")
+    for label, path in ENDPOINTS:
+        raw = client.get(path, headers={"Accept-Encoding": "identity"}).content
+        if len(raw) < get_settings().compression_min_bytes:
+            LOGGER.info("%-22s %d bytes is below the compression threshold", label, len(raw))
+        for encoding in ("identity", *supported_encodings()):
+            headers = {"Accept-Encoding": encoding}
+            response = client.get(path, headers=headers)  # warm caches
+            started = time.process_time()
+            for _ in range(args.requests):
+                client.get(path, headers=headers)
+            cpu_ms = (time.process_time() - started) / args.requests * 1000
+            LOGGER.info(
+                "%-22s %-9s %10d %12.3f", label, encoding, response.num_bytes_downloaded, cpu_ms
+            )
+        for encoding in supported_encodings():
+            started = time.process_time()
+            for _ in range(args.requests):
+                compress(raw, encoding)
+            LOGGER.info(
+                "%-22s %-9s recompressing %d bytes on every request would add %.3f CPU ms",
+                label, encoding, len(raw), (time.process_time() - started) / args.requests * 1000,
+            )
+
+
+def main() -> None:
+    args = parse_args()
+    # The test client logs every request at INFO under "httpx" or "httpx2".
+    for name in ("httpx", "httpx2"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    os.environ["DATABASE_URL"] = args.database_url
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Admission control primitives: a bounded concurrency gate and per-client rate limits."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from .cache import MISSING, TTLCache
+
+
+class ConcurrencyGate:
+    """Async gate allowing ``limit`` holders plus a short FIFO wait queue.
+
+    Callers beyond ``limit + max_queue`` are rejected immediately, and queued
+    callers give up after ``queue_timeout`` seconds, so overload turns into
+    fast failures instead of an unbounded pile-up of blocked work.
+    """
+
+    def __init__(self, limit: int, max_queue: int = 0, queue_timeout: float = 1.0) -> None:
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of callers currently waiting for a slot."""
+
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    async def acquire(self) -> bool:
+        """Take a slot, waiting briefly if needed; return False when rejected."""
+
+        if self.active < self.limit and not self.queue_depth:
+            self.active += 1
+            return True
+
+        if self.queue_depth >= self.max_queue:
+            self.rejected += 1
+            return False
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # A released slot is handed over directly, so ``active`` is unchanged.
+            done, _ = await asyncio.wait({waiter}, timeout=self.queue_timeout)
+        except BaseException:
+            # Cancelled (e.g. the client disconnected). A slot handed over in the
+            # meantime would otherwise stay taken forever, so pass it on.
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                waiter.cancel()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        if not done:
+            waiter.cancel()
+            self.timed_out += 1
+            return False
+        return True
+
+    def release(self) -> None:
+        """Hand the slot to the oldest waiter or free it."""
+
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def as_dict(self) -> dict[str, int]:
+        """Return gate state for the metrics endpoint."""
+
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "queue_depth": self.queue_depth,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+
+@dataclass
+class _Bucket:
+    tokens: float
+    updated_at: float
+
+
+class TokenBucketLimiter:
+    """Per-key token buckets refilled at ``rate`` tokens per second."""
+
+    def __init__(self, rate: float, burst: int, max_keys: int = 10_000) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.rejected = 0
+        self._buckets: TTLCache[_Bucket] = TTLCache(
+            maxsize=max_keys,
+            ttl=burst / rate if rate > 0 else 3600.0,
+        )
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str) -> float:
+        """Consume a token for ``key``; return 0 or the seconds until one is available."""
+
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is MISSING:
+                bucket = _Bucket(tokens=float(self.burst), updated_at=now)
+            else:
+                bucket.tokens = min(
+                    float(self.burst), bucket.tokens + (now - bucket.updated_at) * self.rate
+                )
+                bucket.updated_at = now
+            self._buckets.set(key, bucket)
+
+            if bucket.tokens >= 1:
+                bucket.tokens -= 1
+                return 0.0
+
+            self.rejected += 1
+            if self.rate <= 0:
+                return math.inf
+            return (1 - bucket.tokens) / self.rate
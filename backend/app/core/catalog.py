@@ -0,0 +1,192 @@
+"""Catalog version tracking used to scope cached catalog data.
+
+The authoritative version lives in the ``catalog_state`` table. Every flush
+that writes a tracked catalog row increments it once per transaction and logs
+each written or deleted row in ``catalog_changes``, so seed runs, imports and
+API writes are all tracked without extra calls. The row lock taken by the
+increment also serializes catalog writers, so versions become visible in
+order and ``GET /api/changes`` never skips a version.
+
+Each process keeps a local copy of the version for cache keys; it moves on
+its own commits and when ``sync_catalog_version`` sees a newer database value.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterable
+
+import sqlalchemy as sa
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Tables whose rows make up the catalog, keyed by their change-feed entity name.
+TRACKED_TABLES = frozenset({"countries", "exams", "programs", "universities", "requirements"})
+
+# Lightweight table constructs; the ORM models live in app.models.catalog_change.
+_state = sa.table("catalog_state", sa.column("id"), sa.column("version"))
+_changes = sa.table(
+    "catalog_changes",
+    sa.column("version"),
+    sa.column("entity"),
+    sa.column("entity_id"),
+    sa.column("deleted"),
+)
+
+_lock = threading.Lock()
+_version = 0
+_seen_database_version = 0
+_last_sync = float("-inf")
+
+_VERSION_KEY = "catalog_version"
+_RECORDED_KEY = "catalog_recorded"
+
+
+def get_catalog_version() -> int:
+    """Return the current catalog version."""
+
+    return _version
+
+
+def bump_catalog_version() -> int:
+    """Advance the local catalog version so version-scoped caches miss."""
+
+    global _version
+    with _lock:
+        _version += 1
+        return _version
+
+
+def _observe(database_version: int) -> int:
+    """Advance the local version when the database version has moved."""
+
+    global _version, _seen_database_version
+    with _lock:
+        if database_version > _seen_database_version:
+            _seen_database_version = database_version
+            _version = max(_version + 1, database_version)
+        return _version
+
+
+def read_catalog_version(session: Session) -> int:
+    """Return the version stored in the database (0 before the first write)."""
+
+    return session.scalar(sa.select(_state.c.version).where(_state.c.id == 1)) or 0
+
+
+def refresh_catalog_version(session: Session) -> int:
+    """Pick up writes committed by other processes and return the local version."""
+
+    return _observe(read_catalog_version(session))
+
+
+def sync_catalog_version(session: Session, interval: float) -> int:
+    """``refresh_catalog_version`` at most once every ``interval`` seconds."""
+
+    global _last_sync
+    now = time.monotonic()
+    if now - _last_sync < interval:
+        return _version
+    _last_sync = now
+    return refresh_catalog_version(session)
+
+
+def pending_catalog_version(session: Session) -> int | None:
+    """Version the session's open transaction will commit, if it wrote catalog rows."""
+
+    return session.info.get(_VERSION_KEY)
+
+
+def pending_catalog_changes(session: Session) -> set[tuple[str, int, bool]]:
+    """``(entity, id, deleted)`` rows logged so far in the open transaction."""
+
+    return set(session.info.get(_RECORDED_KEY, ()))
+
+
+def claim_catalog_version(session: Session) -> int:
+    """Lock ``catalog_state`` for the open transaction and return its new version.
+
+    Writers that read catalog rows before writing call this first, so they
+    wait for concurrent writers and then read what those committed.
+    """
+
+    return _claim_version(session)
+
+
+def _claim_version(session: Session) -> int:
+    """Increment the stored version once for the session's current transaction."""
+
+    version = session.info.get(_VERSION_KEY)
+    if version is None:
+        connection = session.connection()
+        result = connection.execute(
+            sa.update(_state).where(_state.c.id == 1).values(version=_state.c.version + 1)
+        )
+        if result.rowcount == 0:
+            connection.execute(sa.insert(_state).values(id=1, version=1))
+        version = connection.scalar(sa.select(_state.c.version).where(_state.c.id == 1))
+        session.info[_VERSION_KEY] = version
+    return version
+
+
+def record_catalog_changes(
+    session: Session, entity: str, ids: Iterable[int], deleted: bool = False
+) -> int:
+    """Log rows written outside the ORM unit of work (e.g. bulk statements).
+
+    Returns the transaction's catalog version.
+    """
+
+    recorded = session.info.setdefault(_RECORDED_KEY, set())
+    pending = [
+        entity_id for entity_id in dict.fromkeys(ids) if (entity, entity_id, deleted) not in recorded
+    ]
+    version = _claim_version(session)
+    if pending:
+        session.connection().execute(
+            sa.insert(_changes),
+            [
+                {"version": version, "entity": entity, "entity_id": entity_id, "deleted": deleted}
+                for entity_id in pending
+            ],
+        )
+        recorded.update((entity, entity_id, deleted) for entity_id in pending)
+    return version
+
+
+def _entity(instance) -> str | None:
+    table = getattr(type(instance), "__tablename__", None)
+    return table if table in TRACKED_TABLES else None
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session: Session, flush_context) -> None:
+    written: dict[str, list[int]] = {}
+    deleted: dict[str, list[int]] = {}
+    for instance in (*session.new, *session.dirty):
+        entity = _entity(instance)
+        if entity and (instance in session.new or session.is_modified(instance, include_collections=False)):
+            written.setdefault(entity, []).append(instance.id)
+    for instance in session.deleted:
+        entity = _entity(instance)
+        if entity:
+            deleted.setdefault(entity, []).append(instance.id)
+    for entity, ids in written.items():
+        record_catalog_changes(session, entity, ids)
+    for entity, ids in deleted.items():
+        record_catalog_changes(session, entity, ids, deleted=True)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_commit(session: Session) -> None:
+    session.info.pop(_RECORDED_KEY, None)
+    version = session.info.pop(_VERSION_KEY, None)
+    if version is not None:
+        _observe(version)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rollback(session: Session) -> None:
+    session.info.pop(_RECORDED_KEY, None)
+    session.info.pop(_VERSION_KEY, None)
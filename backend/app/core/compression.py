@@ -0,0 +1,192 @@
+"""Response compression: an ASGI middleware plus precompressed cached payloads."""
+
+from __future__ import annotations
+
+import gzip
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass, field
+
+from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import metrics
+from app.core.cache import TTLCache
+from app.core.catalog import get_catalog_version
+from app.core.config import get_settings
+
+try:  # brotli is optional; gzip is always available
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml")
+
+
+def supported_encodings() -> tuple[str, ...]:
+    """Encodings this process can produce, most preferred first."""
+
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """Pick the preferred supported encoding from an ``Accept-Encoding`` header."""
+
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name] = quality
+    wildcard = accepted.get("*", 0.0)
+    for encoding in supported_encodings():
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress ``body`` with the configured level for ``encoding``."""
+
+    settings = get_settings()
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.compression_brotli_quality)
+    return gzip.compress(body, compresslevel=settings.compression_gzip_level, mtime=0)
+
+
+def _is_compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """Compress complete responses above a size threshold.
+
+    Streaming responses, responses that already carry a ``Content-Encoding``
+    (such as precompressed cached payloads) and non-text content pass through.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Request(scope).headers.get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            assert start is not None
+            body = message.get("body", b"")
+            headers = {key.lower(): value for key, value in start.get("headers", [])}
+            if (
+                message.get("more_body", False)
+                or b"content-encoding" in headers
+                or len(body) < self.minimum_size
+                or not _is_compressible(headers.get(b"content-type", b"").decode("latin-1"))
+            ):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            compressed = compress(body, encoding)
+            metrics.increment("compression.responses")
+            metrics.increment("compression.bytes_in", len(body))
+            metrics.increment("compression.bytes_out", len(compressed))
+            response_headers = [
+                (key, value)
+                for key, value in start.get("headers", [])
+                if key.lower() not in (b"content-length", b"vary")
+            ]
+            response_headers += [
+                (b"content-encoding", encoding.encode("latin-1")),
+                (b"content-length", str(len(compressed)).encode("latin-1")),
+                (b"vary", b"Accept-Encoding"),
+            ]
+            await send({**start, "headers": response_headers})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+@dataclass
+class PrecompressedPayload:
+    """Serialized response body stored with its compressed variants."""
+
+    raw: bytes
+    media_type: str = "application/json"
+    encoded: dict[str, bytes] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, raw: bytes, media_type: str = "application/json") -> PrecompressedPayload:
+        """Compress ``raw`` once per supported encoding when it is above the threshold."""
+
+        payload = cls(raw=raw, media_type=media_type)
+        if len(raw) >= get_settings().compression_min_bytes:
+            payload.encoded = {encoding: compress(raw, encoding) for encoding in supported_encodings()}
+        return payload
+
+    def response(self, accept_encoding: str) -> Response:
+        """Return the best variant for the client without compressing again."""
+
+        encoding = choose_encoding(accept_encoding)
+        if encoding in self.encoded:
+            metrics.increment("compression.precompressed_hits")
+            return Response(
+                content=self.encoded[encoding],
+                media_type=self.media_type,
+                headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"},
+            )
+        return Response(content=self.raw, media_type=self.media_type, headers={"Vary": "Accept-Encoding"})
+
+
+_settings = get_settings()
+_payload_cache: TTLCache[PrecompressedPayload] = TTLCache(
+    maxsize=_settings.payload_cache_maxsize,
+    ttl=_settings.payload_cache_ttl_seconds,
+)
+metrics.register_provider(
+    "payload_cache",
+    lambda: {**_payload_cache.stats.as_dict(), "size": len(_payload_cache)},
+)
+
+
+def cached_json_response(
+    request: Request, key: Hashable, build: Callable[[], BaseModel]
+) -> Response:
+    """Serve a JSON response from the payload cache, building it on a miss.
+
+    Entries are scoped to the catalog version and keep their compressed bytes,
+    so repeat hits skip both the database and the compressor. Fields never set
+    on the model (e.g. unselected sparse fields) are left out of the body.
+    """
+
+    payload = _payload_cache.get_or_set(
+        (get_catalog_version(), key),
+        lambda: PrecompressedPayload.build(
+            build().model_dump_json(exclude_unset=True).encode("utf-8")
+        ),
+    )
+    return payload.response(request.headers.get("accept-encoding", ""))
@@ -7,6 +7,7 @@ from collections.abc import Generator
 from sqlalchemy import create_engine
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
+from .catalog import sync_catalog_version
 from .config import get_settings
 
 
@@ -30,10 +31,15 @@ SessionLocal = sessionmaker(
 
 
 def get_db_session() -> Generator[Session, None, None]:
-    """Yield a database session and ensure it is closed afterwards."""
+    """Yield a database session and ensure it is closed afterwards.
+
+    Also picks up catalog writes made by other processes, at most once per
+    ``CATALOG_VERSION_POLL_SECONDS``.
+    """
 
     session = SessionLocal()
     try:
+        sync_catalog_version(session, settings.catalog_version_poll_seconds)
         yield session
     finally:
         session.close()
@@ -0,0 +1,92 @@
+"""Compact, token-budgeted encoding of agent tool outputs."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from . import metrics
+
+# Rough average for English/JSON text with OpenAI tokenizers.
+CHARS_PER_TOKEN = 4
+# Lists shorter than this stay as objects; a column header costs more than it saves.
+TABULAR_MIN_ROWS = 3
+
+
+def estimate_tokens(text: str) -> int:
+    """Return an approximate token count for ``text``."""
+
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def encode_tool_output(
+    payload: dict[str, Any], token_budget: int | None = None, count_key: str | None = None
+) -> str:
+    """Serialize ``payload`` compactly, truncating its longest list to fit the budget.
+
+    Lists of uniform objects become ``{"columns": [...], "rows": [[...]]}`` tables,
+    ``None`` values are dropped and no whitespace is emitted. When the result still
+    exceeds ``token_budget`` the longest top-level list is cut and a
+    ``"truncated": "and N more <key>"`` note is added. If ``count_key`` names a
+    top-level field, it is set to the number of list items actually kept.
+    """
+
+    baseline = estimate_tokens(json.dumps(payload, indent=2, default=str))
+    text = _dump(payload)
+
+    if token_budget is not None and estimate_tokens(text) > token_budget:
+        text = _truncate(payload, token_budget, count_key)
+        metrics.increment("tool_output.truncated")
+
+    metrics.increment("tool_output.calls")
+    metrics.increment("tool_output.tokens_saved", max(baseline - estimate_tokens(text), 0))
+    return text
+
+
+def _dump(payload: dict[str, Any]) -> str:
+    return json.dumps(_compact(payload), separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _compact(value: Any) -> Any:
+    """Drop empty values and convert uniform object lists into tables."""
+
+    if isinstance(value, dict):
+        return {key: _compact(item) for key, item in value.items() if item is not None}
+    if isinstance(value, list):
+        items = [_compact(item) for item in value]
+        if len(items) >= TABULAR_MIN_ROWS and all(isinstance(item, dict) for item in items):
+            columns = list(dict.fromkeys(key for item in items for key in item))
+            return {
+                "columns": columns,
+                "rows": [[item.get(column) for column in columns] for item in items],
+            }
+        return items
+    return value
+
+
+def _truncate(payload: dict[str, Any], token_budget: int, count_key: str | None = None) -> str:
+    """Keep as many items of the longest list as fit within ``token_budget``."""
+
+    lists = [key for key, value in payload.items() if isinstance(value, list) and value]
+    if not lists:
+        return _dump(payload)
+
+    key = max(lists, key=lambda name: len(payload[name]))
+    items = payload[key]
+
+    def render(count: int) -> str:
+        trimmed = {**payload, key: items[:count]}
+        if count_key is not None:
+            trimmed[count_key] = count
+        if count < len(items):
+            trimmed["truncated"] = f"and {len(items) - count} more {key}"
+        return _dump(trimmed)
+
+    low, high = 0, len(items)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(render(middle)) <= token_budget:
+            low = middle
+        else:
+            high = middle - 1
+    return render(low)
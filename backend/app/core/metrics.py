@@ -0,0 +1,42 @@
+"""Lightweight in-process metrics registry."""
+
+from __future__ import annotations
+
+import threading
+from collections import defaultdict
+from collections.abc import Callable
+from typing import Any
+
+_lock = threading.Lock()
+_counters: defaultdict[str, int] = defaultdict(int)
+_providers: dict[str, Callable[[], dict[str, Any]]] = {}
+
+
+def increment(name: str, value: int = 1) -> None:
+    """Increase counter ``name`` by ``value``."""
+
+    with _lock:
+        _counters[name] += value
+
+
+def counter(name: str) -> int:
+    """Return the current value of counter ``name``."""
+
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def register_provider(name: str, provider: Callable[[], dict[str, Any]]) -> None:
+    """Register a callable returning a metrics section under ``name``."""
+
+    _providers[name] = provider
+
+
+def snapshot() -> dict[str, Any]:
+    """Return counters and provider sections as a JSON-friendly dict."""
+
+    with _lock:
+        payload: dict[str, Any] = {"counters": dict(_counters)}
+    for name, provider in _providers.items():
+        payload[name] = provider()
+    return payload
@@ -0,0 +1,22 @@
+"""Request guards for privileged endpoints."""
+
+from __future__ import annotations
+
+import secrets
+
+from fastapi import Header, HTTPException, status
+
+from .config import get_settings
+
+
+def require_admin(x_admin_token: str | None = Header(default=None)) -> None:
+    """Allow the request only when ``X-Admin-Token`` matches ``ADMIN_TOKEN``."""
+
+    expected = get_settings().admin_token
+    if not expected:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin API is disabled. Set ADMIN_TOKEN to enable it.",
+        )
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, expected):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token")
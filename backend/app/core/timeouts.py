@@ -0,0 +1,278 @@
+"""Per-request statement timeouts and cancellation on client disconnect.
+
+``StatementTimeoutMiddleware`` gives every HTTP request a ``StatementBudget``
+with the timeout configured for its route. Sessions attach the budget to each
+connection they begin a transaction on: PostgreSQL gets ``SET LOCAL
+statement_timeout``, SQLite a progress handler that interrupts statements
+running longer than the timeout. When the client disconnects, in-flight
+statements are cancelled and later ones fail fast, so an abandoned request
+releases its worker thread and pooled connection. Timeouts become ``503``
+responses; both outcomes are counted in ``/api/metrics``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import Pool
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import metrics
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# SQLite virtual machine instructions between progress handler calls.
+SQLITE_PROGRESS_STEPS = 1000
+# PostgreSQL SQLSTATE for statements cancelled by a timeout or ``cancel()``.
+QUERY_CANCELED = "57014"
+
+_INFO_KEY = "statement_budget"
+_current: ContextVar[StatementBudget | None] = ContextVar("statement_budget", default=None)
+
+
+class StatementCancelled(Exception):
+    """Raised for statements issued after their budget was cancelled or ran out."""
+
+
+@dataclass(eq=False)
+class StatementBudget:
+    """Statement timeout and cancellation state shared by one request's sessions."""
+
+    timeout: float  # seconds per statement
+    deadline: float | None = None  # time.monotonic() after which every statement stops
+    timed_out: bool = False
+    cancelled: bool = False
+    _started: float = 0.0
+    _connections: set[Any] = field(default_factory=set, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def attach(self, connection: Connection) -> None:
+        """Apply the timeout to ``connection`` and track it for cancellation."""
+
+        if self.cancelled:
+            raise StatementCancelled("request was cancelled")
+        dbapi_connection = connection.connection.dbapi_connection
+        connection.info[_INFO_KEY] = self
+        with self._lock:
+            self._connections.add(dbapi_connection)
+        dialect = connection.dialect.name
+        if dialect == "postgresql":
+            timeout = min(self.timeout, self.remaining())
+            connection.exec_driver_sql(f"SET LOCAL statement_timeout = {max(int(timeout * 1000), 1)}")
+        elif dialect == "sqlite":
+            dbapi_connection.set_progress_handler(self._progress, SQLITE_PROGRESS_STEPS)
+
+    def release(self, dbapi_connection: Any) -> None:
+        with self._lock:
+            self._connections.discard(dbapi_connection)
+        if hasattr(dbapi_connection, "set_progress_handler"):
+            dbapi_connection.set_progress_handler(None, 0)
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline, or ``timeout`` without one."""
+
+        if self.deadline is None:
+            return self.timeout
+        return max(self.deadline - time.monotonic(), 0.0)
+
+    def start_statement(self) -> None:
+        if self.cancelled:
+            raise StatementCancelled("request was cancelled")
+        self._started = time.monotonic()
+        if self.deadline is not None and self._started >= self.deadline:
+            self.timed_out = True
+            raise StatementCancelled("statement deadline passed")
+
+    def cancel(self) -> None:
+        """Interrupt statements running on this budget's connections."""
+
+        self.cancelled = True
+        with self._lock:
+            connections = list(self._connections)
+        for dbapi_connection in connections:
+            interrupt = getattr(dbapi_connection, "interrupt", None) or getattr(dbapi_connection, "cancel", None)
+            if interrupt is None:
+                continue
+            try:
+                interrupt()
+            except Exception as exc:  # noqa: BLE001 - the connection may be closing
+                logger.debug("Could not cancel statement: %s", exc)
+
+    def _progress(self) -> int:
+        if self.cancelled:
+            return 1
+        now = time.monotonic()
+        if now - self._started > self.timeout or (self.deadline is not None and now > self.deadline):
+            self.timed_out = True
+            return 1
+        return 0
+
+    @contextmanager
+    def applied(self) -> Iterator[StatementBudget]:
+        """Apply this budget to sessions used in this context."""
+
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+    def outcome(self, exc: BaseException) -> str | None:
+        """Return ``"timeout"``/``"cancelled"`` if ``exc`` was caused by this budget."""
+
+        if isinstance(exc, StatementCancelled):
+            return "cancelled" if self.cancelled else "timeout"
+        if not isinstance(exc, DBAPIError):
+            return None
+        original = exc.orig
+        sqlstate = getattr(original, "pgcode", None) or getattr(original, "sqlstate", None)
+        if sqlstate != QUERY_CANCELED and "interrupted" not in str(original):
+            return None
+        return "cancelled" if self.cancelled else "timeout"
+
+
+@contextmanager
+def statement_budget(timeout: float) -> Iterator[StatementBudget]:
+    """Apply a per-statement ``timeout`` (seconds) to sessions used in this context."""
+
+    with StatementBudget(timeout).applied() as budget:
+        yield budget
+
+
+def route_timeout(path: str) -> float:
+    """Statement timeout in seconds for ``path`` (longest configured prefix); 0 disables."""
+
+    settings = get_settings()
+    timeout_ms = settings.statement_timeout_ms
+    matched = ""
+    for prefix, value in settings.statement_timeout_routes.items():
+        if path.startswith(prefix) and len(prefix) > len(matched):
+            matched, timeout_ms = prefix, value
+    return max(timeout_ms, 0) / 1000
+
+
+@event.listens_for(Session, "after_begin")
+def _attach_budget(session: Session, transaction, connection: Connection) -> None:
+    budget = _current.get()
+    if budget is not None:
+        budget.attach(connection)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    budget = conn.info.get(_INFO_KEY)
+    if budget is not None:
+        budget.start_statement()
+
+
+@event.listens_for(Pool, "checkin")
+def _release_budget(dbapi_connection, connection_record) -> None:
+    if connection_record is None or dbapi_connection is None:
+        return
+    budget = connection_record.info.pop(_INFO_KEY, None)
+    if budget is not None:
+        budget.release(dbapi_connection)
+
+
+class StatementTimeoutMiddleware:
+    """Run each HTTP request under its route's statement budget.
+
+    Request body messages are passed to the endpoint as it reads them. Once
+    the body is complete (immediately for requests without one), a background
+    task reads the client's ``receive`` channel so a disconnect is noticed
+    while the endpoint is still running.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        timeout = route_timeout(scope["path"]) if scope["type"] == "http" else 0
+        if not timeout:
+            await self.app(scope, receive, send)
+            return
+
+        messages: asyncio.Queue[Message] = asyncio.Queue()
+        started = finished = False
+        watcher: asyncio.Task | None = None
+
+        def disconnected() -> None:
+            if not finished:
+                budget.cancel()
+
+        async def watch() -> None:
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    disconnected()
+                    await messages.put(message)
+                    return
+                await messages.put(message)
+
+        async def receive_wrapper() -> Message:
+            nonlocal watcher
+            if watcher is not None:
+                return await messages.get()
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                disconnected()
+            elif not message.get("more_body", False):
+                watcher = asyncio.create_task(watch())
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal started, finished
+            if message["type"] == "http.response.start":
+                started = True
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                finished = True
+            await send(message)
+
+        with statement_budget(timeout) as budget:
+            if not _has_body(scope):
+                watcher = asyncio.create_task(watch())
+            try:
+                await self.app(scope, receive_wrapper, send_wrapper)
+            except Exception as exc:
+                outcome = budget.outcome(exc)
+                if outcome is None:
+                    raise
+                route = getattr(scope.get("route"), "path", scope["path"])
+                if outcome == "cancelled":
+                    metrics.increment("db.cancelled")
+                    logger.info("Cancelled database work for disconnected client on %s", route)
+                    return  # nobody is left to answer
+                metrics.increment("db.statement_timeouts")
+                metrics.increment(f"db.statement_timeouts.{route}")
+                logger.warning("Statement timeout (%.3fs) on %s", timeout, route)
+                if not started:
+                    response = JSONResponse(
+                        {"detail": "The database took too long to respond. Please retry."},
+                        status_code=503,
+                        headers={"Retry-After": "1"},
+                    )
+                    await response(scope, receive_wrapper, send_wrapper)
+            finally:
+                if watcher is not None:
+                    watcher.cancel()
+
+
+def _has_body(scope: Scope) -> bool:
+    for name, value in scope.get("headers", ()):
+        if name == b"transfer-encoding" or (name == b"content-length" and value.strip() != b"0"):
+            return True
+    return False
@@ -0,0 +1,53 @@
+"""Export the catalog to a memory-mapped binary snapshot for API workers.
+
+Example:
+    python backend/app/export_snapshot.py /var/lib/catalog/catalog.snap
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.services.snapshot import CatalogSnapshot, export_snapshot
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+LOGGER = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "path",
+        type=Path,
+        nargs="?",
+        default=get_settings().catalog_snapshot_path or None,
+        help="Snapshot file (default: CATALOG_SNAPSHOT_PATH)",
+    )
+    args = parser.parse_args()
+    if args.path is None:
+        parser.error("pass a path or set CATALOG_SNAPSHOT_PATH")
+
+    with SessionLocal() as session:
+        version = export_snapshot(session, Path(args.path))
+    snapshot = CatalogSnapshot(Path(args.path))
+    LOGGER.info(
+        "Wrote %s (catalog version %d): %d universities, %d requirements, %d bytes",
+        args.path,
+        version,
+        snapshot.rows("universities"),
+        snapshot.rows("requirements"),
+        Path(args.path).stat().st_size,
+    )
+
+
+if __name__ == "__main__":
+    main()
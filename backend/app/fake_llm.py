@@ -0,0 +1,154 @@
+"""
+Scripted local chat model for exercising the agent without OpenAI.
+
+The model follows the same tool-call pattern the real assistant uses
+(discover filters or search, then drill into one or several universities
+in a single step, then answer) against the real TOOLS, so load tests
+exercise the full ReAct loop and database path with a configurable
+simulated latency.
+"""
+
+import itertools
+import json
+import re
+import threading
+import time
+from typing import Any, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import PrivateAttr
+
+KNOWN_EXAMS = ("IELTS", "SAT", "TOEFL", "ENT")
+KNOWN_PROGRAMS = (
+    "Computer Science",
+    "Data Science",
+    "Business Administration",
+    "Mechanical Engineering",
+    "International Relations",
+    "Finance",
+    "Architecture",
+)
+DISCOVERY_WORDS = ("available", "which countries", "what countries", "what exams", "what programs", "filters")
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Deterministic chat model that emits realistic tool-call sequences."""
+
+    latency_ms: float = 0.0
+
+    _call_ids: Any = PrivateAttr(default_factory=itertools.count)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _calls: int = PrivateAttr(default=0)
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-fake"
+
+    @property
+    def call_count(self) -> int:
+        """Number of model invocations served so far."""
+        return self._calls
+
+    def bind_tools(self, tools, *, tool_choice: Optional[str] = None, **kwargs):
+        """Tools are resolved by name in the script, so binding is a no-op."""
+        return self
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        with self._lock:
+            self._calls += 1
+        if self.latency_ms:
+            latency = self.latency_ms / 1000
+            # Like the OpenAI client, give up once the request timeout passes.
+            timeout = kwargs.get("timeout")
+            if timeout is not None and latency > timeout:
+                time.sleep(timeout)
+                raise TimeoutError(f"Request timed out after {timeout:.3f}s")
+            time.sleep(latency)
+        return ChatResult(generations=[ChatGeneration(message=self._next_message(messages))])
+
+    def _next_message(self, messages: list[BaseMessage]) -> AIMessage:
+        """Pick the next step from the latest user message and tool results."""
+        question_index = max(
+            (i for i, m in enumerate(messages) if m.type == "human"), default=0
+        )
+        question = str(messages[question_index].content) if messages else ""
+        tool_results = [m for m in messages[question_index + 1:] if m.type == "tool"]
+
+        if not tool_results:
+            lowered = question.lower()
+            if any(word in lowered for word in DISCOVERY_WORDS):
+                return self._tool_call("get_available_filters", {})
+            return self._tool_call("search_universities", _extract_filters(question))
+
+        last = tool_results[-1]
+        if len(tool_results) == 1 and last.name == "search_universities":
+            ids = _extract_ids(str(last.content))
+            lowered = question.lower()
+            if "compare" in lowered and len(ids) >= 2:
+                return self._tool_call("compare_universities", {"university_ids": ids[:3]})
+            if "details" in lowered and len(ids) >= 2:
+                return self._tool_calls(
+                    [("get_university", {"university_id": uid}) for uid in ids[:3]]
+                )
+            if ids:
+                return self._tool_call("get_university", {"university_id": ids[0]})
+
+        summary = str(last.content)[:200]
+        return AIMessage(content=f"Here is what I found in the catalog: {summary}")
+
+    def _tool_call(self, name: str, args: dict) -> AIMessage:
+        return self._tool_calls([(name, args)])
+
+    def _tool_calls(self, calls: list[tuple[str, dict]]) -> AIMessage:
+        """Emit one step with several independent tool calls."""
+        return AIMessage(
+            content="",
+            tool_calls=[
+                {"name": name, "args": args, "id": f"call_{next(self._call_ids)}"}
+                for name, args in calls
+            ],
+        )
+
+
+def _extract_filters(question: str) -> dict:
+    """Pull country code, exam and program mentions out of a question."""
+    filters: dict[str, Any] = {}
+    country = re.search(r"\b([A-Z]{2})\b", question)
+    if country:
+        filters["country"] = country.group(1)
+
+    lowered = question.lower()
+    for exam in KNOWN_EXAMS:
+        if re.search(rf"\b{exam.lower()}\b", lowered):
+            filters["exam"] = exam
+            break
+    for program in KNOWN_PROGRAMS:
+        if program.lower() in lowered:
+            filters["program"] = program
+            break
+    return filters
+
+
+def _extract_ids(content: str) -> list[int]:
+    """Read university IDs from a (possibly tabular) search tool result."""
+    try:
+        payload = json.loads(content)
+    except ValueError:
+        return []
+
+    universities = payload.get("universities") or []
+    if isinstance(universities, dict):
+        columns = universities.get("columns", [])
+        if "id" not in columns:
+            return []
+        position = columns.index("id")
+        return [row[position] for row in universities.get("rows", [])]
+    return [item["id"] for item in universities if isinstance(item, dict) and "id" in item]
@@ -0,0 +1,136 @@
+"""Benchmark per-request Python overhead of the university listing queries.
+
+Compares building a fresh expression tree for every request (the previous
+approach) with the prebuilt per-shape statements in ``university_service``.
+
+Example:
+    python backend/app/list_query_bench.py --iterations 2000 --universities 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+LOGGER = logging.getLogger(__name__)
+
+CASES = [
+    ("no filters", {}),
+    ("country", {"country_code": "KZ"}),
+    ("name search", {"query": "tech"}),
+    ("program + exam + score", {"program": "Computer Science", "exam": "IELTS", "min_score": 6.0}),
+]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000, help="Requests per case and approach")
+    parser.add_argument(
+        "--universities", type=int, default=2000, help="Pad the demo catalog with synthetic universities"
+    )
+    parser.add_argument("--database-url", default="sqlite:///./bench.db")
+    return parser.parse_args()
+
+
+def legacy_page_statement(session, filters):
+    """Per-request construction as the listing did before statement caching."""
+
+    import sqlalchemy as sa
+    from sqlalchemy import and_, func
+
+    from app.models import Country, Exam, Program, Requirement, University
+    from app.services.university_service import LIST_SELECTION, UniversityService, _parse_program_filter
+
+    conditions = []
+    if filters.country_code:
+        conditions.append(University.country.has(func.lower(Country.code) == filters.country_code.lower()))
+    if filters.query:
+        conditions.append(func.lower(University.name).contains(filters.query.lower()))
+    requirement_filters = []
+    if filters.min_score is not None:
+        requirement_filters.append(Requirement.min_score >= filters.min_score)
+    program_id, program_name = _parse_program_filter(filters.program)
+    if program_id is not None:
+        requirement_filters.append(Requirement.program_id == program_id)
+    elif program_name is not None:
+        requirement_filters.append(Requirement.program.has(func.lower(Program.name) == program_name))
+    if filters.exam:
+        requirement_filters.append(Requirement.exam.has(func.lower(Exam.name) == filters.exam.lower()))
+    if requirement_filters:
+        conditions.append(University.requirements.any(and_(*requirement_filters)))
+    stmt = sa.select(University).options(*UniversityService._load_options(LIST_SELECTION))
+    if conditions:
+        stmt = stmt.where(*conditions)
+    return stmt.order_by(University.name).offset((filters.page - 1) * filters.limit).limit(filters.limit), {}
+
+
+def cached_page_statement(session, filters):
+    """Registry lookup plus ID-resolved parameter values, as the listing does now."""
+
+    from app.services.dimensions import load_dimensions
+    from app.services.university_service import LIST_SELECTION, ListShape, _list_statements
+
+    shape = ListShape.of(filters)
+    params = shape.params(filters, load_dimensions(session))
+    params.update(offset=(filters.page - 1) * filters.limit, limit=filters.limit)
+    return _list_statements(shape, LIST_SELECTION).page, params
+
+
+def _per_request_us(function, iterations: int) -> float:
+    started = time.process_time()
+    for _ in range(iterations):
+        function()
+    return (time.process_time() - started) / iterations * 1e6
+
+
+def run(args: argparse.Namespace) -> None:
+    from app.compression_bench import add_synthetic_universities
+    from app.core.database import SessionLocal
+    from app.seed import seed
+    from app.services.university_service import UniversityFilters
+
+    seed()
+    add_synthetic_universities(args.universities)
+    approaches = [("per-request build", legacy_page_statement), ("cached statement", cached_page_statement)]
+
+    LOGGER.info("%-24s %-18s %16s %16s", "case", "approach", "build+key us", "execute us")
+    with SessionLocal() as session:
+        for label, values in CASES:
+            filters = UniversityFilters(**values)
+            for name, build in approaches:
+
+                def build_and_key() -> None:
+                    stmt, _ = build(session, filters)
+                    stmt._generate_cache_key()
+
+                def execute() -> None:
+                    stmt, params = build(session, filters)
+                    session.scalars(stmt, params).all()
+
+                execute()  # warm the compiled cache
+                LOGGER.info(
+                    "%-24s %-18s %16.1f %16.1f",
+                    label,
+                    name,
+                    _per_request_us(build_and_key, args.iterations),
+                    _per_request_us(execute, max(args.iterations // 10, 1)),
+                )
+
+
+def main() -> None:
+    args = parse_args()
+    os.environ["DATABASE_URL"] = args.database_url
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Offline load test for /api/chat using the scripted fake LLM.
+
+Requires ``httpx`` (listed in requirements.txt).
+
+Example:
+    python backend/app/loadtest.py --conversations 300 --concurrency 100 --latency-ms 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+logging.getLogger("httpx").setLevel(logging.WARNING)
+LOGGER = logging.getLogger(__name__)
+
+CONVERSATION_SCRIPTS = [
+    ["Which countries are available?", "Computer Science universities in DE"],
+    ["Universities in KZ with IELTS", "Tell me more about the first one"],
+    ["Data Science programs in TR", "compare universities in TR"],
+    ["What exams do you accept?", "Business Administration in RO with IELTS"],
+    ["Mechanical Engineering with SAT", "Finance programs in DE"],
+    ["Universities in RO", "Show details for each of them"],
+]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--conversations", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Simulated LLM latency per call")
+    parser.add_argument("--database-url", default="sqlite:///./loadtest.db")
+    parser.add_argument("--no-cache", action="store_true", help="Disable tool and response caches")
+    return parser.parse_args()
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Return the nearest-rank percentile of ``values``."""
+
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run(args: argparse.Namespace) -> None:
+    import httpx
+    from sqlalchemy import event
+
+    from app.api import chat as chat_api
+    from app.core.database import engine
+    from app.main import create_app
+    from app.seed import seed
+
+    seed()
+    app = create_app()
+
+    queries = 0
+
+    def count_query(*_args) -> None:
+        nonlocal queries
+        queries += 1
+
+    event.listen(engine, "before_cursor_execute", count_query)
+
+    chat_api.get_agent()  # build the fake-model agent before timing starts
+
+    latencies: list[float] = []
+    failures = 0
+    rejected = 0
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def conversation(client: httpx.AsyncClient, index: int) -> None:
+        nonlocal failures, rejected
+        script = CONVERSATION_SCRIPTS[index % len(CONVERSATION_SCRIPTS)]
+        conversation_id = None
+        async with semaphore:
+            for message in script:
+                started = time.perf_counter()
+                response = await client.post(
+                    "/api/chat",
+                    json={"message": message, "conversation_id": conversation_id},
+                )
+                if response.status_code == 429:
+                    rejected += 1
+                    return
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    failures += 1
+                    return
+                conversation_id = response.json()["conversation_id"]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=None) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(conversation(client, i) for i in range(args.conversations)))
+        elapsed = time.perf_counter() - started
+
+    event.remove(engine, "before_cursor_execute", count_query)
+
+    from app.core import metrics
+
+    counters = metrics.snapshot()["counters"]
+    turns = len(latencies) or 1
+    LOGGER.info(
+        "Turns: %d (%d failed, %d rejected with 429) in %.2fs -> %.1f turns/s",
+        len(latencies), failures, rejected, elapsed, turns / elapsed,
+    )
+    LOGGER.info(
+        "Latency ms: p50=%.1f p95=%.1f p99=%.1f mean=%.1f",
+        percentile(latencies, 50) * 1000,
+        percentile(latencies, 95) * 1000,
+        percentile(latencies, 99) * 1000,
+        statistics.fmean(latencies) * 1000,
+    )
+    LOGGER.info("LLM calls per turn: %.2f", counters.get("chat.llm_calls", 0) / turns)
+    LOGGER.info("DB queries per turn: %.2f", queries / turns)
+
+
+def main() -> None:
+    args = parse_args()
+    os.environ["LLM_PROVIDER"] = "fake"
+    os.environ["FAKE_LLM_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["DATABASE_URL"] = args.database_url
+    # All simulated conversations share one client address; keep the gate, lift per-client limits.
+    os.environ["CHAT_RATE_PER_MINUTE"] = "1000000"
+    os.environ["CHAT_RATE_BURST"] = "1000000"
+    if args.no_cache:
+        os.environ["TOOL_CACHE_MAXSIZE"] = "0"
+        os.environ["CHAT_CACHE_MAXSIZE"] = "0"
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
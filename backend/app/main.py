@@ -21,6 +21,7 @@ FastAPI application factory and entrypoint.
 
 5. Available endpoints:
    - GET  /api/health - Health check
+   - GET  /api/health/ready - Readiness (503 until warm-up completes)
    - POST /api/chat   - Chat with admissions assistant
 
 """
@@ -28,14 +29,20 @@ FastAPI application factory and entrypoint.
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from .core.compression import CompressionMiddleware
 from .core.config import Settings, get_settings
+from .core.timeouts import StatementTimeoutMiddleware
 from .routers import register_routers
+from .warmup import lifespan
 
 
 def create_app() -> FastAPI:
     """Create and configure a FastAPI application instance."""
     settings: Settings = get_settings()
-    app = FastAPI(title=settings.app_name, version=settings.app_version)
+    app = FastAPI(title=settings.app_name, version=settings.app_version, lifespan=lifespan)
+
+    # Statement timeouts per route; cancels database work when the client disconnects
+    app.add_middleware(StatementTimeoutMiddleware)
 
     # Add CORS middleware for frontend
     app.add_middleware(
@@ -46,6 +53,9 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Compress large JSON/CSV bodies; cached payloads arrive precompressed and pass through
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_min_bytes)
+
     register_routers(app)
 
     return app
@@ -1,16 +1,21 @@
 """SQLAlchemy models exposed for application use."""
 
+from .catalog_change import CatalogChange, CatalogState
 from .country import Country
 from .exam import Exam
 from .program import DegreeLevel, Program
 from .requirement import Requirement
 from .university import University
+from .university_search import UniversitySearch
 
 __all__ = [
+    "CatalogChange",
+    "CatalogState",
     "Country",
     "DegreeLevel",
     "Program",
     "Exam",
     "Requirement",
     "University",
+    "UniversitySearch",
 ]
@@ -0,0 +1,37 @@
+"""Denormalized listing search table model."""
+
+from __future__ import annotations
+
+from sqlalchemy import Float, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class UniversitySearch(Base):
+    """One row per (university, program, exam) requirement, flattened for filtering.
+
+    Universities without requirements get a single row with NULL program and
+    exam columns. Listing filters match dimension IDs resolved from names, and
+    university names are stored lowercased for ``LIKE`` search. Maintained by
+    ``app.services.search_table``.
+    """
+
+    __tablename__ = "university_search"
+    __table_args__ = (
+        Index("ix_university_search_university", "university_id"),
+        Index("ix_university_search_requirement", "requirement_id"),
+        Index("ix_university_search_country", "country_id"),
+        Index("ix_university_search_program", "program_id", "exam_id", "min_score"),
+        Index("ix_university_search_exam", "exam_id", "min_score"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    university_id: Mapped[int] = mapped_column(nullable=False)
+    country_id: Mapped[int] = mapped_column(nullable=False)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    requirement_id: Mapped[int | None] = mapped_column()
+    program_id: Mapped[int | None] = mapped_column()
+    exam_id: Mapped[int | None] = mapped_column()
+    min_score: Mapped[float | None] = mapped_column(Float)
+    program_count: Mapped[int] = mapped_column(nullable=False, default=0)
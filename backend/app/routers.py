@@ -5,7 +5,7 @@ from __future__ import annotations
 import logging
 from fastapi import FastAPI
 
-from .api import health, meta, universities
+from .api import admin, changes, health, match, meta, metrics, universities
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +22,11 @@ def register_routers(app: FastAPI) -> None:
     """Register all application routers."""
 
     app.include_router(health.router, prefix="/api")
+    app.include_router(admin.router, prefix="/api")
+    app.include_router(changes.router, prefix="/api")
+    app.include_router(match.router, prefix="/api")
     app.include_router(meta.router, prefix="/api")
+    app.include_router(metrics.router, prefix="/api")
     app.include_router(universities.router, prefix="/api")
     if chat is not None:
         app.include_router(chat.router, prefix="/api")
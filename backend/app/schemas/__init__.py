@@ -1,6 +1,20 @@
 """Pydantic schemas for API responses."""
 
+from .bulk import (
+    BulkItemResult,
+    BulkProgramSchema,
+    BulkUniversityItem,
+    BulkUniversityRequest,
+    BulkUniversityResponse,
+)
+from .changes import ChangesResponse, EntityChangesSchema
 from .country import CountrySchema
+from .match import (
+    MatchItem,
+    MatchRequest,
+    MatchRequirementSchema,
+    MatchResponse,
+)
 from .meta import (
     CountryMetaSchema,
     ExamMetaSchema,
@@ -9,20 +23,38 @@ from .meta import (
 )
 from .program import ProgramDetailSchema
 from .requirement import RequirementSchema
+from .suggest import SuggestionSchema, SuggestResponse
 from .university import (
+    SemanticSearchItem,
+    SemanticSearchResponse,
     UniversityDetailSchema,
     UniversityListItem,
     UniversityListResponse,
 )
 
 __all__ = [
+    "BulkItemResult",
+    "BulkProgramSchema",
+    "BulkUniversityItem",
+    "BulkUniversityRequest",
+    "BulkUniversityResponse",
+    "ChangesResponse",
+    "EntityChangesSchema",
     "CountrySchema",
     "CountryMetaSchema",
     "ProgramDetailSchema",
     "ProgramMetaSchema",
     "RequirementSchema",
     "ExamMetaSchema",
+    "MatchItem",
+    "MatchRequest",
+    "MatchRequirementSchema",
+    "MatchResponse",
     "MetaResponse",
+    "SemanticSearchItem",
+    "SemanticSearchResponse",
+    "SuggestionSchema",
+    "SuggestResponse",
     "UniversityListItem",
     "UniversityListResponse",
     "UniversityDetailSchema",
@@ -0,0 +1,59 @@
+"""Bulk admin write request and response schemas."""
+
+from __future__ import annotations
+
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field
+
+MAX_BULK_ITEMS = 1000
+
+
+class BulkProgramSchema(BaseModel):
+    """A program offered by the university with minimum scores keyed by exam name."""
+
+    name: str = Field(min_length=1, max_length=255)
+    degree_level: str
+    requirements: dict[str, float] = Field(default_factory=dict, examples=[{"IELTS": 6.5, "SAT": 1350}])
+
+
+class BulkUniversityItem(BaseModel):
+    """One write; omitted fields are left unchanged on update."""
+
+    op: Literal["create", "update", "delete"]
+    id: int | None = None
+    name: str | None = Field(default=None, min_length=1, max_length=255)
+    city: str | None = Field(default=None, min_length=1, max_length=120)
+    description: str | None = None
+    country: str | None = Field(default=None, description="Country code, e.g. KZ")
+    programs: list[BulkProgramSchema] | None = Field(
+        default=None, description="Replaces all requirements of the university when present"
+    )
+
+
+class BulkUniversityRequest(BaseModel):
+    """Writes applied together in one transaction."""
+
+    items: list[BulkUniversityItem] = Field(min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class BulkItemResult(BaseModel):
+    """Outcome of one item: created, updated, unchanged, deleted, error or skipped."""
+
+    index: int
+    op: str
+    id: int | None
+    status: str
+    error: str | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BulkUniversityResponse(BaseModel):
+    """Per-item results; ``applied`` is false when any item was rejected."""
+
+    applied: bool
+    version: int
+    results: list[BulkItemResult]
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,27 @@
+"""Catalog change feed schemas."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict
+
+
+class EntityChangesSchema(BaseModel):
+    """Changed rows of one catalog table."""
+
+    upserted: list[dict[str, Any]]
+    deleted: list[int]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ChangesResponse(BaseModel):
+    """Net catalog changes between two versions."""
+
+    since: int
+    version: int
+    has_more: bool
+    changes: dict[str, EntityChangesSchema]
+
+    model_config = ConfigDict(from_attributes=True)
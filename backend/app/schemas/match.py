@@ -0,0 +1,44 @@
+"""Eligibility matching request and response schemas."""
+
+from __future__ import annotations
+
+from pydantic import BaseModel, Field
+
+from .country import CountrySchema
+
+
+class MatchRequest(BaseModel):
+    """Student exam scores keyed by exam name."""
+
+    scores: dict[str, float] = Field(min_length=1, examples=[{"IELTS": 6.5, "SAT": 1300}])
+    limit: int = Field(default=100, ge=1, le=1000)
+
+
+class MatchRequirementSchema(BaseModel):
+    """Requirement met by the student, with the score margin."""
+
+    exam: str
+    min_score: float
+    score: float
+
+
+class MatchItem(BaseModel):
+    """Eligible university program ranked by margin."""
+
+    university_id: int
+    university_name: str
+    city: str
+    country: CountrySchema
+    program_id: int
+    program_name: str
+    degree_level: str
+    margin: float
+    requirements: list[MatchRequirementSchema]
+
+
+class MatchResponse(BaseModel):
+    """Eligible programs and any exams the catalog does not know."""
+
+    items: list[MatchItem]
+    total: int
+    unknown_exams: list[str]
@@ -0,0 +1,22 @@
+"""Autocomplete response schemas."""
+
+from __future__ import annotations
+
+from pydantic import BaseModel, ConfigDict
+
+
+class SuggestionSchema(BaseModel):
+    """Typed suggestion; ``value`` is the filter or ID to use when selected."""
+
+    label: str
+    type: str
+    value: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SuggestResponse(BaseModel):
+    """Suggestions for a search-box prefix."""
+
+    prefix: str
+    items: list[SuggestionSchema]
@@ -9,13 +9,18 @@ from .program import ProgramDetailSchema
 
 
 class UniversityListItem(BaseModel):
-    """Short representation for list responses."""
+    """Short representation for list responses.
+
+    Only ``id`` is always present; the rest follow the ``fields``/``include``
+    query parameters and are omitted when not requested.
+    """
 
     id: int
-    name: str
-    city: str
-    country: CountrySchema
-    programs_count: int
+    name: str | None = None
+    city: str | None = None
+    description: str | None = None
+    country: CountrySchema | None = None
+    programs_count: int | None = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -30,13 +35,34 @@ class UniversityListResponse(BaseModel):
 
 
 class UniversityDetailSchema(BaseModel):
-    """Detailed university representation with requirements."""
+    """Detailed university representation with requirements.
+
+    Fields not selected with ``fields``/``include`` are omitted.
+    """
+
+    id: int
+    name: str | None = None
+    city: str | None = None
+    description: str | None = None
+    country: CountrySchema | None = None
+    programs: list[ProgramDetailSchema] | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SemanticSearchItem(BaseModel):
+    """University ranked by similarity to a free-text query."""
 
     id: int
     name: str
     city: str
     description: str | None
     country: CountrySchema
-    programs: list[ProgramDetailSchema]
+    score: float
 
-    model_config = ConfigDict(from_attributes=True)
+
+class SemanticSearchResponse(BaseModel):
+    """Universities whose profile best matches the query text."""
+
+    text: str
+    items: list[SemanticSearchItem]
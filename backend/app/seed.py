@@ -23,6 +23,7 @@ from app.models import (
     Requirement,
     University,
 )
+from app.services import search_table  # noqa: F401 - keeps university_search in sync
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
 LOGGER = logging.getLogger(__name__)
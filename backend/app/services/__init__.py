@@ -1,5 +1,23 @@
 """Service layer packages."""
 
-from .university_service import UniversityFilters, UniversityService
+from .conversation_store import (
+    Conversation,
+    ConversationBackend,
+    ConversationStore,
+    InMemoryConversationBackend,
+)
+from . import search_table  # noqa: F401 - registers the university_search sync hook
+from .intent_router import FastPathReply, IntentRouter
+from .university_service import FieldSelection, UniversityFilters, UniversityService
 
-__all__ = ["UniversityFilters", "UniversityService"]
+__all__ = [
+    "Conversation",
+    "ConversationBackend",
+    "ConversationStore",
+    "FastPathReply",
+    "FieldSelection",
+    "InMemoryConversationBackend",
+    "IntentRouter",
+    "UniversityFilters",
+    "UniversityService",
+]
@@ -0,0 +1,369 @@
+"""Transactional bulk writes of universities with their programs and requirements."""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from app.core.catalog import (
+    claim_catalog_version,
+    pending_catalog_changes,
+    read_catalog_version,
+    record_catalog_changes,
+)
+from app.models import Country, DegreeLevel, Exam, Program, Requirement, University
+
+OPERATIONS = ("create", "update", "delete")
+# Columns a write may set; ``country`` is a country code resolved to ``country_id``.
+WRITABLE_FIELDS = ("name", "city", "description", "country")
+REQUIRED_ON_CREATE = ("name", "city", "country")
+
+
+@dataclass
+class ProgramWrite:
+    """A program offered by a university and its minimum scores per exam name."""
+
+    name: str
+    degree_level: str
+    requirements: dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class UniversityWrite:
+    """One bulk item.
+
+    ``values`` holds only the fields the caller sent, so updates are partial.
+    ``programs=None`` leaves requirements alone; a list replaces them.
+    """
+
+    op: str
+    id: int | None = None
+    values: dict[str, Any] = field(default_factory=dict)
+    programs: list[ProgramWrite] | None = None
+
+
+@dataclass
+class WriteResult:
+    """Outcome of one bulk item."""
+
+    index: int
+    op: str
+    id: int | None
+    status: str
+    error: str | None = None
+
+
+@dataclass
+class BulkWriteResult:
+    """Per-item outcomes; nothing is written unless every item is valid."""
+
+    applied: bool
+    version: int
+    results: list[WriteResult]
+
+
+class _Lookups:
+    """Rows referenced by a batch, fetched with one query per table."""
+
+    def __init__(self, session: Session, writes: Sequence[UniversityWrite]) -> None:
+        ids = {write.id for write in writes if write.id is not None}
+        codes = {
+            str(write.values["country"]).upper()
+            for write in writes
+            if write.values.get("country") is not None
+        }
+        exams = {exam for program in _programs(writes) for exam in program.requirements}
+        names = {program.name for program in _programs(writes)}
+
+        self.universities = {
+            row.id: row
+            for row in session.execute(
+                sa.select(
+                    University.id, University.name, University.city, University.description, University.country_id
+                ).where(University.id.in_(ids))
+            )
+        }
+        self.countries: dict[str, int] = dict(
+            session.execute(sa.select(Country.code, Country.id).where(Country.code.in_(codes))).all()
+        )
+        self.exams: dict[str, int] = dict(
+            session.execute(sa.select(Exam.name, Exam.id).where(Exam.name.in_(exams))).all()
+        )
+        self.programs: dict[tuple[str, str], int] = {
+            (name, _level(level)): program_id
+            for program_id, name, level in session.execute(
+                sa.select(Program.id, Program.name, Program.degree_level).where(Program.name.in_(names))
+            )
+        }
+
+
+def _programs(writes: Sequence[UniversityWrite]):
+    for write in writes:
+        yield from write.programs or ()
+
+
+def _level(value) -> str:
+    return str(getattr(value, "value", value))
+
+
+def apply_university_writes(session: Session, writes: Sequence[UniversityWrite]) -> BulkWriteResult:
+    """Validate and apply a batch of university writes in one transaction.
+
+    Referenced rows are read with one query per table, and each kind of write
+    is a single multi-row statement: program and university inserts, bulk
+    updates by primary key, and ``IN`` deletes. Requirement sets are diffed
+    against the stored rows, so unchanged requirements are not rewritten and
+    an item without effect reports ``unchanged``. Programs named in a write
+    are created if missing. If any item is invalid, nothing is written and
+    the valid items report ``skipped``.
+
+    The catalog version is claimed before anything is read. Its row lock
+    serializes bulk writers, so concurrent batches cannot both create the
+    same program or diff against stale rows. A batch that changes nothing
+    rolls back and leaves the version as it was.
+    """
+
+    version = claim_catalog_version(session)
+    lookups = _Lookups(session, writes)
+    errors = _validate(writes, lookups)
+    if errors:
+        session.rollback()
+        return BulkWriteResult(
+            applied=False,
+            version=read_catalog_version(session),
+            results=[
+                WriteResult(
+                    index=index,
+                    op=write.op,
+                    id=write.id,
+                    status="error" if index in errors else "skipped",
+                    error=errors.get(index),
+                )
+                for index, write in enumerate(writes)
+            ],
+        )
+
+    try:
+        statuses = _apply(session, writes, lookups)
+        if pending_catalog_changes(session):
+            session.commit()
+        else:
+            session.rollback()
+            version = read_catalog_version(session)
+    except Exception:
+        session.rollback()
+        raise
+    return BulkWriteResult(
+        applied=True,
+        version=version,
+        results=[
+            WriteResult(index=index, op=write.op, id=write.id, status=statuses[index])
+            for index, write in enumerate(writes)
+        ],
+    )
+
+
+def _validate(writes: Sequence[UniversityWrite], lookups: _Lookups) -> dict[int, str]:
+    errors: dict[int, str] = {}
+    repeated = {
+        university_id
+        for university_id, count in Counter(write.id for write in writes if write.id is not None).items()
+        if count > 1
+    }
+    for index, write in enumerate(writes):
+        error = None
+        if write.op not in OPERATIONS:
+            error = f"Unknown op '{write.op}'. Allowed: {', '.join(OPERATIONS)}"
+        elif write.op == "create":
+            missing = [name for name in REQUIRED_ON_CREATE if write.values.get(name) is None]
+            if write.id is not None:
+                error = "create does not take an id"
+            elif missing:
+                error = f"Missing {', '.join(missing)}"
+        elif write.id is None:
+            error = f"{write.op} requires an id"
+        elif write.id not in lookups.universities:
+            error = f"University {write.id} not found"
+        elif write.id in repeated:
+            error = f"University {write.id} appears in more than one item"
+        elif write.op == "delete" and (write.values or write.programs is not None):
+            error = "delete takes only an id"
+        error = error or _validate_values(write, lookups)
+        if error:
+            errors[index] = error
+    return errors
+
+
+def _validate_values(write: UniversityWrite, lookups: _Lookups) -> str | None:
+    unknown = set(write.values) - set(WRITABLE_FIELDS)
+    if unknown:
+        return f"Unknown fields: {', '.join(sorted(unknown))}"
+    for name in ("name", "city", "country"):
+        if name in write.values and write.values[name] is None:
+            return f"{name} cannot be null"
+    code = write.values.get("country")
+    if code is not None and str(code).upper() not in lookups.countries:
+        return f"Unknown country '{code}'"
+    seen: set[tuple[str, str]] = set()
+    for program in write.programs or ():
+        if program.degree_level not in {level.value for level in DegreeLevel}:
+            return f"Unknown degree level '{program.degree_level}' for {program.name}"
+        key = (program.name, program.degree_level)
+        if key in seen:
+            return f"Program {program.name} ({program.degree_level}) is listed twice"
+        seen.add(key)
+        missing = sorted(set(program.requirements) - set(lookups.exams))
+        if missing:
+            return f"Unknown exams for {program.name}: {', '.join(missing)}"
+    return None
+
+
+def _apply(session: Session, writes: Sequence[UniversityWrite], lookups: _Lookups) -> dict[int, str]:
+    statuses: dict[int, str] = {}
+    _create_programs(session, writes, lookups)
+
+    deleted = [write.id for write in writes if write.op == "delete"]
+    if deleted:
+        requirement_ids = session.scalars(
+            sa.delete(Requirement)
+            .where(Requirement.university_id.in_(deleted))
+            .returning(Requirement.id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        session.execute(
+            sa.delete(University)
+            .where(University.id.in_(deleted))
+            .execution_options(synchronize_session=False)
+        )
+        record_catalog_changes(session, "requirements", requirement_ids, deleted=True)
+        record_catalog_changes(session, "universities", deleted, deleted=True)
+        statuses.update({index: "deleted" for index, write in enumerate(writes) if write.op == "delete"})
+
+    created = [(index, write) for index, write in enumerate(writes) if write.op == "create"]
+    if created:
+        new_ids = session.scalars(
+            sa.insert(University).returning(University.id, sort_by_parameter_order=True),
+            [
+                {
+                    "name": write.values["name"],
+                    "city": write.values["city"],
+                    "description": write.values.get("description"),
+                    "country_id": lookups.countries[str(write.values["country"]).upper()],
+                }
+                for _, write in created
+            ],
+        ).all()
+        for (index, write), university_id in zip(created, new_ids):
+            write.id = university_id
+            statuses[index] = "created"
+        record_catalog_changes(session, "universities", new_ids)
+
+    changed_rows = []
+    for index, write in enumerate(writes):
+        if write.op != "update":
+            continue
+        current = lookups.universities[write.id]
+        row = {}
+        for name, value in write.values.items():
+            column = "country_id" if name == "country" else name
+            if name == "country":
+                value = lookups.countries[str(value).upper()]
+            if getattr(current, column) != value:
+                row[column] = value
+        statuses[index] = "updated" if row else "unchanged"
+        if row:
+            changed_rows.append({"id": write.id, **row})
+    if changed_rows:
+        session.execute(sa.update(University), changed_rows)
+        record_catalog_changes(session, "universities", [row["id"] for row in changed_rows])
+
+    for university_id in _replace_requirements(session, writes, lookups):
+        for index, write in enumerate(writes):
+            if write.id == university_id and statuses[index] == "unchanged":
+                statuses[index] = "updated"
+    return statuses
+
+
+def _create_programs(session: Session, writes: Sequence[UniversityWrite], lookups: _Lookups) -> None:
+    missing = {
+        (program.name, program.degree_level)
+        for program in _programs(writes)
+        if (program.name, program.degree_level) not in lookups.programs
+    }
+    if not missing:
+        return
+    rows = session.execute(
+        sa.insert(Program).returning(Program.id, Program.name, Program.degree_level),
+        [{"name": name, "degree_level": DegreeLevel(level)} for name, level in sorted(missing)],
+    ).all()
+    for program_id, name, level in rows:
+        lookups.programs[(name, _level(level))] = program_id
+    record_catalog_changes(session, "programs", [row.id for row in rows])
+
+
+def _replace_requirements(
+    session: Session, writes: Sequence[UniversityWrite], lookups: _Lookups
+) -> set[int]:
+    """Make each written program list the university's full requirement set.
+
+    Returns the ids of universities whose requirements changed.
+    """
+
+    desired: dict[tuple[int, int, int], float] = {}
+    replaced = [write for write in writes if write.programs is not None and write.op != "delete"]
+    for write in replaced:
+        for program in write.programs:
+            program_id = lookups.programs[(program.name, program.degree_level)]
+            for exam, score in program.requirements.items():
+                desired[(write.id, program_id, lookups.exams[exam])] = score
+    if not replaced:
+        return set()
+
+    existing = {
+        (row.university_id, row.program_id, row.exam_id): row
+        for row in session.execute(
+            sa.select(
+                Requirement.id,
+                Requirement.university_id,
+                Requirement.program_id,
+                Requirement.exam_id,
+                Requirement.min_score,
+            ).where(Requirement.university_id.in_([write.id for write in replaced]))
+        )
+    }
+    removed = [row for key, row in existing.items() if key not in desired]
+    updated = [
+        {"id": existing[key].id, "min_score": score}
+        for key, score in desired.items()
+        if key in existing and existing[key].min_score != score
+    ]
+    added = [key for key in desired if key not in existing]
+
+    if removed:
+        session.execute(
+            sa.delete(Requirement)
+            .where(Requirement.id.in_([row.id for row in removed]))
+            .execution_options(synchronize_session=False)
+        )
+        record_catalog_changes(session, "requirements", [row.id for row in removed], deleted=True)
+    if updated:
+        session.execute(sa.update(Requirement), updated)
+        record_catalog_changes(session, "requirements", [row["id"] for row in updated])
+    if added:
+        added_ids = session.scalars(
+            sa.insert(Requirement).returning(Requirement.id),
+            [
+                {"university_id": key[0], "program_id": key[1], "exam_id": key[2], "min_score": desired[key]}
+                for key in added
+            ],
+        ).all()
+        record_catalog_changes(session, "requirements", added_ids)
+
+    changed = {row.university_id for row in removed}
+    changed.update(key[0] for key in desired if key not in existing or existing[key].min_score != desired[key])
+    return changed
@@ -0,0 +1,101 @@
+"""Incremental catalog change feed built from the ``catalog_changes`` log."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from app.core.catalog import read_catalog_version
+from app.models import CatalogChange, Country, Exam, Program, Requirement, University
+
+# Change-feed entity name -> model, in dependency order for consumers applying upserts.
+ENTITIES = {
+    "countries": Country,
+    "exams": Exam,
+    "programs": Program,
+    "universities": University,
+    "requirements": Requirement,
+}
+
+DEFAULT_LIMIT = 1000
+
+
+@dataclass
+class EntityChanges:
+    """Current rows of written entities and ids of deleted ones."""
+
+    upserted: list[dict[str, Any]] = field(default_factory=list)
+    deleted: list[int] = field(default_factory=list)
+
+
+@dataclass
+class ChangeSet:
+    """Net changes in ``(since, version]``; ``has_more`` means fetch again from ``version``."""
+
+    since: int
+    version: int
+    has_more: bool
+    changes: dict[str, EntityChanges]
+
+
+def load_changes(session: Session, since: int, limit: int = DEFAULT_LIMIT) -> ChangeSet:
+    """Return the net effect of catalog writes after version ``since``.
+
+    At most ``limit`` log entries are read, cut at a version boundary so a page
+    never holds part of a transaction (a single larger transaction is returned
+    whole). Each entity appears once with its latest state: its current row if
+    it still exists, otherwise its id under ``deleted``.
+    """
+
+    # Read the version first: every change up to it is already committed.
+    current = read_catalog_version(session)
+    entries = _log(session, CatalogChange.version > since, CatalogChange.version <= current, limit=limit + 1)
+
+    version, has_more = max(since, current), False
+    if len(entries) > limit:
+        has_more = True
+        boundary = entries[limit].version
+        if entries[0].version == boundary:
+            entries = _log(session, CatalogChange.version == boundary)
+        else:
+            entries = [entry for entry in entries if entry.version < boundary]
+        version = entries[-1].version
+
+    latest: dict[tuple[str, int], bool] = {}
+    for entry in entries:
+        latest[(entry.entity, entry.entity_id)] = entry.deleted
+
+    changes: dict[str, EntityChanges] = {}
+    for entity, model in ENTITIES.items():
+        written = [entity_id for (name, entity_id), deleted in latest.items() if name == entity and not deleted]
+        removed = {entity_id for (name, entity_id), deleted in latest.items() if name == entity and deleted}
+        if not written and not removed:
+            continue
+        rows = _current_rows(session, model, written)
+        # Rows deleted by a later, not yet returned, version read as deletions.
+        removed.update(entity_id for entity_id in written if entity_id not in rows)
+        changes[entity] = EntityChanges(
+            upserted=[rows[entity_id] for entity_id in sorted(rows)],
+            deleted=sorted(removed),
+        )
+    return ChangeSet(since=since, version=version, has_more=has_more, changes=changes)
+
+
+def _log(session: Session, *conditions, limit: int | None = None) -> list:
+    return session.execute(
+        sa.select(CatalogChange.version, CatalogChange.entity, CatalogChange.entity_id, CatalogChange.deleted)
+        .where(*conditions)
+        .order_by(CatalogChange.version, CatalogChange.id)
+        .limit(limit)
+    ).all()
+
+
+def _current_rows(session: Session, model, ids: list[int]) -> dict[int, dict[str, Any]]:
+    if not ids:
+        return {}
+    table = model.__table__
+    rows = session.execute(sa.select(table).where(table.c.id.in_(ids))).mappings()
+    return {row["id"]: {key: getattr(value, "value", value) for key, value in row.items()} for row in rows}
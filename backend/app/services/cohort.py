@@ -0,0 +1,307 @@
+"""Batch eligibility matching for cohorts of students read from CSV."""
+
+from __future__ import annotations
+
+import csv
+import io
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from .matching import RequirementMatrix
+
+# Upper bound on students x rows x exams cells evaluated at once inside a worker.
+MAX_BLOCK_CELLS = 4_000_000
+
+OUTPUT_HEADER = [
+    "student_id",
+    "university_id",
+    "university_name",
+    "country_code",
+    "program_id",
+    "program_name",
+    "degree_level",
+    "margin",
+]
+
+_worker_matrix: RequirementMatrix | None = None
+
+
+def _pool_context() -> multiprocessing.context.BaseContext:
+    """Start workers without forking the parent.
+
+    Jobs run on a thread of a server process; a forked child would inherit its
+    other threads' locks and open database connections.
+    """
+
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+@dataclass
+class CohortStats:
+    """Outcome of a cohort matching run."""
+
+    students: int = 0
+    matches: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def students_per_second(self) -> float:
+        return self.students / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+def run_cohort_match(
+    matrix: RequirementMatrix,
+    input_path: Path,
+    output_path: Path,
+    workers: int | None = None,
+    chunk_size: int = 1000,
+    progress: Callable[[CohortStats], None] | None = None,
+) -> CohortStats:
+    """Match every student in ``input_path`` and stream matches to ``output_path``.
+
+    The input CSV has a ``student_id`` column and one column per exam name;
+    blank cells mean the student has no score for that exam. Chunks are matched
+    on a process pool (``workers`` defaults to the CPU count; 1 runs inline)
+    and written in input order.
+    """
+
+    workers = workers or os.cpu_count() or 1
+    stats = CohortStats()
+    started = time.perf_counter()
+
+    with open(input_path, newline="", encoding="utf-8") as source, open(
+        output_path, "w", newline="", encoding="utf-8"
+    ) as target:
+        csv.writer(target).writerow(OUTPUT_HEADER)
+
+        def write(students: int, matches: int, text: str) -> None:
+            target.write(text)
+            stats.students += students
+            stats.matches += matches
+            stats.elapsed_seconds = time.perf_counter() - started
+            if progress is not None:
+                progress(stats)
+
+        chunks = _read_chunks(source, matrix, chunk_size)
+        if workers == 1:
+            for student_ids, vectors in chunks:
+                write(len(student_ids), *_match_block(matrix, student_ids, vectors))
+        else:
+            _run_pool(matrix, chunks, workers, write)
+
+    stats.elapsed_seconds = time.perf_counter() - started
+    return stats
+
+
+def _run_pool(
+    matrix: RequirementMatrix,
+    chunks: Iterator[tuple[list[str], np.ndarray]],
+    workers: int,
+    write: Callable[[int, int, str], None],
+) -> None:
+    """Fan chunks out to processes, keeping a bounded window of chunks in flight."""
+
+    in_flight: deque[tuple[int, Future]] = deque()
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=_pool_context(), initializer=_init_worker, initargs=(matrix,)
+    ) as pool:
+        for student_ids, vectors in chunks:
+            in_flight.append((len(student_ids), pool.submit(_match_chunk, student_ids, vectors)))
+            if len(in_flight) >= workers * 2:
+                count, future = in_flight.popleft()
+                write(count, *future.result())
+        while in_flight:
+            count, future = in_flight.popleft()
+            write(count, *future.result())
+
+
+def _init_worker(matrix: RequirementMatrix) -> None:
+    global _worker_matrix
+    _worker_matrix = matrix
+
+
+def _match_chunk(student_ids: list[str], vectors: np.ndarray) -> tuple[int, str]:
+    assert _worker_matrix is not None
+    return _match_block(_worker_matrix, student_ids, vectors)
+
+
+def _match_block(
+    matrix: RequirementMatrix, student_ids: list[str], vectors: np.ndarray
+) -> tuple[int, str]:
+    """Return the match count and CSV rows for a chunk, best margin first per student.
+
+    Formatting happens here so pool workers, not the writer, do the per-row work.
+    """
+
+    if not matrix.rows or not student_ids:
+        return 0, ""
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    prefixes = [
+        [
+            row.university_id,
+            row.university_name,
+            row.country_code,
+            row.program_id,
+            row.program_name,
+            row.degree_level,
+        ]
+        for row in matrix.rows
+    ]
+    cells_per_student = max(len(matrix.rows) * max(len(matrix.exams), 1), 1)
+    block = max(1, MAX_BLOCK_CELLS // cells_per_student)
+    matches = 0
+
+    for start in range(0, len(student_ids), block):
+        eligible, margins = matrix.eligibility(vectors[start:start + block])
+        for offset in range(eligible.shape[0]):
+            positions = np.flatnonzero(eligible[offset])
+            ordered = positions[np.argsort(-margins[offset, positions], kind="stable")]
+            student_id = student_ids[start + offset]
+            writer.writerows(
+                [student_id, *prefixes[position], f"{margins[offset, position]:.4f}"]
+                for position in ordered
+            )
+            matches += len(ordered)
+    return matches, buffer.getvalue()
+
+
+def _read_chunks(
+    source, matrix: RequirementMatrix, chunk_size: int
+) -> Iterator[tuple[list[str], np.ndarray]]:
+    """Yield (student IDs, score matrix) chunks aligned to the matrix exam columns."""
+
+    reader = csv.reader(source)
+    header = next(reader, None)
+    if not header:
+        return
+    normalized = [column.strip().lower() for column in header]
+    if "student_id" not in normalized:
+        raise ValueError("Input CSV must have a student_id column")
+    id_column = normalized.index("student_id")
+    columns = [
+        (position, matrix.exam_index[name])
+        for position, name in enumerate(normalized)
+        if name in matrix.exam_index
+    ]
+
+    student_ids: list[str] = []
+    vectors = np.full((chunk_size, len(matrix.exams)), np.nan, dtype=np.float64)
+    for record in reader:
+        if not record:
+            continue
+        row = len(student_ids)
+        student_ids.append(record[id_column])
+        for position, column in columns:
+            value = record[position].strip() if position < len(record) else ""
+            if value:
+                vectors[row, column] = float(value)
+        if len(student_ids) == chunk_size:
+            yield student_ids, vectors
+            student_ids = []
+            vectors = np.full((chunk_size, len(matrix.exams)), np.nan, dtype=np.float64)
+    if student_ids:
+        yield student_ids, vectors[: len(student_ids)]
+
+
+@dataclass
+class CohortJob:
+    """Background cohort matching job tracked for polling."""
+
+    id: str
+    input_path: Path
+    output_path: Path
+    status: str = "pending"
+    stats: CohortStats = field(default_factory=CohortStats)
+    error: str | None = None
+    finished_at: float | None = None  # time.monotonic() when completed or failed
+
+
+class CohortJobRegistry:
+    """Runs cohort jobs on background threads and keeps their status in memory.
+
+    Finished jobs and their files are removed ``ttl_seconds`` after they end.
+    """
+
+    def __init__(self, directory: Path, workers: int | None = None, ttl_seconds: float = 3600.0) -> None:
+        self.directory = directory
+        self.workers = workers
+        self.ttl_seconds = ttl_seconds
+        self._jobs: dict[str, CohortJob] = {}
+        self._lock = threading.Lock()
+
+    def create(self) -> CohortJob:
+        """Register a job whose input file the caller will write."""
+
+        self.expire()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        job_id = uuid.uuid4().hex
+        job = CohortJob(
+            id=job_id,
+            input_path=self.directory / f"{job_id}-input.csv",
+            output_path=self.directory / f"{job_id}-matches.csv",
+        )
+        with self._lock:
+            self._jobs[job_id] = job
+        return job
+
+    def get(self, job_id: str) -> CohortJob | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def discard(self, job: CohortJob) -> None:
+        """Forget ``job`` and delete its files."""
+
+        with self._lock:
+            self._jobs.pop(job.id, None)
+        job.input_path.unlink(missing_ok=True)
+        job.output_path.unlink(missing_ok=True)
+
+    def expire(self, now: float | None = None) -> list[str]:
+        """Discard jobs that finished more than ``ttl_seconds`` ago; return their IDs."""
+
+        cutoff = (time.monotonic() if now is None else now) - self.ttl_seconds
+        with self._lock:
+            expired = [
+                job for job in self._jobs.values() if job.finished_at is not None and job.finished_at <= cutoff
+            ]
+        for job in expired:
+            self.discard(job)
+        return [job.id for job in expired]
+
+    def start(self, job: CohortJob, matrix: RequirementMatrix) -> None:
+        """Run ``job`` against ``matrix`` on a daemon thread."""
+
+        thread = threading.Thread(
+            target=self._run, args=(job, matrix), name=f"cohort-{job.id}", daemon=True
+        )
+        thread.start()
+
+    def _run(self, job: CohortJob, matrix: RequirementMatrix) -> None:
+        job.status = "running"
+        try:
+            job.stats = run_cohort_match(
+                matrix,
+                job.input_path,
+                job.output_path,
+                workers=self.workers,
+                progress=lambda stats: setattr(job, "stats", stats),
+            )
+            job.status = "completed"
+        except Exception as exc:  # surfaced through the polling endpoint
+            job.error = str(exc)
+            job.status = "failed"
+        finally:
+            job.finished_at = time.monotonic()
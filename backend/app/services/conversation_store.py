@@ -0,0 +1,133 @@
+"""Server-side chat conversations with bounded, summarized history."""
+
+from __future__ import annotations
+
+import threading
+import uuid
+from dataclasses import dataclass, field
+from typing import Protocol
+
+from app.core.cache import MISSING, TTLCache
+from app.core.encoding import estimate_tokens
+
+# Characters kept from each folded message when it moves into the summary.
+SUMMARY_SNIPPET_CHARS = 160
+
+
+@dataclass
+class Conversation:
+    """Conversation state: a rolling summary plus the most recent turns."""
+
+    id: str
+    summary: str = ""
+    turns: list[dict[str, str]] = field(default_factory=list)
+
+    def messages(self) -> list[dict[str, str]]:
+        """Return agent-ready messages, leading with the summary if any."""
+
+        messages: list[dict[str, str]] = []
+        if self.summary:
+            messages.append(
+                {"role": "system", "content": f"Summary of earlier conversation:\n{self.summary}"}
+            )
+        messages.extend(self.turns)
+        return messages
+
+
+class ConversationBackend(Protocol):
+    """Persistence interface for conversations (in-memory, Redis, ...)."""
+
+    def load(self, conversation_id: str) -> Conversation | None: ...
+
+    def save(self, conversation: Conversation) -> None: ...
+
+    def delete(self, conversation_id: str) -> None: ...
+
+
+class InMemoryConversationBackend:
+    """Process-local backend with idle expiry and LRU eviction."""
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 3600.0) -> None:
+        self._cache: TTLCache[Conversation] = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def load(self, conversation_id: str) -> Conversation | None:
+        conversation = self._cache.get(conversation_id)
+        return None if conversation is MISSING else conversation
+
+    def save(self, conversation: Conversation) -> None:
+        self._cache.set(conversation.id, conversation)
+
+    def delete(self, conversation_id: str) -> None:
+        self._cache.delete(conversation_id)
+
+
+class ConversationStore:
+    """Keeps per-conversation prompt size flat by folding old turns into a summary."""
+
+    def __init__(
+        self,
+        backend: ConversationBackend,
+        token_budget: int = 2000,
+        summary_token_budget: int = 300,
+    ) -> None:
+        self.backend = backend
+        self.token_budget = token_budget
+        self.summary_token_budget = summary_token_budget
+        self._lock = threading.Lock()
+
+    def get_or_create(self, conversation_id: str | None = None) -> Conversation:
+        """Load a conversation, starting a fresh one for new or expired IDs.
+
+        Fresh conversations always get a server-generated ID; an unknown
+        client-supplied ID is never adopted.
+        """
+
+        if conversation_id:
+            conversation = self.backend.load(conversation_id)
+            if conversation is not None:
+                return conversation
+        return Conversation(id=uuid.uuid4().hex)
+
+    def seed(self, conversation: Conversation, turns: list[dict[str, str]]) -> None:
+        """Start an empty conversation from client-supplied history."""
+
+        with self._lock:
+            if conversation.turns or conversation.summary:
+                return
+            conversation.turns.extend(turns)
+            self.compact(conversation)
+
+    def append_turn(self, conversation: Conversation, user_message: str, reply: str) -> None:
+        """Record a completed turn, compact the history and persist it."""
+
+        with self._lock:
+            conversation.turns.append({"role": "user", "content": user_message})
+            conversation.turns.append({"role": "assistant", "content": reply})
+            self.compact(conversation)
+            self.backend.save(conversation)
+
+    def compact(self, conversation: Conversation) -> None:
+        """Fold the oldest turns into the summary until history fits the budget."""
+
+        folded: list[str] = []
+        while len(conversation.turns) > 2 and _history_tokens(conversation.turns) > self.token_budget:
+            turn = conversation.turns.pop(0)
+            folded.append(_summarize_turn(turn))
+
+        if folded:
+            lines = [line for line in conversation.summary.splitlines() if line] + folded
+            while len(lines) > 1 and estimate_tokens("\n".join(lines)) > self.summary_token_budget:
+                lines.pop(0)
+            conversation.summary = "\n".join(lines)
+
+
+def _history_tokens(turns: list[dict[str, str]]) -> int:
+    return sum(estimate_tokens(turn["content"]) for turn in turns)
+
+
+def _summarize_turn(turn: dict[str, str]) -> str:
+    content = " ".join(turn["content"].split())
+    if len(content) > SUMMARY_SNIPPET_CHARS:
+        content = content[: SUMMARY_SNIPPET_CHARS - 3].rstrip() + "..."
+    speaker = "User asked" if turn["role"] == "user" else "Assistant replied"
+    return f"- {speaker}: {content}"
@@ -0,0 +1,119 @@
+"""Cached lookup tables for the small country, program and exam dimensions."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.catalog import get_catalog_version
+from app.models import Country, Exam, Program
+
+from .snapshot import CatalogSnapshot, get_catalog_snapshot
+
+
+@dataclass(frozen=True)
+class CountryEntry:
+    """Country identity and display data."""
+
+    id: int
+    code: str
+    name: str
+
+
+@dataclass(frozen=True)
+class NamedEntry:
+    """Program or exam name with every row ID sharing it (e.g. degree variants)."""
+
+    name: str
+    ids: tuple[int, ...]
+
+
+@dataclass
+class DimensionIndex:
+    """Normalized-name lookups for countries, programs and exams."""
+
+    countries_by_code: dict[str, CountryEntry] = field(default_factory=dict)
+    countries_by_name: dict[str, CountryEntry] = field(default_factory=dict)
+    programs: dict[str, NamedEntry] = field(default_factory=dict)
+    exams: dict[str, NamedEntry] = field(default_factory=dict)
+
+    def country(self, value: str) -> CountryEntry | None:
+        """Resolve a country code or name (case-insensitive)."""
+
+        key = value.strip().lower()
+        return self.countries_by_code.get(key) or self.countries_by_name.get(key)
+
+    def program(self, value: str) -> NamedEntry | None:
+        """Resolve a program name (case-insensitive)."""
+
+        return self.programs.get(value.strip().lower())
+
+    def exam(self, value: str) -> NamedEntry | None:
+        """Resolve an exam name (case-insensitive)."""
+
+        return self.exams.get(value.strip().lower())
+
+
+_index_cache: TTLCache[DimensionIndex] = TTLCache(maxsize=4, ttl=300.0)
+
+
+def load_dimensions(session: Session) -> DimensionIndex:
+    """Return the dimension index for the current catalog version.
+
+    A configured, up-to-date catalog snapshot is preferred over the database.
+    """
+
+    snapshot = get_catalog_snapshot()
+    if snapshot is not None:
+        return _index_cache.get_or_set(
+            ("snapshot", snapshot.identity), lambda: _build_index_from_snapshot(snapshot)
+        )
+    return _index_cache.get_or_set(get_catalog_version(), lambda: _build_index(session))
+
+
+def _build_index(session: Session) -> DimensionIndex:
+    return _index_from_rows(
+        session.execute(sa.select(Country.id, Country.code, Country.name)),
+        session.execute(sa.select(Program.id, Program.name)),
+        session.execute(sa.select(Exam.id, Exam.name)),
+    )
+
+
+def _build_index_from_snapshot(snapshot: CatalogSnapshot) -> DimensionIndex:
+    def pairs(table: str) -> list[tuple[int, str]]:
+        return list(
+            zip(snapshot.column(table, "id").tolist(), snapshot.strings(snapshot.column(table, "name")))
+        )
+
+    countries = zip(
+        snapshot.column("countries", "id").tolist(),
+        snapshot.strings(snapshot.column("countries", "code")),
+        snapshot.strings(snapshot.column("countries", "name")),
+    )
+    return _index_from_rows(countries, pairs("programs"), pairs("exams"))
+
+
+def _index_from_rows(countries, programs, exams) -> DimensionIndex:
+    index = DimensionIndex()
+
+    for country_id, code, name in countries:
+        entry = CountryEntry(id=country_id, code=code, name=name)
+        index.countries_by_code[code.lower()] = entry
+        index.countries_by_name[name.lower()] = entry
+
+    index.programs.update(_group_names(programs))
+    index.exams.update(_group_names(exams))
+    return index
+
+
+def _group_names(rows) -> dict[str, NamedEntry]:
+    grouped: dict[str, NamedEntry] = {}
+    for row_id, name in rows:
+        key = name.lower()
+        existing = grouped.get(key)
+        ids = (existing.ids if existing else ()) + (row_id,)
+        grouped[key] = NamedEntry(name=existing.name if existing else name, ids=ids)
+    return grouped
@@ -0,0 +1,173 @@
+"""Typo-tolerant university name search backed by a trigram index."""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from collections.abc import Collection
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.catalog import get_catalog_version
+from app.models import University
+
+from .suggest import normalize
+
+# Candidates verified with edit distance per query.
+MAX_CANDIDATES = 200
+# Trigrams present in more than this share of names (e.g. "uni") do not narrow
+# the candidate set and are skipped unless the query has nothing else.
+STOP_GRAM_SHARE = 0.2
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def _clean(text: str) -> str:
+    return _NON_ALNUM.sub(" ", normalize(text)).strip()
+
+
+def _trigrams(text: str) -> set[str]:
+    grams: set[str] = set()
+    for word in text.split():
+        padded = f" {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def default_max_distance(query: str) -> int:
+    """Allowed typos grow with query length: 1 up to 4 chars, 2 up to 8, then 3."""
+
+    length = len(query.replace(" ", ""))
+    return 1 if length <= 4 else 2 if length <= 8 else 3
+
+
+def bounded_levenshtein(a: str, b: str, limit: int) -> int | None:
+    """Return the edit distance if it is at most ``limit``, else ``None``.
+
+    Only the diagonal band ``|i - j| <= limit`` is computed (Ukkonen), and the
+    scan stops as soon as a whole row exceeds the limit.
+    """
+
+    if limit < 0 or abs(len(a) - len(b)) > limit:
+        return None
+    outside = limit + 1
+    previous = [j if j <= limit else outside for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        char_a = a[i - 1]
+        low = max(1, i - limit)
+        high = min(len(b), i + limit)
+        current = [outside] * (len(b) + 1)
+        current[0] = i if i <= limit else outside
+        row_min = current[0]
+        for j in range(low, high + 1):
+            cost = previous[j - 1] + (char_a != b[j - 1])
+            deletion = previous[j] + 1
+            if deletion < cost:
+                cost = deletion
+            insertion = current[j - 1] + 1
+            if insertion < cost:
+                cost = insertion
+            current[j] = cost
+            if cost < row_min:
+                row_min = cost
+        if row_min > limit:
+            return None
+        previous = current
+    return previous[-1] if previous[-1] <= limit else None
+
+
+class FuzzyNameIndex:
+    """Trigram inverted index with edit-distance verification over word windows.
+
+    A query matches a name when it is a substring of it (distance 0) or when
+    some run of the name's words with the same word count is within the allowed
+    edit distance, so "Nazarbaev" finds "Nazarbayev University" and
+    "Al Farabi" finds "Al-Farabi Kazakh National University".
+    """
+
+    def __init__(self, entries: list[tuple[int, str]]) -> None:
+        self._ids = [entry_id for entry_id, _ in entries]
+        self._names = [_clean(name) for _, name in entries]
+        self._postings: dict[str, list[int]] = {}
+        for position, name in enumerate(self._names):
+            for gram in _trigrams(name):
+                self._postings.setdefault(gram, []).append(position)
+
+    def search(
+        self,
+        query: str,
+        limit: int | None = 50,
+        max_distance: int | None = None,
+        within: Collection[int] | None = None,
+    ) -> list[tuple[int, int]]:
+        """Return ``(id, distance)`` pairs, closest first, ties in index order.
+
+        ``within`` restricts candidates to those IDs before the per-query
+        candidate cap applies, so filtered searches verify only eligible names.
+        """
+
+        text = _clean(query)
+        if not text:
+            return []
+        allowed = default_max_distance(text) if max_distance is None else max_distance
+
+        grams = [gram for gram in _trigrams(text) if gram in self._postings]
+        selective = [
+            gram for gram in grams
+            if len(self._postings[gram]) <= max(STOP_GRAM_SHARE * len(self._names), 1)
+        ]
+        used = selective or grams
+        counts: Counter[int] = Counter()
+        for gram in used:
+            counts.update(self._postings[gram])
+        # q-gram lemma: each edit destroys at most three trigrams of the query.
+        min_shared = max(len(used) - 3 * allowed, 1)
+
+        words = len(text.split())
+        results: list[tuple[int, int, int]] = []
+        checked = 0
+        for position, shared in counts.most_common():
+            if shared < min_shared or checked == MAX_CANDIDATES:
+                break
+            if within is not None and self._ids[position] not in within:
+                continue
+            checked += 1
+            distance = self._distance(text, words, self._names[position], allowed)
+            if distance is not None:
+                results.append((distance, position, self._ids[position]))
+
+        results.sort()
+        return [(entry_id, distance) for distance, _, entry_id in results[:limit]]
+
+    @staticmethod
+    def _distance(text: str, words: int, name: str, allowed: int) -> int | None:
+        if text in name:
+            return 0
+        name_words = name.split()
+        best: int | None = None
+        for start in range(max(len(name_words) - words + 1, 1)):
+            window = " ".join(name_words[start:start + words])
+            distance = bounded_levenshtein(text, window, best - 1 if best is not None else allowed)
+            if distance is not None:
+                best = distance
+                if best == 0:
+                    break
+        return best
+
+
+def build_fuzzy_index(session: Session) -> FuzzyNameIndex:
+    """Index all university names, ordered by name for stable tie-breaking."""
+
+    rows = session.execute(sa.select(University.id, University.name).order_by(University.name))
+    return FuzzyNameIndex([(row.id, row.name) for row in rows])
+
+
+_index_cache: TTLCache[FuzzyNameIndex] = TTLCache(maxsize=2, ttl=3600.0)
+
+
+def get_fuzzy_index(session: Session) -> FuzzyNameIndex:
+    """Return the fuzzy index for the current catalog version."""
+
+    return _index_cache.get_or_set(get_catalog_version(), lambda: build_fuzzy_index(session))
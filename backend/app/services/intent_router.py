@@ -0,0 +1,182 @@
+"""Rule-based router answering pure catalog lookups without the LLM."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+from sqlalchemy.orm import Session
+
+from app.models import University
+
+from .dimensions import load_dimensions
+from .university_service import UniversityFilters, UniversityService
+
+# Filler words that may surround a lookup without changing its meaning. Any
+# other leftover word (e.g. "best", "cheap", "without") sends the turn to the LLM.
+STOPWORDS = frozenset(
+    """
+    a all an and any are can could do does for from give have i in is it list
+    me my of offer offered offering offers on or please show some tell that the
+    there these those to unis universities university what which with you your
+    accept accepted accepting accepts available find get see study want need
+    """.split()
+)
+LIST_NOUNS = {
+    "countries": "countries",
+    "country": "countries",
+    "programs": "programs",
+    "program": "programs",
+    "programmes": "programs",
+    "majors": "programs",
+    "exams": "exams",
+    "exam": "exams",
+    "tests": "exams",
+}
+DETAIL_WORDS = frozenset({"id", "number", "no", "details", "detail", "about", "info", "#"})
+# A country code only counts as a filter right after one of these words.
+_CODE_PREFIX = re.compile(r"\b(?:in|from)\s+$", re.IGNORECASE)
+MAX_LISTED = 10
+
+_WORD = re.compile(r"[a-z0-9#]+")
+
+
+@dataclass
+class FastPathReply:
+    """Templated answer produced without calling the LLM."""
+
+    intent: str
+    text: str
+
+
+class IntentRouter:
+    """Match simple catalog questions and answer them straight from the service layer."""
+
+    def __init__(self, session: Session) -> None:
+        self.session = session
+        self.service = UniversityService(session)
+
+    def route(self, message: str) -> FastPathReply | None:
+        """Return a templated reply, or ``None`` when the LLM is needed."""
+
+        words = _WORD.findall(message.lower())
+        if not words or len(words) > 20:
+            return None
+
+        nouns = {LIST_NOUNS[w] for w in words if w in LIST_NOUNS}
+        if nouns and all(w in STOPWORDS or w in LIST_NOUNS for w in words):
+            return self._list_dimensions(nouns)
+
+        numbers = [w for w in words if w.isdigit()]
+        if (
+            len(numbers) == 1
+            and "university" in words
+            and all(w in STOPWORDS or w in DETAIL_WORDS or w.isdigit() for w in words)
+        ):
+            return self._university_detail(int(numbers[0]))
+
+        return self._search(message)
+
+    def _list_dimensions(self, nouns: set[str]) -> FastPathReply:
+        index = load_dimensions(self.session)
+        sections = []
+        if "countries" in nouns:
+            countries = sorted(index.countries_by_code.values(), key=lambda c: c.name)
+            sections.append(
+                f"Countries ({len(countries)}): "
+                + ", ".join(f"{c.name} ({c.code})" for c in countries)
+            )
+        if "programs" in nouns:
+            programs = sorted(entry.name for entry in index.programs.values())
+            sections.append(f"Programs ({len(programs)}): " + ", ".join(programs))
+        if "exams" in nouns:
+            exams = sorted(entry.name for entry in index.exams.values())
+            sections.append(f"Accepted exams ({len(exams)}): " + ", ".join(exams))
+        return FastPathReply(intent="list_filters", text="\n".join(sections))
+
+    def _university_detail(self, university_id: int) -> FastPathReply | None:
+        university = self.service.get_university(university_id)
+        if university is None:
+            return None
+        return FastPathReply(intent="university_detail", text=_format_detail(university))
+
+    def _search(self, message: str) -> FastPathReply | None:
+        index = load_dimensions(self.session)
+        remaining = f" {message.lower()} "
+        filters = UniversityFilters(limit=MAX_LISTED)
+        matched: list[str] = []
+
+        for match in re.finditer(r"\b[A-Z]{2,3}\b", message):
+            code = match.group()
+            country = index.countries_by_code.get(code.lower())
+            if country is None:
+                continue
+            if (
+                not _CODE_PREFIX.search(message[: match.start()])
+                or index.program(code) is not None
+                or index.exam(code) is not None
+            ):
+                return None  # a code-like word in prose ("Do IT programs ...") needs the LLM
+            if filters.country_code is None:
+                filters.country_code = country.code
+                matched.append(country.name)
+                remaining = re.sub(rf"\b{code.lower()}\b", " ", remaining, count=1)
+
+        for attribute, lookup in (
+            ("country_code", index.countries_by_name),
+            ("program", index.programs),
+            ("exam", index.exams),
+        ):
+            for key in sorted(lookup, key=len, reverse=True):
+                pattern = rf"\b{re.escape(key)}\b"
+                if not re.search(pattern, remaining):
+                    continue
+                if getattr(filters, attribute) is not None:
+                    return None  # several values for one filter need the LLM
+                entry = lookup[key]
+                setattr(filters, attribute, entry.code if attribute == "country_code" else entry.name)
+                matched.append(entry.name)
+                remaining = re.sub(pattern, " ", remaining, count=1)
+
+        if not matched or not all(w in STOPWORDS for w in _WORD.findall(remaining)):
+            return None
+
+        universities, program_counts, total = self.service.list_universities(filters)
+        if not universities:
+            return None
+
+        lines = [f"I found {total} universities matching {', '.join(matched)}:"]
+        lines.extend(
+            f"- {u.name} (ID {u.id}) – {u.city}, {u.country.name}; "
+            f"{program_counts.get(u.id, 0)} programs"
+            for u in universities
+        )
+        if total > len(universities):
+            lines.append(f"...and {total - len(universities)} more. Add filters to narrow the list.")
+        return FastPathReply(intent="search", text="\n".join(lines))
+
+
+def _format_detail(university: University) -> str:
+    """Render a university with its programs and exam requirements."""
+
+    programs: dict[int, list[str]] = {}
+    names: dict[int, str] = {}
+    for requirement in university.requirements:
+        program = requirement.program
+        if program is None or requirement.exam is None:
+            continue
+        names[program.id] = f"{program.name} ({program.degree_level.value})"
+        programs.setdefault(program.id, []).append(
+            f"{requirement.exam.name} {requirement.min_score:g}"
+        )
+
+    lines = [f"{university.name} (ID {university.id}) – {university.city}, {university.country.name}"]
+    if university.description:
+        lines.append(university.description)
+    if programs:
+        lines.append("Programs and minimum scores:")
+        lines.extend(
+            f"- {names[pid]}: {', '.join(scores)}"
+            for pid, scores in sorted(programs.items(), key=lambda item: names[item[0]])
+        )
+    return "\n".join(lines)
@@ -0,0 +1,249 @@
+"""Vectorized eligibility matching of student exam scores against requirements."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+import numpy as np
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.catalog import get_catalog_version
+from app.models import Country, Exam, Program, Requirement, University
+
+from .snapshot import CatalogSnapshot, get_catalog_snapshot
+
+
+@dataclass(frozen=True)
+class MatchRow:
+    """Identity and display data for one (university, program) row."""
+
+    university_id: int
+    university_name: str
+    city: str
+    country_code: str
+    country_name: str
+    program_id: int
+    program_name: str
+    degree_level: str
+
+
+@dataclass
+class Match:
+    """An eligible (university, program) pair with per-exam margins."""
+
+    row: MatchRow
+    margin: float
+    requirements: list[tuple[str, float, float]]  # (exam, min_score, student score)
+
+
+class RequirementMatrix:
+    """Dense (programs x exams) threshold matrix; NaN marks exams not required.
+
+    Rows are (university, program) pairs and columns are exams. A student is
+    eligible for a row when every non-NaN threshold is met, and rows are ranked
+    by the tightest relative margin ``(score - min) / min`` across its exams.
+    """
+
+    def __init__(self, rows: list[MatchRow], exams: list[str], thresholds: np.ndarray) -> None:
+        self.rows = rows
+        self.exams = exams
+        self.thresholds = thresholds
+        self.required = ~np.isnan(thresholds)
+        self.exam_index = {name.lower(): position for position, name in enumerate(exams)}
+        # Denominator for relative margins; guards against zero thresholds.
+        self._scale = np.where(self.required, np.maximum(np.abs(thresholds), 1e-9), 1.0)
+
+    @classmethod
+    def from_session(cls, session: Session) -> RequirementMatrix:
+        """Build the matrix from all Requirement rows."""
+
+        stmt = (
+            sa.select(
+                University.id,
+                University.name,
+                University.city,
+                Country.code,
+                Country.name,
+                Program.id,
+                Program.name,
+                Program.degree_level,
+                Exam.name,
+                Requirement.min_score,
+            )
+            .join(Requirement.university)
+            .join(University.country)
+            .join(Requirement.program)
+            .join(Requirement.exam)
+            .order_by(University.name, Program.name, Program.id)
+        )
+        return cls._from_records(session.execute(stmt).all())
+
+    @classmethod
+    def from_snapshot(cls, snapshot: CatalogSnapshot) -> RequirementMatrix:
+        """Build the matrix from a mapped catalog snapshot without touching the database."""
+
+        countries = dict(
+            zip(
+                snapshot.column("countries", "id").tolist(),
+                zip(
+                    snapshot.strings(snapshot.column("countries", "code")),
+                    snapshot.strings(snapshot.column("countries", "name")),
+                ),
+            )
+        )
+        universities = dict(
+            zip(
+                snapshot.column("universities", "id").tolist(),
+                zip(
+                    snapshot.strings(snapshot.column("universities", "name")),
+                    snapshot.strings(snapshot.column("universities", "city")),
+                    snapshot.column("universities", "country_id").tolist(),
+                ),
+            )
+        )
+        programs = dict(
+            zip(
+                snapshot.column("programs", "id").tolist(),
+                zip(
+                    snapshot.strings(snapshot.column("programs", "name")),
+                    snapshot.strings(snapshot.column("programs", "degree_level")),
+                ),
+            )
+        )
+        exams = dict(
+            zip(
+                snapshot.column("exams", "id").tolist(),
+                snapshot.strings(snapshot.column("exams", "name")),
+            )
+        )
+
+        records = []
+        for uid, pid, eid, min_score in zip(
+            snapshot.column("requirements", "university_id").tolist(),
+            snapshot.column("requirements", "program_id").tolist(),
+            snapshot.column("requirements", "exam_id").tolist(),
+            snapshot.column("requirements", "min_score").tolist(),
+        ):
+            uname, city, country_id = universities[uid]
+            pname, level = programs[pid]
+            code, country = countries[country_id]
+            records.append(
+                (uid, uname, city, code, country, pid, pname, level, exams[eid], min_score)
+            )
+        # Same row order as the SQL query in from_session.
+        records.sort(key=lambda record: (record[1], record[6], record[5]))
+        return cls._from_records(records)
+
+    @classmethod
+    def _from_records(cls, records) -> RequirementMatrix:
+        """Build from requirement records already sorted in row order.
+
+        Each record is (university id, university name, city, country code,
+        country name, program id, program name, degree level, exam name, min score).
+        """
+
+        exams = sorted({record[8] for record in records}, key=str.lower)
+        exam_positions = {name: position for position, name in enumerate(exams)}
+        row_positions: dict[tuple[int, int], int] = {}
+        rows: list[MatchRow] = []
+        cells: list[tuple[int, int, float]] = []
+
+        for (uid, uname, city, ccode, cname, pid, pname, level, exam, min_score) in records:
+            key = (uid, pid)
+            if key not in row_positions:
+                row_positions[key] = len(rows)
+                rows.append(
+                    MatchRow(
+                        university_id=uid,
+                        university_name=uname,
+                        city=city,
+                        country_code=ccode,
+                        country_name=cname,
+                        program_id=pid,
+                        program_name=pname,
+                        degree_level=str(getattr(level, "value", level)),
+                    )
+                )
+            cells.append((row_positions[key], exam_positions[exam], min_score))
+
+        thresholds = np.full((len(rows), len(exams)), np.nan, dtype=np.float64)
+        if cells:
+            row_idx, col_idx, values = zip(*cells)
+            thresholds[list(row_idx), list(col_idx)] = values
+        return cls(rows, exams, thresholds)
+
+    def score_vector(self, scores: Mapping[str, float]) -> tuple[np.ndarray, list[str]]:
+        """Map exam-name scores onto matrix columns; return unknown exam names too."""
+
+        vector = np.full(len(self.exams), np.nan, dtype=np.float64)
+        unknown: list[str] = []
+        for name, value in scores.items():
+            position = self.exam_index.get(name.strip().lower())
+            if position is None:
+                unknown.append(name)
+            else:
+                vector[position] = value
+        return vector, unknown
+
+    def eligibility(self, vectors: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Return (eligible mask, tightest margin) for a batch of score vectors.
+
+        ``vectors`` has shape (students, exams); results have shape (students, rows).
+        """
+
+        with np.errstate(invalid="ignore"):
+            relative = (vectors[:, None, :] - self.thresholds[None, :, :]) / self._scale[None, :, :]
+        # Missing student scores yield NaN and therefore fail required exams.
+        meets = np.where(self.required[None, :, :], relative >= 0, True)
+        eligible = meets.all(axis=2)
+        margins = np.where(self.required[None, :, :], relative, np.inf).min(axis=2)
+        return eligible, margins
+
+    def match(self, scores: Mapping[str, float]) -> tuple[list[Match], list[str]]:
+        """Return eligible rows ranked by margin, plus exam names not in the catalog."""
+
+        vector, unknown = self.score_vector(scores)
+        if not self.rows:
+            return [], unknown
+
+        eligible, margins = self.eligibility(vector[None, :])
+        positions = np.flatnonzero(eligible[0])
+        # Stable sort keeps catalog order (university, program name) among ties.
+        ordered = positions[np.argsort(-margins[0, positions], kind="stable")]
+
+        matches = []
+        for position in ordered:
+            required = np.flatnonzero(self.required[position])
+            matches.append(
+                Match(
+                    row=self.rows[position],
+                    margin=float(margins[0, position]),
+                    requirements=[
+                        (self.exams[col], float(self.thresholds[position, col]), float(vector[col]))
+                        for col in required
+                    ],
+                )
+            )
+        return matches, unknown
+
+
+_matrix_cache: TTLCache[RequirementMatrix] = TTLCache(maxsize=2, ttl=300.0)
+
+
+def get_requirement_matrix(session: Session) -> RequirementMatrix:
+    """Return the requirement matrix for the current catalog version.
+
+    A configured, up-to-date catalog snapshot is preferred over the database.
+    """
+
+    snapshot = get_catalog_snapshot()
+    if snapshot is not None:
+        return _matrix_cache.get_or_set(
+            ("snapshot", snapshot.identity), lambda: RequirementMatrix.from_snapshot(snapshot)
+        )
+    return _matrix_cache.get_or_set(
+        get_catalog_version(), lambda: RequirementMatrix.from_session(session)
+    )
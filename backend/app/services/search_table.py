@@ -0,0 +1,164 @@
+"""Maintenance of the denormalized ``university_search`` table.
+
+The table is refreshed inside the same transaction as every catalog write: a
+``before_commit`` hook turns the rows logged by catalog change tracking into
+the set of affected universities, deletes their search rows and re-inserts
+them with one ``INSERT ... SELECT``. Seed runs, imports, ORM writes and bulk
+admin writes therefore keep it in sync without extra calls, and readers never
+see a catalog version whose search rows are stale.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+import sqlalchemy as sa
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+from app.core.catalog import pending_catalog_changes
+from app.models import Country, Requirement, University, UniversitySearch
+
+# Above this many affected universities the whole table is rebuilt instead.
+FULL_REBUILD_THRESHOLD = 5000
+
+_COLUMNS = (
+    "university_id",
+    "country_id",
+    "name",
+    "requirement_id",
+    "program_id",
+    "exam_id",
+    "min_score",
+    "program_count",
+)
+
+
+def _source(university_ids: Iterable[int] | None = None) -> sa.Select:
+    """Search rows computed from the normalized tables, in ``_COLUMNS`` order."""
+
+    program_counts = (
+        sa.select(
+            Requirement.university_id,
+            func.count(sa.distinct(Requirement.program_id)).label("program_count"),
+        )
+        .group_by(Requirement.university_id)
+        .subquery()
+    )
+    stmt = (
+        sa.select(
+            University.id,
+            University.country_id,
+            func.lower(University.name),
+            Requirement.id,
+            Requirement.program_id,
+            Requirement.exam_id,
+            Requirement.min_score,
+            func.coalesce(program_counts.c.program_count, 0),
+        )
+        .join(Country, University.country_id == Country.id)
+        .outerjoin(Requirement, Requirement.university_id == University.id)
+        .outerjoin(program_counts, program_counts.c.university_id == University.id)
+    )
+    if university_ids is not None:
+        stmt = stmt.where(University.id.in_(list(university_ids)))
+    return stmt
+
+
+def refresh_search_rows(session: Session, university_ids: Iterable[int] | None = None) -> None:
+    """Rewrite the search rows of ``university_ids`` (all universities if ``None``)."""
+
+    table = UniversitySearch.__table__
+    delete = sa.delete(table)
+    if university_ids is not None:
+        university_ids = list(university_ids)
+        if not university_ids:
+            return
+        delete = delete.where(table.c.university_id.in_(university_ids))
+    connection = session.connection()
+    connection.execute(delete)
+    connection.execute(
+        sa.insert(table).from_select(
+            [table.c[name] for name in _COLUMNS], _source(university_ids)
+        )
+    )
+
+
+def _affected_universities(session: Session, changes: set[tuple[str, int, bool]]) -> set[int]:
+    ids: dict[str, set[int]] = {}
+    for entity, entity_id, _ in changes:
+        ids.setdefault(entity, set()).add(entity_id)
+    affected = set(ids.get("universities", ()))
+    # The search table still holds the old rows, so it also maps deleted
+    # requirements and dimensions back to their universities.
+    lookups = [
+        ("requirements", Requirement.id, Requirement.university_id, UniversitySearch.requirement_id),
+        ("countries", University.country_id, University.id, UniversitySearch.country_id),
+        ("programs", Requirement.program_id, Requirement.university_id, UniversitySearch.program_id),
+        ("exams", Requirement.exam_id, Requirement.university_id, UniversitySearch.exam_id),
+    ]
+    for entity, key, university_column, search_key in lookups:
+        entity_ids = list(ids.get(entity, ()))
+        if not entity_ids:
+            continue
+        affected.update(session.scalars(sa.select(university_column).where(key.in_(entity_ids))))
+        affected.update(
+            session.scalars(sa.select(UniversitySearch.university_id).where(search_key.in_(entity_ids)))
+        )
+    return affected
+
+
+@event.listens_for(Session, "before_commit")
+def _sync_search_rows(session: Session) -> None:
+    session.flush()  # log pending ORM writes before reading the change set
+    changes = pending_catalog_changes(session)
+    if not changes:
+        return
+    affected = _affected_universities(session, changes)
+    if len(affected) > FULL_REBUILD_THRESHOLD:
+        refresh_search_rows(session)
+    else:
+        refresh_search_rows(session, affected)
+
+
+@dataclass
+class SearchTableReport:
+    """Universities whose search rows differ from the normalized tables."""
+
+    checked: int = 0
+    missing: list[int] = field(default_factory=list)
+    stale: list[int] = field(default_factory=list)
+    orphaned: list[int] = field(default_factory=list)
+
+    @property
+    def consistent(self) -> bool:
+        return not (self.missing or self.stale or self.orphaned)
+
+
+def check_search_table(session: Session) -> SearchTableReport:
+    """Compare every search row with what the normalized tables produce.
+
+    ``missing`` universities have no search rows, ``stale`` ones have rows that
+    differ, and ``orphaned`` ids have rows but no longer exist.
+    """
+
+    expected: dict[int, set[tuple]] = {}
+    for row in session.execute(_source()):
+        expected.setdefault(row[0], set()).add(tuple(row))
+    actual: dict[int, set[tuple]] = {}
+    columns = [UniversitySearch.__table__.c[name] for name in _COLUMNS]
+    for row in session.execute(sa.select(*columns)):
+        actual.setdefault(row[0], set()).add(tuple(row))
+
+    return SearchTableReport(
+        checked=len(expected),
+        missing=sorted(set(expected) - set(actual)),
+        stale=sorted(
+            university_id
+            for university_id in set(expected) & set(actual)
+            if expected[university_id] != actual[university_id]
+        ),
+        orphaned=sorted(set(actual) - set(expected)),
+    )
+
@@ -0,0 +1,207 @@
+"""Offline semantic search over university descriptions using hashed TF-IDF vectors."""
+
+from __future__ import annotations
+
+import math
+import re
+import zlib
+from collections import Counter
+from collections.abc import Sequence
+
+import numpy as np
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.catalog import get_catalog_version
+from app.models import Country, Program, Requirement, University
+
+from .suggest import normalize
+
+# Width of the hashed feature space; 100k documents take ~200 MB as float32.
+DIMENSIONS = 512
+# Below this many documents approximate queries fall back to the exact scan.
+APPROXIMATE_MIN_ROWS = 20_000
+# Clusters scanned per approximate query.
+APPROXIMATE_PROBES = 8
+KMEANS_ITERATIONS = 5
+
+STOPWORDS = frozenset(
+    """
+    a about an and are as at be by for from has have in into is it its of on or
+    that the their this to was were which with
+    """.split()
+)
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _stem(word: str) -> str:
+    """Fold simple plurals so "programs" and "program" share a feature."""
+
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def tokenize(text: str) -> list[str]:
+    """Return stemmed unigrams plus adjacent bigrams ("computer science")."""
+
+    words = [_stem(word) for word in _WORD.findall(normalize(text)) if word not in STOPWORDS]
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+
+def _bucket(term: str) -> tuple[int, float]:
+    """Stable (column, sign) for a term; the sign halves the bias of collisions."""
+
+    digest = zlib.crc32(term.encode("utf-8"))
+    return digest % DIMENSIONS, 1.0 if digest & 0x80000000 else -1.0
+
+
+class SemanticIndex:
+    """Dense (documents x DIMENSIONS) matrix of L2-normalized TF-IDF vectors.
+
+    Terms are hashed into a fixed number of columns, so a query is a single
+    matrix-vector product producing cosine similarities. Large indexes also
+    keep spherical k-means clusters so approximate queries only score the rows
+    of the clusters closest to the query.
+    """
+
+    def __init__(self, ids: Sequence[int], documents: Sequence[str]) -> None:
+        self.ids = list(ids)
+        tokenized = [Counter(tokenize(document)) for document in documents]
+        frequencies: Counter[str] = Counter()
+        for terms in tokenized:
+            frequencies.update(terms.keys())
+        total = len(tokenized)
+        # Each known term maps to its hashed column and signed IDF weight.
+        self._features: dict[str, tuple[int, float]] = {}
+        for term, count in frequencies.items():
+            column, sign = _bucket(term)
+            self._features[term] = (column, sign * (math.log((1 + total) / (1 + count)) + 1.0))
+
+        rows: list[int] = []
+        columns: list[int] = []
+        values: list[float] = []
+        for row, terms in enumerate(tokenized):
+            for term, count in terms.items():
+                column, weight = self._features[term]
+                rows.append(row)
+                columns.append(column)
+                values.append((1.0 + math.log(count)) * weight)
+        self.matrix = np.zeros((total, DIMENSIONS), dtype=np.float32)
+        np.add.at(self.matrix, (np.array(rows, dtype=np.intp), np.array(columns, dtype=np.intp)), values)
+        _normalize_rows(self.matrix)
+
+        self._centroids: np.ndarray | None = None
+        self._members: list[np.ndarray] = []
+        if total >= APPROXIMATE_MIN_ROWS:
+            self._build_clusters()
+
+    def vectorize(self, text: str) -> np.ndarray | None:
+        """Return the normalized query vector, or ``None`` if no term is known."""
+
+        vector = np.zeros(DIMENSIONS, dtype=np.float32)
+        for term, count in Counter(tokenize(text)).items():
+            feature = self._features.get(term)
+            if feature is not None:  # unseen query terms carry no signal
+                vector[feature[0]] += (1.0 + math.log(count)) * feature[1]
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else None
+
+    def search(
+        self, text: str, limit: int = 10, approximate: bool = False
+    ) -> list[tuple[int, float]]:
+        """Return up to ``limit`` ``(id, cosine score)`` pairs with a positive score, best first."""
+
+        query = self.vectorize(text)
+        if query is None or not self.ids:
+            return []
+
+        if approximate and self._centroids is not None:
+            closest = np.argsort(-(self._centroids @ query))[:APPROXIMATE_PROBES]
+            rows = np.concatenate([self._members[cluster] for cluster in closest])
+            scores = self.matrix[rows] @ query
+        else:
+            rows = None
+            scores = self.matrix @ query
+
+        count = min(limit, scores.shape[0])
+        if count == 0:  # every probed cluster was empty
+            return []
+        top = np.argpartition(-scores, count - 1)[:count]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        positions = rows[top] if rows is not None else top
+        return [
+            (self.ids[position], float(scores[index]))
+            for index, position in zip(top, positions)
+            if scores[index] > 0
+        ]
+
+    def _build_clusters(self) -> None:
+        """Spherical k-means with about sqrt(n) clusters, seeded deterministically."""
+
+        total = self.matrix.shape[0]
+        clusters = max(int(math.sqrt(total)), 1)
+        rng = np.random.default_rng(0)
+        centroids = self.matrix[rng.choice(total, clusters, replace=False)].copy()
+        for _ in range(KMEANS_ITERATIONS):
+            assignments = np.argmax(self.matrix @ centroids.T, axis=1)
+            order = np.argsort(assignments, kind="stable")
+            bounds = np.searchsorted(assignments[order], np.arange(clusters))
+            occupied = np.bincount(assignments, minlength=clusters) > 0
+            # Empty clusters keep their previous centroid.
+            sums = centroids.copy()
+            sums[occupied] = np.add.reduceat(self.matrix[order], bounds[occupied], axis=0)
+            _normalize_rows(sums)
+            centroids = sums
+        assignments = np.argmax(self.matrix @ centroids.T, axis=1)
+        order = np.argsort(assignments, kind="stable")
+        bounds = np.searchsorted(assignments[order], np.arange(clusters + 1))
+        self._centroids = centroids
+        self._members = [order[bounds[i]:bounds[i + 1]] for i in range(clusters)]
+
+
+def _normalize_rows(matrix: np.ndarray) -> None:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+
+
+def build_semantic_index(session: Session) -> SemanticIndex:
+    """Index each university's name, location, description and program names."""
+
+    programs: dict[int, list[str]] = {}
+    program_rows = session.execute(
+        sa.select(Requirement.university_id, Program.name)
+        .join(Requirement.program)
+        .distinct()
+    )
+    for university_id, name in program_rows:
+        programs.setdefault(university_id, []).append(name)
+
+    ids: list[int] = []
+    documents: list[str] = []
+    rows = session.execute(
+        sa.select(
+            University.id, University.name, University.city, University.description, Country.name
+        )
+        .join(University.country)
+        .order_by(University.id)
+    )
+    for university_id, name, city, description, country in rows:
+        ids.append(university_id)
+        documents.append(
+            " ".join([name, city, country, description or "", *sorted(programs.get(university_id, []))])
+        )
+    return SemanticIndex(ids, documents)
+
+
+_index_cache: TTLCache[SemanticIndex] = TTLCache(maxsize=2, ttl=3600.0)
+
+
+def get_semantic_index(session: Session) -> SemanticIndex:
+    """Return the semantic index for the current catalog version."""
+
+    return _index_cache.get_or_set(get_catalog_version(), lambda: build_semantic_index(session))
@@ -0,0 +1,253 @@
+"""Memory-mapped binary catalog snapshot shared read-only across worker processes.
+
+Layout (little-endian)::
+
+    header   magic "UCATSNP1", format u32, catalog version u64,
+             TOC offset u64, TOC length u32
+    arrays   one contiguous, 8-byte aligned array per column
+    toc      JSON: {"<table>.<column>": [dtype, offset, count], ...}
+
+String columns hold int32 indexes into a string table stored as UTF-8 bytes
+(``strings.blob``) plus ``strings.offsets`` (n + 1 uint64 boundaries); -1
+encodes NULL. Readers map the file with ``mmap`` and wrap each column with
+``np.frombuffer``, so every worker shares the page cache copy and nothing is
+parsed up front.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from app.core.catalog import get_catalog_version, refresh_catalog_version
+from app.core.config import get_settings
+from app.models import Country, Exam, Program, Requirement, University
+
+MAGIC = b"UCATSNP1"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sIQQI")
+_ALIGNMENT = 8
+
+# (table, model, [(column, attribute, dtype)]); dtype "s" marks string-table columns.
+TABLES = [
+    ("countries", Country, [("id", "id", "<i4"), ("code", "code", "s"), ("name", "name", "s")]),
+    ("exams", Exam, [("id", "id", "<i4"), ("name", "name", "s")]),
+    (
+        "programs",
+        Program,
+        [("id", "id", "<i4"), ("name", "name", "s"), ("degree_level", "degree_level", "s")],
+    ),
+    (
+        "universities",
+        University,
+        [
+            ("id", "id", "<i4"),
+            ("name", "name", "s"),
+            ("city", "city", "s"),
+            ("description", "description", "s"),
+            ("country_id", "country_id", "<i4"),
+        ],
+    ),
+    (
+        "requirements",
+        Requirement,
+        [
+            ("university_id", "university_id", "<i4"),
+            ("program_id", "program_id", "<i4"),
+            ("exam_id", "exam_id", "<i4"),
+            ("min_score", "min_score", "<f8"),
+        ],
+    ),
+]
+
+
+_FIRST_COLUMN = {table: columns[0][0] for table, _, columns in TABLES}
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot file is truncated or has an unknown format."""
+
+
+class _StringTable:
+    def __init__(self) -> None:
+        self.positions: dict[str, int] = {}
+        self.values: list[bytes] = []
+
+    def add(self, value) -> int:
+        if value is None:
+            return -1
+        text = str(getattr(value, "value", value))
+        position = self.positions.get(text)
+        if position is None:
+            position = self.positions[text] = len(self.values)
+            self.values.append(text.encode("utf-8"))
+        return position
+
+
+def export_snapshot(session: Session, path: Path, catalog_version: int | None = None) -> int:
+    """Write the catalog to ``path`` atomically and return its catalog version.
+
+    The file is written next to ``path``, fsynced and renamed over it, so
+    readers see either the old or the new snapshot, never a partial one. The
+    version defaults to the catalog version stored in the database.
+    """
+
+    version = refresh_catalog_version(session) if catalog_version is None else catalog_version
+    strings = _StringTable()
+    arrays: dict[str, np.ndarray] = {}
+    for table, model, columns in TABLES:
+        attributes = [getattr(model, attribute) for _, attribute, _ in columns]
+        rows = session.execute(sa.select(*attributes).order_by(*attributes[:1])).all()
+        for position, (column, _, dtype) in enumerate(columns):
+            values = [row[position] for row in rows]
+            if dtype == "s":
+                arrays[f"{table}.{column}"] = np.array([strings.add(v) for v in values], dtype="<i4")
+            else:
+                arrays[f"{table}.{column}"] = np.array(values, dtype=dtype)
+    arrays["strings.offsets"] = np.cumsum(
+        [0, *(len(value) for value in strings.values)], dtype="<u8"
+    )
+    arrays["strings.blob"] = np.frombuffer(b"".join(strings.values), dtype="u1")
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(temporary, "wb") as target:
+            _write(target, version, arrays)
+            target.flush()
+            os.fsync(target.fileno())
+        os.replace(temporary, path)
+    finally:
+        temporary.unlink(missing_ok=True)
+    return version
+
+
+def _write(target, version: int, arrays: dict[str, np.ndarray]) -> None:
+    toc: dict[str, list] = {}
+    offset = _align(_HEADER.size)
+    for name, array in arrays.items():
+        toc[name] = [array.dtype.str, offset, int(array.shape[0])]
+        target.seek(offset)
+        target.write(array.tobytes())
+        offset = _align(offset + array.nbytes)
+    toc_bytes = json.dumps(toc).encode("utf-8")
+    target.seek(offset)
+    target.write(toc_bytes)
+    target.seek(0)
+    target.write(_HEADER.pack(MAGIC, FORMAT_VERSION, version, offset, len(toc_bytes)))
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+class CatalogSnapshot:
+    """Read-only, zero-copy view of a snapshot file."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as source:
+            stat = os.fstat(source.fileno())
+            self.identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            self._map = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            raise SnapshotError(f"{self.path} is too short to be a catalog snapshot")
+        magic, file_format, self.version, toc_offset, toc_size = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or file_format != FORMAT_VERSION:
+            raise SnapshotError(f"{self.path} is not a format {FORMAT_VERSION} catalog snapshot")
+        if toc_offset + toc_size > len(self._map):
+            raise SnapshotError(f"{self.path} is truncated")
+        toc = json.loads(bytes(self._map[toc_offset:toc_offset + toc_size]))
+        self._columns: dict[str, np.ndarray] = {}
+        for name, (dtype, offset, count) in toc.items():
+            if offset + np.dtype(dtype).itemsize * count > len(self._map):
+                raise SnapshotError(f"{self.path} is truncated")
+            self._columns[name] = np.frombuffer(self._map, dtype=dtype, count=count, offset=offset)
+        self._offsets = self._columns["strings.offsets"]
+        self._blob = self._columns["strings.blob"]
+
+    def column(self, table: str, name: str) -> np.ndarray:
+        """Return a column as a read-only array backed by the mapped file."""
+
+        return self._columns[f"{table}.{name}"]
+
+    def rows(self, table: str) -> int:
+        """Number of rows in ``table``."""
+
+        return int(self.column(table, _FIRST_COLUMN[table]).shape[0])
+
+    def string(self, index: int) -> str | None:
+        """Decode one string-table entry (``-1`` is NULL)."""
+
+        if index < 0:
+            return None
+        start, end = int(self._offsets[index]), int(self._offsets[index + 1])
+        return self._blob[start:end].tobytes().decode("utf-8")
+
+    def strings(self, indexes: Iterable[int]) -> list[str | None]:
+        """Decode several string-table entries."""
+
+        return [self.string(int(index)) for index in indexes]
+
+
+class SnapshotHandle:
+    """Keeps the newest snapshot at ``path`` open, reopening after an atomic swap.
+
+    ``current()`` costs one ``stat`` call, so it can run on every request.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._snapshot: CatalogSnapshot | None = None
+        self._lock = threading.Lock()
+
+    def current(self) -> CatalogSnapshot | None:
+        """Return the snapshot currently at ``path``, or ``None`` if there is none."""
+
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.identity == identity:
+            return snapshot
+        with self._lock:
+            if self._snapshot is None or self._snapshot.identity != identity:
+                # The previous map stays valid for readers still holding it and
+                # is released once the last array view is gone.
+                self._snapshot = CatalogSnapshot(self.path)
+            return self._snapshot
+
+
+_handles: dict[str, SnapshotHandle] = {}
+_handles_lock = threading.Lock()
+
+
+def get_catalog_snapshot() -> CatalogSnapshot | None:
+    """Return the configured snapshot if it is at least as new as the catalog.
+
+    Returns ``None`` when ``CATALOG_SNAPSHOT_PATH`` is unset, the file is
+    missing, or it predates the current catalog version, so callers fall back
+    to the database.
+    """
+
+    path = get_settings().catalog_snapshot_path
+    if not path:
+        return None
+    with _handles_lock:
+        handle = _handles.setdefault(path, SnapshotHandle(Path(path)))
+    snapshot = handle.current()
+    if snapshot is None or snapshot.version < get_catalog_version():
+        return None
+    return snapshot
@@ -0,0 +1,138 @@
+"""In-memory prefix index for search-box autocomplete."""
+
+from __future__ import annotations
+
+import unicodedata
+from dataclasses import dataclass
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.catalog import get_catalog_version
+from app.models import Country, Program, University
+
+# Lower rank sorts first when several suggestions share a prefix.
+TYPE_RANK = {"university": 0, "country": 1, "program": 2, "city": 3}
+# Suggestions kept per trie node; requests can ask for at most this many.
+MAX_SUGGESTIONS = 20
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    """Typed autocomplete entry; ``value`` is what the matching filter expects."""
+
+    label: str
+    type: str
+    value: str
+
+
+def normalize(text: str) -> str:
+    """Lowercase and strip accents so "Babes" finds "Babeș"."""
+
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+# Trie depth; longer prefixes are resolved by filtering the deepest node's entries.
+MAX_DEPTH = 16
+
+
+class _Node:
+    __slots__ = ("children", "top", "postings")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.top: list[Suggestion] = []
+        # Every entry reaching this node, kept only at MAX_DEPTH for longer prefixes.
+        self.postings: list[Suggestion] | None = None
+
+
+class PrefixIndex:
+    """Trie over every word start of each label with precomputed top-k per node.
+
+    Lookups walk at most ``MAX_DEPTH`` nodes and return the stored list, so cost
+    does not depend on catalog size. Longer prefixes filter the full posting
+    list kept at their ``MAX_DEPTH`` node.
+    """
+
+    def __init__(self, suggestions: list[Suggestion]) -> None:
+        self._root = _Node()
+        self._keys: dict[Suggestion, list[str]] = {}
+        # Inserting best-first means each node's first MAX_SUGGESTIONS entries are its top-k.
+        ranked = sorted(
+            suggestions, key=lambda item: (TYPE_RANK.get(item.type, 9), len(item.label), item.label)
+        )
+        for suggestion in ranked:
+            words = normalize(suggestion.label).split()
+            keys = [" ".join(words[start:]) for start in range(len(words))]
+            self._keys[suggestion] = keys
+            for key in keys:
+                self._insert(key[:MAX_DEPTH], suggestion)
+
+    def _insert(self, text: str, suggestion: Suggestion) -> None:
+        node = self._root
+        for char in text:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _Node()
+            node = child
+            top = node.top
+            # A label reaches the same node again only via its own overlapping word starts.
+            if len(top) < MAX_SUGGESTIONS and (not top or top[-1] is not suggestion):
+                top.append(suggestion)
+        if len(text) == MAX_DEPTH:
+            if node.postings is None:
+                node.postings = []
+            if not node.postings or node.postings[-1] is not suggestion:
+                node.postings.append(suggestion)
+
+    def suggest(self, prefix: str, limit: int = 10) -> list[Suggestion]:
+        """Return up to ``limit`` suggestions whose label has a word starting with ``prefix``."""
+
+        text = " ".join(normalize(prefix).split())
+        node = self._root
+        for char in text[:MAX_DEPTH]:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        if len(text) <= MAX_DEPTH:
+            return node.top[:limit]
+        matches = []
+        for suggestion in node.postings or ():
+            if any(key.startswith(text) for key in self._keys[suggestion]):
+                matches.append(suggestion)
+                if len(matches) == limit:
+                    break
+        return matches
+
+
+def build_prefix_index(session: Session) -> PrefixIndex:
+    """Collect university, city, program and country labels from the database."""
+
+    suggestions: list[Suggestion] = []
+    cities: set[str] = set()
+    for university_id, name, city in session.execute(
+        sa.select(University.id, University.name, University.city)
+    ):
+        suggestions.append(Suggestion(label=name, type="university", value=str(university_id)))
+        cities.add(city)
+    suggestions.extend(Suggestion(label=city, type="city", value=city) for city in sorted(cities))
+
+    program_names = session.scalars(sa.select(Program.name).distinct())
+    suggestions.extend(Suggestion(label=name, type="program", value=name) for name in program_names)
+
+    for code, name in session.execute(sa.select(Country.code, Country.name)):
+        suggestions.append(Suggestion(label=name, type="country", value=code))
+    return PrefixIndex(suggestions)
+
+
+_index_cache: TTLCache[PrefixIndex] = TTLCache(maxsize=2, ttl=3600.0)
+
+
+def get_prefix_index(session: Session) -> PrefixIndex:
+    """Return the prefix index for the current catalog version, rebuilding on change."""
+
+    return _index_cache.get_or_set(get_catalog_version(), lambda: build_prefix_index(session))
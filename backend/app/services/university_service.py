@@ -2,14 +2,79 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Sequence
+from dataclasses import dataclass, replace
+from typing import Any
 
 import sqlalchemy as sa
-from sqlalchemy import and_, func
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import func
+from sqlalchemy.orm import Session, load_only, raiseload, selectinload
 from sqlalchemy.sql import ColumnElement
 
-from app.models import Country, Exam, Program, Requirement, University
+from app.core import metrics
+from app.models import Requirement, University, UniversitySearch
+
+from .dimensions import DimensionIndex, load_dimensions
+from .fuzzy import get_fuzzy_index
+from .semantic import get_semantic_index
+
+
+# Scalar columns a caller may select with ``fields``; ``id`` is always returned.
+UNIVERSITY_FIELDS = ("name", "city", "description")
+# Related data a caller may request with ``include``.
+LIST_INCLUDES = ("country", "programs_count")
+DETAIL_INCLUDES = ("country", "programs")
+
+
+@dataclass(frozen=True)
+class FieldSelection:
+    """Columns and related data a caller renders; nothing else is loaded."""
+
+    fields: frozenset[str] = frozenset(UNIVERSITY_FIELDS)
+    include: frozenset[str] = frozenset(LIST_INCLUDES + DETAIL_INCLUDES)
+
+    @classmethod
+    def parse(
+        cls,
+        fields: str | None,
+        include: str | None,
+        default_fields: Sequence[str],
+        allowed_include: Sequence[str],
+    ) -> FieldSelection:
+        """Parse comma-separated ``fields``/``include`` query values.
+
+        ``None`` selects the defaults (``allowed_include`` for includes) and an
+        empty string selects nothing. Unknown names raise ``ValueError``.
+        """
+
+        return cls(
+            fields=_parse_names("fields", fields, default_fields, UNIVERSITY_FIELDS),
+            include=_parse_names("include", include, allowed_include, allowed_include),
+        )
+
+    def key(self) -> tuple[tuple[str, ...], tuple[str, ...]]:
+        """Hashable, order-independent form for cache keys."""
+
+        return tuple(sorted(self.fields)), tuple(sorted(self.include))
+
+
+def _parse_names(
+    parameter: str, value: str | None, default: Sequence[str], allowed: Sequence[str]
+) -> frozenset[str]:
+    if value is None:
+        return frozenset(default)
+    names = frozenset(name.strip().lower() for name in value.split(",") if name.strip())
+    unknown = names - set(allowed)
+    if unknown:
+        raise ValueError(
+            f"Unknown {parameter}: {', '.join(sorted(unknown))}. "
+            f"Allowed: {', '.join(allowed)}"
+        )
+    return names
+
+
+# What list views render when no fields are requested; descriptions are detail-only.
+LIST_SELECTION = FieldSelection(fields=frozenset({"name", "city"}), include=frozenset(LIST_INCLUDES))
 
 
 @dataclass
@@ -21,121 +86,318 @@ class UniversityFilters:
     exam: str | None = None
     min_score: float | None = None
     query: str | None = None
+    fuzzy: bool = False
     page: int = 1
     limit: int = 20
 
 
+def _parse_program_filter(program: str | None) -> tuple[int | None, str | None]:
+    """Return normalized program filter values: a numeric ID or a lowercase name."""
+
+    if not program:
+        return None, None
+
+    program_value = program.strip()
+    if not program_value:
+        return None, None
+
+    try:
+        return int(program_value), None
+    except ValueError:
+        return None, program_value.lower()
+
+
+@dataclass(frozen=True)
+class ListShape:
+    """Which filters a listing request uses, independent of their values.
+
+    Every request with the same shape (and field selection) runs the same
+    prebuilt statements; only the bound parameter values differ.
+    """
+
+    country: bool = False
+    query: str | None = None  # None, "substring" or "fuzzy"
+    min_score: bool = False
+    program: str | None = None  # None, "id" or "name"
+    exam: bool = False
+
+    @classmethod
+    def of(cls, filters: UniversityFilters) -> ListShape:
+        program_id, program_name = _parse_program_filter(filters.program)
+        return cls(
+            country=bool(filters.country_code),
+            query=("fuzzy" if filters.fuzzy else "substring") if filters.query else None,
+            min_score=filters.min_score is not None,
+            program="id" if program_id is not None else "name" if program_name is not None else None,
+            exam=bool(filters.exam),
+        )
+
+    def params(self, filters: UniversityFilters, dimensions: DimensionIndex) -> dict[str, Any] | None:
+        """Bound parameter values for the filters in this shape.
+
+        Country codes and program/exam names are resolved to row IDs through
+        the per-catalog-version dimension index. Returns ``None`` when one of
+        them is unknown, since such a request cannot match anything.
+        """
+
+        params: dict[str, Any] = {}
+        if self.country:
+            country = dimensions.countries_by_code.get(filters.country_code.strip().lower())
+            if country is None:
+                return None
+            params["country_id"] = country.id
+        if self.query == "substring":
+            params["query"] = filters.query.lower()
+        if self.min_score:
+            params["min_score"] = filters.min_score
+        program_id, program_name = _parse_program_filter(filters.program)
+        if self.program == "id":
+            params["program_id"] = program_id
+        elif self.program == "name":
+            program = dimensions.program(program_name)
+            if program is None:
+                return None
+            params["program_ids"] = list(program.ids)
+        if self.exam:
+            exam = dimensions.exam(filters.exam)
+            if exam is None:
+                return None
+            params["exam_ids"] = list(exam.ids)
+        return params
+
+    def conditions(self) -> list[ColumnElement[bool]]:
+        """Predicates on ``university_search`` with bind parameters for filter values.
+
+        Requirement filters match within one search row, i.e. one requirement.
+        Fuzzy queries add no predicate: they rank the IDs these conditions match.
+        """
+
+        conditions: list[ColumnElement[bool]] = []
+        if self.country:
+            conditions.append(UniversitySearch.country_id == sa.bindparam("country_id"))
+        if self.query == "substring":
+            conditions.append(UniversitySearch.name.contains(sa.bindparam("query")))
+        if self.min_score:
+            conditions.append(UniversitySearch.min_score >= sa.bindparam("min_score"))
+        if self.program == "id":
+            conditions.append(UniversitySearch.program_id == sa.bindparam("program_id"))
+        elif self.program == "name":
+            conditions.append(UniversitySearch.program_id.in_(sa.bindparam("program_ids", expanding=True)))
+        if self.exam:
+            conditions.append(UniversitySearch.exam_id.in_(sa.bindparam("exam_ids", expanding=True)))
+        return conditions
+
+
+@dataclass(frozen=True)
+class ListStatements:
+    """Prebuilt statements for one listing shape and field selection.
+
+    Reusing the same statement objects skips rebuilding the expression tree
+    and lets SQLAlchemy reuse the memoized cache key of each statement, so a
+    request only supplies parameter values before the compiled SQL is found.
+    """
+
+    count: sa.Select
+    page: sa.Select
+    ids: sa.Select
+    by_ids: sa.Select
+
+
+_statements: dict[tuple[ListShape, tuple], ListStatements] = {}
+
+# Distinct programs per university for a page of results, read from the search table.
+_PROGRAM_COUNTS = (
+    sa.select(UniversitySearch.university_id, UniversitySearch.program_count)
+    .where(UniversitySearch.university_id.in_(sa.bindparam("ids", expanding=True)))
+    .distinct()
+)
+
+
+def _list_statements(shape: ListShape, selection: FieldSelection) -> ListStatements:
+    """Return the statements for ``shape``, building them on first use.
+
+    Shapes and selections are drawn from small fixed sets, so the registry
+    stays bounded. Concurrent first uses may both build; either result is fine.
+    """
+
+    key = (shape, selection.key())
+    statements = _statements.get(key)
+    if statements is None:
+        conditions = shape.conditions()
+        options = UniversityService._load_options(selection)
+        if conditions:
+            matching = sa.select(UniversitySearch.university_id).where(*conditions)
+            count = sa.select(func.count(sa.distinct(UniversitySearch.university_id))).where(*conditions)
+            page = sa.select(University).where(University.id.in_(matching))
+        else:  # unfiltered listings skip the search table entirely
+            matching = sa.select(University.id)
+            count = sa.select(func.count(University.id))
+            page = sa.select(University)
+        statements = _statements[key] = ListStatements(
+            count=count,
+            page=page.options(*options)
+            .order_by(University.name)
+            .offset(sa.bindparam("offset"))
+            .limit(sa.bindparam("limit")),
+            ids=matching.distinct(),
+            by_ids=sa.select(University)
+            .options(*options)
+            .where(University.id.in_(sa.bindparam("ids", expanding=True))),
+        )
+    return statements
+
+
 class UniversityService:
     """Encapsulates database operations for universities."""
 
     def __init__(self, session: Session) -> None:
         self.session = session
 
-    def list_universities(self, filters: UniversityFilters) -> tuple[list[University], dict[int, int], int]:
+    def list_universities(
+        self, filters: UniversityFilters, selection: FieldSelection = LIST_SELECTION
+    ) -> tuple[list[University], dict[int, int], int]:
         """Return paginated universities and program counts.
 
         Args:
             filters: Listing filters and pagination data.
+            selection: Columns and related data to load; program counts are only
+                computed when ``programs_count`` is included.
 
         Returns:
             Tuple of (universities, program counts per university, total count).
         """
 
-        conditions = self._build_conditions(filters)
-        count_stmt = sa.select(func.count(University.id))
-        if conditions:
-            count_stmt = count_stmt.where(*conditions)
-        total = self.session.scalar(count_stmt) or 0
-
-        offset = (filters.page - 1) * filters.limit
-        stmt = sa.select(University).options(selectinload(University.country))
-        if conditions:
-            stmt = stmt.where(*conditions)
-        stmt = stmt.order_by(University.name).offset(offset).limit(filters.limit)
-        universities = list(self.session.scalars(stmt))
-
-        counts: dict[int, int] = {}
-        if universities:
-            university_ids = [u.id for u in universities]
-            count_stmt = (
-                sa.select(
-                    Requirement.university_id,
-                    func.count(sa.distinct(Requirement.program_id)),
+        shape = ListShape.of(filters)
+        params = shape.params(filters, load_dimensions(self.session))
+        if params is None:  # unknown country, program or exam
+            metrics.increment("universities.unknown_filter")
+            return [], {}, 0
+        if shape.query == "fuzzy":
+            # Exact substring matches are counted and paged in SQL; the name index,
+            # which verifies a bounded number of candidates, only runs for typos.
+            universities, counts, total = self.list_universities(replace(filters, fuzzy=False), selection)
+            if total:
+                return universities, counts, total
+        statements = _list_statements(shape, selection)
+
+        if shape.query == "fuzzy":
+            within = None
+            if replace(shape, query=None) != ListShape():
+                within = set(self.session.scalars(statements.ids, params))
+            ordered = self._fuzzy_ids(filters, within)
+            total = len(ordered)
+            offset = (filters.page - 1) * filters.limit
+            page_ids = ordered[offset:offset + filters.limit]
+            by_id = {
+                university.id: university
+                for university in self.session.scalars(statements.by_ids, {"ids": page_ids})
+            } if page_ids else {}
+            universities = [by_id[uid] for uid in page_ids if uid in by_id]
+        else:
+            total = self.session.scalar(statements.count, params) or 0
+            universities = list(
+                self.session.scalars(
+                    statements.page,
+                    {**params, "offset": (filters.page - 1) * filters.limit, "limit": filters.limit},
                 )
-                .where(Requirement.university_id.in_(university_ids))
-                .group_by(Requirement.university_id)
             )
-            counts = {uid: value for uid, value in self.session.execute(count_stmt).all()}
+
+        counts: dict[int, int] = {}
+        if universities and "programs_count" in selection.include:
+            rows = self.session.execute(_PROGRAM_COUNTS, {"ids": [u.id for u in universities]})
+            counts = {uid: value for uid, value in rows}
 
         return universities, counts, total
 
-    def get_university(self, university_id: int) -> University | None:
-        """Fetch a single university with related data."""
+    def get_university(
+        self, university_id: int, selection: FieldSelection = FieldSelection()
+    ) -> University | None:
+        """Fetch a single university with the selected columns and related data."""
 
         stmt = (
             sa.select(University)
             .where(University.id == university_id)
-            .options(
-                selectinload(University.country),
-                selectinload(University.requirements)
-                .selectinload(Requirement.program),
-                selectinload(University.requirements)
-                .selectinload(Requirement.exam),
-            )
+            .options(*self._load_options(selection))
         )
         return self.session.scalars(stmt).first()
 
-    def _build_conditions(self, filters: UniversityFilters) -> list[ColumnElement[bool]]:
-        """Create SQLAlchemy expressions for provided filters."""
+    def get_universities(
+        self, university_ids: Sequence[int], selection: FieldSelection = FieldSelection()
+    ) -> list[University]:
+        """Fetch several universities with related data in a fixed number of queries.
 
-        conditions: list[sa.sql.elements.ColumnElement[bool]] = []
-
-        if filters.country_code:
-            conditions.append(
-                University.country.has(
-                    func.lower(Country.code) == filters.country_code.lower()
-                )
-            )
-
-        if filters.query:
-            conditions.append(
-                func.lower(University.name).contains(filters.query.lower())
-            )
+        Results follow the order of ``university_ids``; unknown IDs are skipped.
+        """
 
-        requirement_filters: list[sa.sql.elements.ColumnElement[bool]] = []
-        if filters.min_score is not None:
-            requirement_filters.append(Requirement.min_score >= filters.min_score)
+        unique_ids = list(dict.fromkeys(university_ids))
+        if not unique_ids:
+            return []
 
-        program_id, program_name = self._parse_program_filter(filters.program)
-        if program_id is not None:
-            requirement_filters.append(Requirement.program_id == program_id)
-        elif program_name is not None:
-            requirement_filters.append(
-                Requirement.program.has(func.lower(Program.name) == program_name)
-            )
+        stmt = (
+            sa.select(University)
+            .where(University.id.in_(unique_ids))
+            .options(*self._load_options(selection))
+        )
+        by_id = {university.id: university for university in self.session.scalars(stmt)}
+        return [by_id[uid] for uid in unique_ids if uid in by_id]
+
+    def search_text(
+        self,
+        text: str,
+        limit: int = 10,
+        approximate: bool = False,
+        selection: FieldSelection = FieldSelection(
+            fields=frozenset(UNIVERSITY_FIELDS), include=frozenset({"country"})
+        ),
+    ) -> list[tuple[University, float]]:
+        """Rank universities by similarity of their profile to ``text``.
+
+        Scores come from the in-memory semantic index; only the hits are loaded.
+        """
 
-        if filters.exam:
-            requirement_filters.append(
-                Requirement.exam.has(func.lower(Exam.name) == filters.exam.lower())
-            )
+        hits = get_semantic_index(self.session).search(text, limit=limit, approximate=approximate)
+        if not hits:
+            return []
+        stmt = (
+            sa.select(University)
+            .where(University.id.in_([university_id for university_id, _ in hits]))
+            .options(*self._load_options(selection))
+        )
+        by_id = {university.id: university for university in self.session.scalars(stmt)}
+        return [(by_id[uid], score) for uid, score in hits if uid in by_id]
 
-        if requirement_filters:
-            conditions.append(University.requirements.any(and_(*requirement_filters)))
+    @staticmethod
+    def _load_options(selection: FieldSelection) -> list:
+        """Translate a field selection into column and relationship loader options.
 
-        return conditions
+        Unselected columns are deferred and unrequested relationships use
+        ``raiseload`` (``noload`` is deprecated), so they are never fetched and
+        an accidental access fails loudly instead of issuing a lazy query.
+        """
 
-    @staticmethod
-    def _parse_program_filter(program: str | None) -> tuple[int | None, str | None]:
-        """Return normalized program filter values."""
+        columns = [getattr(University, name) for name in sorted(selection.fields)]
+        options: list = [load_only(University.country_id, *columns)]
+        if "country" in selection.include:
+            options.append(selectinload(University.country))
+        else:
+            options.append(raiseload(University.country))
+        if "programs" in selection.include:
+            options.extend(
+                [
+                    selectinload(University.requirements).selectinload(Requirement.program),
+                    selectinload(University.requirements).selectinload(Requirement.exam),
+                ]
+            )
+        else:
+            options.append(raiseload(University.requirements))
+        return options
 
-        if not program:
-            return None, None
+    def _fuzzy_ids(self, filters: UniversityFilters, within: set[int] | None) -> list[int]:
+        """Return university IDs matching a fuzzy name query, best match first.
 
-        program_value = program.strip()
-        if not program_value:
-            return None, None
+        ``within`` holds the IDs matching the other filters (``None`` if there
+        are none), so the name search ranks only eligible universities.
+        """
 
-        try:
-            return int(program_value), None
-        except ValueError:
-            return None, program_value.lower()
+        matches = get_fuzzy_index(self.session).search(filters.query, limit=None, within=within)
+        return [university_id for university_id, _ in matches]
@@ -0,0 +1,243 @@
+"""Worker warm-up run from the application lifespan.
+
+New workers otherwise serve their first requests cold: the connection pool is
+empty, per-catalog-version indexes and cached payloads are unbuilt, statements
+have not been compiled, and the chat agent is created on the first chat call.
+``warm_up`` does that work in the background right after startup while
+``/api/health/ready`` answers 503, so a load balancer only routes traffic to
+the worker once it is warm.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+import sqlalchemy as sa
+from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from app.core import metrics
+from app.core.catalog import refresh_catalog_version
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Hot read endpoints requested in-process. Running them through the normal
+# stack fills the payload cache and the per-version indexes with the same keys
+# real requests use, and compiles their statements into the engine's cache.
+# ``{university_id}`` is the first university of the default listing; requests
+# needing it are skipped when the catalog is empty.
+WARMUP_REQUESTS: list[tuple[str, str, dict | None]] = [
+    ("GET", "/api/meta", None),
+    ("GET", "/api/universities", None),
+    ("GET", "/api/universities/{university_id}", None),
+    ("GET", "/api/universities/suggest?prefix=un", None),
+    ("GET", "/api/universities/search?text=university", None),
+    ("GET", "/api/universities?q=university&fuzzy=true", None),
+    ("POST", "/api/match", {"scores": {"IELTS": 6.5}}),
+]
+
+
+@dataclass
+class WarmupState:
+    """Progress of the warm-up, exposed by ``/api/health/ready`` and metrics."""
+
+    status: str = "pending"
+    started_at: float | None = None
+    seconds: float | None = None
+    steps: dict[str, dict[str, Any]] = field(default_factory=dict)
+    _ready: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def mark_ready(self, status: str = "ready") -> None:
+        self.status = status
+        if self.started_at is not None:
+            self.seconds = round(time.perf_counter() - self.started_at, 3)
+        self._ready.set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until ready; returns ``False`` on timeout."""
+
+        return self._ready.wait(timeout)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"status": self.status, "seconds": self.seconds, "steps": self.steps}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the warm-up in the background and cancel it on shutdown."""
+
+    state = app.state.warmup = WarmupState()
+    metrics.register_provider("warmup", state.as_dict)
+    task = None
+    if get_settings().warmup_enabled:
+        task = asyncio.create_task(warm_up(app, state))
+    else:
+        state.mark_ready("disabled")
+    try:
+        yield
+    finally:
+        if task is not None:
+            task.cancel()
+
+
+async def warm_up(app: FastAPI, state: WarmupState) -> None:
+    """Run every warm-up step, then mark the worker ready.
+
+    Only the database is required: the pool step is retried until it
+    succeeds. Other failing steps are logged and skipped, because their
+    caches are built lazily on first use anyway.
+    """
+
+    settings = get_settings()
+    state.status = "running"
+    state.started_at = time.perf_counter()
+    while not await _step(state, "database", run_in_threadpool, _open_connections):
+        await asyncio.sleep(settings.warmup_retry_seconds)
+    await _step(state, "requests", _prime_requests, app)
+    if settings.warmup_agent:
+        await _step(state, "agent", run_in_threadpool, _build_agent)
+    state.mark_ready()
+    metrics.increment("warmup.completed")
+    logger.info("Warm-up finished in %.3fs: %s", state.seconds, state.steps)
+
+
+async def _step(state: WarmupState, name: str, function, *args) -> bool:
+    started = time.perf_counter()
+    try:
+        detail = await function(*args)
+    except Exception as exc:  # noqa: BLE001 - warm-up is best effort
+        logger.warning("Warm-up step %s failed: %s", name, exc)
+        state.steps[name] = {"status": "failed", "error": str(exc)}
+        metrics.increment("warmup.failures")
+        return False
+    state.steps[name] = {
+        "status": "skipped" if detail == "skipped" else "ok",
+        "seconds": round(time.perf_counter() - started, 3),
+        **(detail if isinstance(detail, dict) else {}),
+    }
+    return True
+
+
+def _open_connections() -> dict[str, int]:
+    """Check out several pool connections at once so the pool keeps them open."""
+
+    with SessionLocal() as session:
+        engine = session.get_bind()
+        refresh_catalog_version(session)
+        size = getattr(engine.pool, "size", lambda: 1)()
+        connections = []
+        try:
+            for _ in range(max(1, min(get_settings().warmup_pool_connections, size))):
+                connection = engine.connect()
+                connections.append(connection)
+                connection.execute(sa.text("SELECT 1"))
+        finally:
+            for connection in connections:
+                connection.close()
+        return {"connections": len(connections)}
+
+
+async def _prime_requests(app: FastAPI) -> dict[str, int]:
+    failed = skipped = 0
+    values: dict[str, Any] = {}
+    for method, template, body in WARMUP_REQUESTS:
+        try:
+            path = template.format(**values)
+        except KeyError:
+            skipped += 1
+            continue
+        try:
+            status, content = await _request(app, method, path, body)
+        except Exception as exc:  # noqa: BLE001 - one broken route must not stop the rest
+            failed += 1
+            logger.warning("Warm-up request %s %s failed: %s", method, path, exc)
+            continue
+        if not 200 <= status < 300:
+            failed += 1
+            logger.warning("Warm-up request %s %s returned %d", method, path, status)
+        elif path == "/api/universities":
+            items = json.loads(content).get("items") or []
+            if items:
+                values["university_id"] = items[0]["id"]
+    return {"requests": len(WARMUP_REQUESTS) - skipped, "failed": failed, "skipped": skipped}
+
+
+async def _request(app: FastAPI, method: str, path: str, body: dict | None) -> tuple[int, bytes]:
+    """Send one request through the ASGI stack without a network round trip.
+
+    Returns the status and the (decompressed) response body.
+    """
+
+    path, _, query = path.partition("?")
+    content = json.dumps(body).encode() if body is not None else b""
+    headers = [(b"host", b"warmup"), (b"accept-encoding", b"gzip")]
+    if body is not None:
+        headers.append((b"content-type", b"application/json"))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 0),
+        "server": ("warmup", 80),
+    }
+    status = 500
+    encoding = b""
+    chunks: list[bytes] = []
+    sent = False
+    done = asyncio.Event()
+
+    async def receive() -> dict:
+        nonlocal sent
+        if sent:  # like a server: the client "disconnects" once the response is complete
+            await done.wait()
+            return {"type": "http.disconnect"}
+        sent = True
+        return {"type": "http.request", "body": content, "more_body": False}
+
+    async def send(message: dict) -> None:
+        nonlocal status, encoding
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            encoding = dict(message.get("headers", ())).get(b"content-encoding", b"")
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                done.set()
+
+    await app(scope, receive, send)
+    content = b"".join(chunks)
+    return status, gzip.decompress(content) if encoding == b"gzip" else content
+
+
+def _build_agent() -> str | None:
+    from app.routers import chat  # None when the chat router could not be imported
+
+    if chat is None:
+        return "skipped"
+    try:
+        chat.get_agent()
+    except HTTPException as exc:  # e.g. no OPENAI_API_KEY; built lazily later
+        logger.info("Skipping agent warm-up: %s", exc.detail)
+        return "skipped"
+    return None
@@ -0,0 +1,77 @@
+"""add university search table
+
+Revision ID: b7d3e5f1a2c4
+Revises: 4f2a9c1d7e3b
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3e5f1a2c4'
+down_revision: Union[str, Sequence[str], None] = '4f2a9c1d7e3b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('university_search',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('university_id', sa.Integer(), nullable=False),
+    sa.Column('country_id', sa.Integer(), nullable=False),
+    sa.Column('country_code', sa.String(length=8), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('requirement_id', sa.Integer(), nullable=True),
+    sa.Column('program_id', sa.Integer(), nullable=True),
+    sa.Column('program_name', sa.String(length=255), nullable=True),
+    sa.Column('degree_level', sa.String(length=16), nullable=True),
+    sa.Column('exam_id', sa.Integer(), nullable=True),
+    sa.Column('exam_name', sa.String(length=120), nullable=True),
+    sa.Column('min_score', sa.Float(), nullable=True),
+    sa.Column('program_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_university_search_country', 'university_search', ['country_code'], unique=False)
+    op.create_index('ix_university_search_exam', 'university_search', ['exam_name', 'min_score'], unique=False)
+    op.create_index('ix_university_search_exam_id', 'university_search', ['exam_id'], unique=False)
+    op.create_index('ix_university_search_program', 'university_search', ['program_name', 'exam_name', 'min_score'], unique=False)
+    op.create_index('ix_university_search_program_id', 'university_search', ['program_id'], unique=False)
+    op.create_index('ix_university_search_requirement', 'university_search', ['requirement_id'], unique=False)
+    op.create_index('ix_university_search_university', 'university_search', ['university_id'], unique=False)
+    op.execute(
+        """
+        INSERT INTO university_search (
+            university_id, country_id, country_code, name, requirement_id, program_id,
+            program_name, degree_level, exam_id, exam_name, min_score, program_count
+        )
+        SELECT u.id, u.country_id, lower(c.code), lower(u.name), r.id, r.program_id,
+               lower(p.name), lower(CAST(p.degree_level AS VARCHAR)), r.exam_id, lower(e.name),
+               r.min_score, coalesce(pc.program_count, 0)
+        FROM universities u
+        JOIN countries c ON u.country_id = c.id
+        LEFT OUTER JOIN requirements r ON r.university_id = u.id
+        LEFT OUTER JOIN programs p ON r.program_id = p.id
+        LEFT OUTER JOIN exams e ON r.exam_id = e.id
+        LEFT OUTER JOIN (
+            SELECT university_id, count(DISTINCT program_id) AS program_count
+            FROM requirements GROUP BY university_id
+        ) pc ON pc.university_id = u.id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_university_search_university', table_name='university_search')
+    op.drop_index('ix_university_search_requirement', table_name='university_search')
+    op.drop_index('ix_university_search_program_id', table_name='university_search')
+    op.drop_index('ix_university_search_program', table_name='university_search')
+    op.drop_index('ix_university_search_exam_id', table_name='university_search')
+    op.drop_index('ix_university_search_exam', table_name='university_search')
+    op.drop_index('ix_university_search_country', table_name='university_search')
+    op.drop_table('university_search')
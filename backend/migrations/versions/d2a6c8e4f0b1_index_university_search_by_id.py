@@ -0,0 +1,62 @@
+"""index university search by id and drop name columns
+
+Revision ID: d2a6c8e4f0b1
+Revises: b7d3e5f1a2c4
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a6c8e4f0b1'
+down_revision: Union[str, Sequence[str], None] = 'b7d3e5f1a2c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index('ix_university_search_exam_id', table_name='university_search')
+    op.drop_index('ix_university_search_program_id', table_name='university_search')
+    op.drop_index('ix_university_search_exam', table_name='university_search')
+    op.drop_index('ix_university_search_program', table_name='university_search')
+    op.drop_index('ix_university_search_country', table_name='university_search')
+    op.create_index('ix_university_search_country', 'university_search', ['country_id'], unique=False)
+    op.create_index('ix_university_search_program', 'university_search', ['program_id', 'exam_id', 'min_score'], unique=False)
+    op.create_index('ix_university_search_exam', 'university_search', ['exam_id', 'min_score'], unique=False)
+    op.drop_column('university_search', 'exam_name')
+    op.drop_column('university_search', 'degree_level')
+    op.drop_column('university_search', 'program_name')
+    op.drop_column('university_search', 'country_code')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('university_search', sa.Column('country_code', sa.String(length=8), nullable=True))
+    op.add_column('university_search', sa.Column('program_name', sa.String(length=255), nullable=True))
+    op.add_column('university_search', sa.Column('degree_level', sa.String(length=16), nullable=True))
+    op.add_column('university_search', sa.Column('exam_name', sa.String(length=120), nullable=True))
+    op.execute(
+        """
+        UPDATE university_search SET
+            country_code = (SELECT lower(c.code) FROM countries c WHERE c.id = university_search.country_id),
+            program_name = (SELECT lower(p.name) FROM programs p WHERE p.id = university_search.program_id),
+            degree_level = (
+                SELECT lower(CAST(p.degree_level AS VARCHAR)) FROM programs p WHERE p.id = university_search.program_id
+            ),
+            exam_name = (SELECT lower(e.name) FROM exams e WHERE e.id = university_search.exam_id)
+        """
+    )
+    op.alter_column('university_search', 'country_code', existing_type=sa.String(length=8), nullable=False)
+    op.drop_index('ix_university_search_exam', table_name='university_search')
+    op.drop_index('ix_university_search_program', table_name='university_search')
+    op.drop_index('ix_university_search_country', table_name='university_search')
+    op.create_index('ix_university_search_country', 'university_search', ['country_code'], unique=False)
+    op.create_index('ix_university_search_program', 'university_search', ['program_name', 'exam_name', 'min_score'], unique=False)
+    op.create_index('ix_university_search_exam', 'university_search', ['exam_name', 'min_score'], unique=False)
+    op.create_index('ix_university_search_program_id', 'university_search', ['program_id'], unique=False)
+    op.create_index('ix_university_search_exam_id', 'university_search', ['exam_id'], unique=False)
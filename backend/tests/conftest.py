@@ -17,7 +17,7 @@ if str(BACKEND_DIR) not in sys.path:
     sys.path.append(str(BACKEND_DIR))
 
 from app import create_app
-from app.core.database import Base, get_db_session
+from app.core.database import Base, SessionLocal, get_db_session
 from app.models import Country, DegreeLevel, Exam, Program, Requirement, University
 
 
@@ -49,9 +49,12 @@ def session_factory(engine: Engine) -> sessionmaker:
 
 
 @pytest.fixture(scope="session")
-def app_fixture(session_factory: sessionmaker):
+def app_fixture(engine: Engine, session_factory: sessionmaker):
     """Application instance wired to the in-memory database."""
 
+    # Code that opens sessions itself (warm-up, agent tools) uses SessionLocal.
+    production_bind = SessionLocal.kw["bind"]
+    SessionLocal.configure(bind=engine)
     app = create_app()
 
     def override_get_db() -> Session:
@@ -61,6 +64,7 @@ def app_fixture(session_factory: sessionmaker):
     app.dependency_overrides[get_db_session] = override_get_db
     yield app
     app.dependency_overrides.clear()
+    SessionLocal.configure(bind=production_bind)
 
 
 @pytest.fixture()
@@ -68,6 +72,8 @@ def client(app_fixture):
     """Test client bound to the application factory."""
 
     with TestClient(app_fixture) as test_client:
+        # Let the startup warm-up finish so it does not share the connection with the test.
+        app_fixture.state.warmup.wait(timeout=10)
         yield test_client
 
 
@@ -0,0 +1,70 @@
+"""Tests for the chat admission gate."""
+
+from __future__ import annotations
+
+import asyncio
+
+from app.core.admission import ConcurrencyGate
+
+
+def test_gate_queues_then_hands_over_released_slot() -> None:
+    """A queued caller gets the slot freed by a holder; overflow is rejected."""
+
+    async def scenario() -> tuple[bool, bool, bool, dict]:
+        gate = ConcurrencyGate(limit=1, max_queue=1, queue_timeout=1.0)
+        assert await gate.acquire()
+
+        queued = asyncio.create_task(gate.acquire())
+        await asyncio.sleep(0)
+        overflow = await gate.acquire()
+        gate.release()
+        handed_over = await queued
+        state = gate.as_dict()
+        gate.release()
+        return handed_over, overflow, gate.active == 0, state
+
+    handed_over, overflow, drained, state = asyncio.run(scenario())
+
+    assert handed_over is True
+    assert overflow is False
+    assert drained
+    assert state["active"] == 1
+    assert state["rejected"] == 1
+
+
+def test_gate_times_out_waiting_callers() -> None:
+    """Queued callers give up after the queue timeout."""
+
+    async def scenario() -> tuple[bool, int]:
+        gate = ConcurrencyGate(limit=1, max_queue=2, queue_timeout=0.01)
+        await gate.acquire()
+        result = await gate.acquire()
+        return result, gate.timed_out
+
+    assert asyncio.run(scenario()) == (False, 1)
+
+
+def test_cancelled_waiter_passes_on_handed_over_slot() -> None:
+    """A queued caller cancelled after receiving a slot does not leak it."""
+
+    async def scenario() -> tuple[bool, dict]:
+        gate = ConcurrencyGate(limit=1, max_queue=1, queue_timeout=1.0)
+        assert await gate.acquire()
+
+        queued = asyncio.create_task(gate.acquire())
+        await asyncio.sleep(0)
+        gate.release()  # hands the slot to the queued caller...
+        queued.cancel()  # ...which disconnects before it resumes
+        cancelled = False
+        try:
+            if await queued:
+                gate.release()
+        except asyncio.CancelledError:
+            cancelled = True
+        return cancelled, gate.as_dict()
+
+    cancelled, state = asyncio.run(scenario())
+
+    assert cancelled
+    assert state["active"] == 0
+    assert state["queue_depth"] == 0
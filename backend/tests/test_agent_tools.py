@@ -0,0 +1,206 @@
+"""Tests for the chat agent tools."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+import pytest
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+agent = pytest.importorskip("app.agent")
+
+from app.core.catalog import bump_catalog_version
+
+from .test_timeouts import SLOW_QUERY
+from .test_universities import recorded_statements
+
+
+@pytest.fixture()
+def tools_db(session_factory: sessionmaker, monkeypatch: pytest.MonkeyPatch) -> sessionmaker:
+    """Point agent tools at the in-memory database with a cold cache."""
+
+    monkeypatch.setattr(agent, "_get_session", session_factory)
+    agent._tool_cache.clear()
+    return session_factory
+
+
+def test_search_tool_results_are_cached_by_normalized_args(tools_db: sessionmaker) -> None:
+    """Equivalent calls differing only in case/whitespace hit the cache."""
+
+    stats = agent._tool_cache.stats
+    hits_before = stats.hits
+
+    first = agent.search_universities.invoke({"country": "KZ"})
+    second = agent.search_universities.invoke({"country": " kz "})
+
+    assert first == second
+    assert json.loads(first)["found"] == 1
+    assert stats.hits == hits_before + 1
+
+
+def test_search_tool_name_query_tolerates_typos(tools_db: sessionmaker) -> None:
+    """The agent's name search goes through the fuzzy index."""
+
+    payload = json.loads(agent.search_universities.invoke({"query": "Nazarbaev Univesity"}))
+
+    assert payload["found"] == 1
+    assert "Nazarbayev University" in json.dumps(payload)
+
+
+def test_description_search_tool_returns_ranked_matches(tools_db: sessionmaker) -> None:
+    """Qualitative questions are answered from the semantic index."""
+
+    payload = json.loads(agent.search_by_description.invoke({"text": "research universities"}))
+
+    assert payload["found"] >= 1
+    assert "Nazarbayev University" in json.dumps(payload)
+
+
+def test_tool_cache_is_scoped_to_catalog_version(tools_db: sessionmaker) -> None:
+    """Bumping the catalog version invalidates cached tool results."""
+
+    agent.get_available_filters.invoke({})
+    misses_before = agent._tool_cache.stats.misses
+
+    bump_catalog_version()
+    agent.get_available_filters.invoke({})
+
+    assert agent._tool_cache.stats.misses == misses_before + 1
+
+
+def test_compare_tool_uses_constant_number_of_queries(tools_db: sessionmaker, engine: Engine) -> None:
+    """Comparisons load all universities in one batched round of queries."""
+
+    missing = list(range(901, 901 + agent.MAX_COMPARE_UNIVERSITIES - 2))
+    with recorded_statements(engine) as few:
+        pair = json.loads(agent.compare_universities.invoke({"university_ids": [1, 2]}))
+    with recorded_statements(engine) as many:
+        payload = json.loads(agent.compare_universities.invoke({"university_ids": [1, 2, *missing]}))
+
+    assert pair["universities_compared"] == payload["universities_compared"] == 2
+    assert payload["not_found_ids"] == missing
+    assert few and len(many) == len(few)
+
+
+def test_scripted_model_drives_real_tools(tools_db: sessionmaker) -> None:
+    """The fake provider runs search then detail lookups against the real tools."""
+
+    model = agent.create_chat_model(provider="fake")
+    react_agent = agent.create_university_agent(llm=model)
+
+    result = react_agent.invoke(
+        {"messages": [{"role": "user", "content": "Computer Science universities in KZ"}]}
+    )
+
+    tool_names = [m.name for m in result["messages"] if m.type == "tool"]
+    assert tool_names == ["search_universities", "get_university"]
+    assert "Nazarbayev University" in result["messages"][-1].content
+    assert model.call_count == 3
+
+
+def test_independent_tool_calls_run_concurrently(tools_db: sessionmaker, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Several lookups in one step are in flight at the same time."""
+
+    # Each lookup waits for the other; run one after another, the first wait times out.
+    both_started = threading.Barrier(2, timeout=5)
+
+    def session_after_barrier():
+        both_started.wait()
+        return tools_db()
+
+    react_agent = agent.create_university_agent(llm=agent.create_chat_model(provider="fake"))
+    agent.search_universities.invoke({})  # warm the search result so only lookups hit the barrier
+    monkeypatch.setattr(agent, "_get_session", session_after_barrier)
+
+    result = react_agent.invoke(
+        {"messages": [{"role": "user", "content": "Show details for each university"}]}
+    )
+
+    lookups = [m for m in result["messages"] if m.type == "tool" and m.name == "get_university"]
+    assert [json.loads(m.content).get("id") for m in lookups] == [2, 1]
+    assert not both_started.broken
+
+
+def test_slow_tool_returns_timeout_error(tools_db: sessionmaker, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A tool that overruns its timeout yields an error payload instead of blocking."""
+
+    monkeypatch.setattr(agent._settings, "tool_timeout_seconds", 0.05)
+
+    def slow_tool() -> str:
+        with tools_db() as session:
+            return str(session.scalar(SLOW_QUERY))
+
+    started = time.perf_counter()
+    payload = json.loads(agent._timed_tool(slow_tool)())
+
+    assert "timed out" in payload["error"]
+    assert time.perf_counter() - started < 1
+
+
+def test_step_budget_ends_turn_with_partial_answer(tools_db: sessionmaker) -> None:
+    """Out of model steps, the turn ends with the findings gathered so far."""
+
+    model = agent.create_chat_model(provider="fake")
+    react_agent = agent.create_university_agent(llm=model)
+
+    with agent.turn_budget(seconds=10, max_steps=1) as budget:
+        result = react_agent.invoke({"messages": [{"role": "user", "content": "Computer Science universities in KZ"}]})
+
+    answer = result["messages"][-1].content
+    assert answer.startswith(agent.PARTIAL_ANSWER_MARKER)
+    assert "Nazarbayev University" in answer
+    assert budget.exhausted == "steps"
+    assert model.call_count == 1
+
+
+def test_tool_call_budget_refuses_extra_calls(tools_db: sessionmaker) -> None:
+    """Tool calls beyond the limit are refused and the model answers with what it has."""
+
+    react_agent = agent.create_university_agent(llm=agent.create_chat_model(provider="fake"))
+
+    with agent.turn_budget(seconds=10, max_tool_calls=1) as budget:
+        result = react_agent.invoke({"messages": [{"role": "user", "content": "Show details for each university"}]})
+
+    lookups = [m for m in result["messages"] if m.type == "tool" and m.name == "get_university"]
+    assert lookups and all("Not run" in json.loads(m.content)["error"] for m in lookups)
+    assert budget.exhausted == "tool_calls"
+    assert budget.tool_calls == 1
+
+
+def test_deadline_bounds_slow_model_calls(tools_db: sessionmaker) -> None:
+    """The remaining deadline is the model's request timeout."""
+
+    react_agent = agent.create_university_agent(llm=agent.create_chat_model(provider="fake", fake_latency_ms=500))
+
+    started = time.perf_counter()
+    with agent.turn_budget(seconds=0.2) as budget:
+        result = react_agent.invoke({"messages": [{"role": "user", "content": "Computer Science universities in KZ"}]})
+
+    assert time.perf_counter() - started < 0.45
+    assert result["messages"][-1].content.startswith(agent.PARTIAL_ANSWER_MARKER)
+    assert budget.exhausted == "deadline"
+
+
+def test_deadline_shortens_tool_timeout(tools_db: sessionmaker, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A tool started near the deadline gets only the time that is left."""
+
+    def slow_session():
+        session = tools_db()
+        try:
+            session.execute(SLOW_QUERY)
+        except Exception:
+            session.close()
+            raise
+        return session
+
+    monkeypatch.setattr(agent, "_get_session", slow_session)
+
+    started = time.perf_counter()
+    with agent.turn_budget(seconds=0.1):
+        payload = json.loads(agent.get_university.invoke({"university_id": 1}))
+
+    assert "timed out" in payload["error"]
+    assert time.perf_counter() - started < 0.3
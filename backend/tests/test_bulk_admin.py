@@ -0,0 +1,188 @@
+"""Tests for the transactional bulk admin write API."""
+
+from __future__ import annotations
+
+import pytest
+import sqlalchemy as sa
+from fastapi.testclient import TestClient
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.catalog import read_catalog_version
+from app.core.config import get_settings
+from app.models import Requirement, University
+
+from .test_universities import recorded_statements
+
+HEADERS = {"X-Admin-Token": "secret"}
+BULK_URL = "/api/admin/universities/bulk"
+
+
+@pytest.fixture(autouse=True)
+def admin_token(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(get_settings(), "admin_token", "secret")
+
+
+def _bulk(client: TestClient, *items: dict):
+    return client.post(BULK_URL, json={"items": list(items)}, headers=HEADERS)
+
+
+def _requirements(session_factory: sessionmaker, university_id: int) -> dict[tuple[int, int], float]:
+    with session_factory() as session:
+        rows = session.execute(
+            sa.select(Requirement.program_id, Requirement.exam_id, Requirement.min_score).where(
+                Requirement.university_id == university_id
+            )
+        )
+        return {(program_id, exam_id): score for program_id, exam_id, score in rows}
+
+
+def test_requires_admin_token(client: TestClient) -> None:
+    response = client.post(BULK_URL, json={"items": [{"op": "delete", "id": 1}]})
+
+    assert response.status_code == 403
+
+
+def test_create_update_delete_in_one_transaction(client: TestClient, session_factory: sessionmaker) -> None:
+    with session_factory() as session:
+        before = read_catalog_version(session)
+
+    response = _bulk(
+        client,
+        {
+            "op": "create",
+            "name": "Astana IT University",
+            "city": "Astana",
+            "country": "kz",
+            "programs": [
+                {"name": "Computer Science", "degree_level": "bachelor", "requirements": {"IELTS": 5.5}},
+            ],
+        },
+        {"op": "create", "name": "Bogazici University", "city": "Istanbul", "country": "TR"},
+        {"op": "update", "id": 1, "city": "Astana"},
+    )
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["applied"]
+    assert payload["version"] == before + 1
+    assert [item["status"] for item in payload["results"]] == ["created", "created", "unchanged"]
+    created = [item["id"] for item in payload["results"][:2]]
+    assert _requirements(session_factory, created[0]) == {(1, 1): 5.5}
+
+    changes = client.get("/api/changes", params={"since": before}).json()["changes"]
+    assert sorted(row["id"] for row in changes["universities"]["upserted"]) == created
+    assert len(changes["requirements"]["upserted"]) == 1
+
+    response = _bulk(client, *({"op": "delete", "id": university_id} for university_id in created))
+
+    assert [item["status"] for item in response.json()["results"]] == ["deleted", "deleted"]
+    assert _requirements(session_factory, created[0]) == {}
+    with session_factory() as session:
+        assert session.scalar(sa.select(sa.func.count(University.id))) == 2
+
+
+def test_requirements_are_replaced_by_diff(
+    client: TestClient, session_factory: sessionmaker, engine: Engine
+) -> None:
+    original = _requirements(session_factory, 2)
+    programs = [
+        {"name": "Computer Science", "degree_level": "bachelor", "requirements": {"IELTS": 6.0}},
+        {"name": "Data Science", "degree_level": "master", "requirements": {"IELTS": 7.0}},
+    ]
+
+    with recorded_statements(engine) as statements:
+        response = _bulk(client, {"op": "update", "id": 2, "programs": programs})
+
+    assert response.json()["results"][0]["status"] == "updated"
+    assert _requirements(session_factory, 2) == {**original, (1, 1): 6.0}
+    # Only the changed score is written; the unchanged requirement is left alone.
+    assert sum(statement.startswith("update requirements") for statement in statements) == 1
+    assert not any(
+        statement.startswith(("insert into requirements", "delete from requirements")) for statement in statements
+    )
+
+    version = response.json()["version"]
+    again = _bulk(client, {"op": "update", "id": 2, "programs": programs}).json()
+    assert again["results"][0]["status"] == "unchanged"
+    assert again["version"] == version
+
+    programs[0]["requirements"] = {"IELTS": 6.5}
+    _bulk(client, {"op": "update", "id": 2, "programs": programs})
+    assert _requirements(session_factory, 2) == original
+
+
+def test_invalid_item_rejects_whole_batch(client: TestClient, session_factory: sessionmaker) -> None:
+    with session_factory() as session:
+        before = read_catalog_version(session)
+
+    response = _bulk(
+        client,
+        {"op": "update", "id": 1, "description": "Not applied"},
+        {"op": "create", "name": "Nowhere University", "city": "Nowhere", "country": "ZZ"},
+        {"op": "delete", "id": 999},
+        {
+            "op": "update",
+            "id": 2,
+            "programs": [{"name": "Physics", "degree_level": "bachelor", "requirements": {"GRE": 300}}],
+        },
+        {"op": "update", "name": "Missing id"},
+    )
+
+    assert response.status_code == 422
+    payload = response.json()
+    assert not payload["applied"]
+    assert [item["status"] for item in payload["results"]] == ["skipped", "error", "error", "error", "error"]
+    assert [item["error"] for item in payload["results"][1:]] == [
+        "Unknown country 'ZZ'",
+        "University 999 not found",
+        "Unknown exams for Physics: GRE",
+        "update requires an id",
+    ]
+    with session_factory() as session:
+        assert read_catalog_version(session) == before
+        assert session.get(University, 1).description == "Flagship research university in Kazakhstan"
+
+
+def test_bulk_create_uses_set_based_statements(
+    client: TestClient, session_factory: sessionmaker, engine: Engine
+) -> None:
+    items = [
+        {
+            "op": "create",
+            "name": f"Bulk University {index}",
+            "city": "Almaty",
+            "country": "KZ",
+            "programs": [
+                {"name": "Computer Science", "degree_level": "bachelor", "requirements": {"IELTS": 6.0, "SAT": 1200}},
+            ],
+        }
+        for index in range(200)
+    ]
+
+    with recorded_statements(engine) as statements:
+        response = _bulk(client, *items)
+
+    created = [item["id"] for item in response.json()["results"]]
+    assert len(set(created)) == 200
+    # SQLite cannot return generated ids in parameter order from one INSERT, so
+    # SQLAlchemy inserts universities row by row there; PostgreSQL batches them.
+    others = [statement for statement in statements if not statement.startswith("insert into universities")]
+    assert sum(statement.startswith("insert into requirements") for statement in others) == 1
+    assert len(others) < 20
+
+    _bulk(client, *({"op": "delete", "id": university_id} for university_id in created))
+    with session_factory() as session:
+        assert session.scalar(sa.select(sa.func.count(Requirement.id))) == 5
+
+
+def test_catalog_is_locked_before_referenced_rows_are_read(client: TestClient, engine: Engine) -> None:
+    """The catalog_state row lock is taken before lookups, so concurrent batches serialize."""
+
+    with recorded_statements(engine) as statements:
+        response = _bulk(client, {"op": "update", "id": 1, "city": "Astana"})
+
+    assert response.json()["results"][0]["status"] == "unchanged"
+    claim = next(index for index, statement in enumerate(statements) if statement.startswith("update catalog_state"))
+    lookups = [index for index, statement in enumerate(statements) if "from universities" in statement]
+    assert lookups and claim < min(lookups)
@@ -0,0 +1,114 @@
+"""Tests for catalog version tracking and the change feed."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from sqlalchemy.orm import sessionmaker
+
+from app.core.catalog import get_catalog_version, read_catalog_version, record_catalog_changes
+from app.models import CatalogChange, Country, University
+
+
+def _database_version(session_factory: sessionmaker) -> int:
+    with session_factory() as session:
+        return read_catalog_version(session)
+
+
+def test_initial_sync_returns_seeded_catalog(client) -> None:
+    response = client.get("/api/changes", params={"limit": 10_000})
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["since"] == 0
+    assert payload["version"] >= 1
+    assert not payload["has_more"]
+    universities = payload["changes"]["universities"]["upserted"]
+    assert [row["name"] for row in universities][:2] == [
+        "Nazarbayev University",
+        "Istanbul Technical University",
+    ]
+    assert universities[0]["country_id"] == 1
+    assert len(payload["changes"]["requirements"]["upserted"]) == 5
+    assert {row["degree_level"] for row in payload["changes"]["programs"]["upserted"]} == {
+        "bachelor",
+        "master",
+    }
+
+
+def test_writes_bump_version_and_appear_in_feed(client, session_factory: sessionmaker) -> None:
+    since = _database_version(session_factory)
+    local_before = get_catalog_version()
+
+    with session_factory() as session:
+        university = session.get(University, 1)
+        original = university.description
+        university.description = "Updated description"
+        session.add(Country(name="Romania", code="RO"))
+        session.commit()
+
+    assert _database_version(session_factory) == since + 1
+    assert get_catalog_version() > local_before
+
+    payload = client.get("/api/changes", params={"since": since}).json()
+    assert payload["version"] == since + 1
+    assert set(payload["changes"]) == {"universities", "countries"}
+    assert payload["changes"]["universities"]["upserted"][0]["description"] == "Updated description"
+    assert payload["changes"]["countries"]["upserted"][0]["code"] == "RO"
+
+    with session_factory() as session:
+        session.get(University, 1).description = original
+        session.delete(session.scalar(sa.select(Country).where(Country.code == "RO")))
+        session.commit()
+
+    payload = client.get("/api/changes", params={"since": since}).json()
+    assert payload["version"] == since + 2
+    # The country was created and deleted in the window: only its deletion is reported.
+    assert payload["changes"]["countries"] == {"upserted": [], "deleted": [3]}
+    assert payload["changes"]["universities"]["upserted"][0]["description"] == original
+
+
+def test_unchanged_and_rolled_back_sessions_do_not_bump(client, session_factory: sessionmaker) -> None:
+    since = _database_version(session_factory)
+
+    with session_factory() as session:
+        session.get(University, 1).city = "Astana"  # same value
+        session.commit()
+    with session_factory() as session:
+        session.get(University, 2).city = "Ankara"
+        session.flush()
+        session.rollback()
+
+    assert _database_version(session_factory) == since
+    with session_factory() as session:
+        assert session.get(University, 2).city == "Istanbul"
+    assert client.get("/api/changes", params={"since": since}).json()["changes"] == {}
+
+
+def test_pages_stop_at_version_boundaries(client, session_factory: sessionmaker) -> None:
+    since = _database_version(session_factory)
+    with session_factory() as session:
+        record_catalog_changes(session, "universities", [1, 2])
+        session.commit()
+    with session_factory() as session:
+        record_catalog_changes(session, "universities", [1])
+        session.commit()
+
+    first = client.get("/api/changes", params={"since": since, "limit": 1}).json()
+    assert first["has_more"]
+    assert first["version"] == since + 1
+    # The whole first transaction is returned even though it exceeds the limit.
+    assert [row["id"] for row in first["changes"]["universities"]["upserted"]] == [1, 2]
+
+    second = client.get("/api/changes", params={"since": first["version"], "limit": 1}).json()
+    assert not second["has_more"]
+    assert second["version"] == since + 2
+    assert [row["id"] for row in second["changes"]["universities"]["upserted"]] == [1]
+
+    with session_factory() as session:
+        assert session.scalar(
+            sa.select(sa.func.count()).where(CatalogChange.version == since + 1)
+        ) == 2
+
+
+def test_rejects_negative_since(client) -> None:
+    assert client.get("/api/changes", params={"since": -1}).status_code == 422
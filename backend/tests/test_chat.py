@@ -0,0 +1,236 @@
+"""Tests for the chat endpoint using a stub agent."""
+
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+chat_api = pytest.importorskip("app.api.chat")
+
+from langchain_core.messages import AIMessage
+
+from app.core.admission import ConcurrencyGate, TokenBucketLimiter
+from app.core.cache import TTLCache
+from app.core.catalog import bump_catalog_version
+from app.models import Country
+
+
+class StubAgent:
+    """Agent double that answers with a fixed message and counts invocations."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def invoke(self, inputs: dict) -> dict:
+        self.calls += 1
+        return {"messages": [*inputs["messages"], AIMessage(content=f"answer {self.calls}")]}
+
+
+@pytest.fixture()
+def stub_agent(monkeypatch: pytest.MonkeyPatch) -> StubAgent:
+    """Install a stub agent and a fresh response cache."""
+
+    agent = StubAgent()
+    monkeypatch.setattr(chat_api, "_agent", agent)
+    monkeypatch.setattr(chat_api, "_response_cache", TTLCache(maxsize=16, ttl=60))
+    monkeypatch.setattr(chat_api, "_rate_limiter", TokenBucketLimiter(rate=100, burst=100))
+    monkeypatch.setattr(chat_api, "_gate", ConcurrencyGate(limit=4, max_queue=4))
+    return agent
+
+
+def test_repeated_question_is_served_from_cache(client: TestClient, stub_agent: StubAgent) -> None:
+    """Normalized duplicates of a question skip the agent."""
+
+    first = client.post("/api/chat", json={"message": "CS universities in Germany?"})
+    second = client.post("/api/chat", json={"message": "  cs universities in germany "})
+
+    assert first.status_code == 200
+    assert second.json()["response"] == first.json()["response"]
+    assert stub_agent.calls == 1
+
+
+@pytest.mark.parametrize("entry", [{"role": "user", "content": None}, {"role": "user", "content": 5}, {"role": "user"}])
+def test_malformed_chat_history_is_rejected(client: TestClient, stub_agent: StubAgent, entry: dict) -> None:
+    """History entries need string content; bad ones are a 422, not a crash."""
+
+    response = client.post("/api/chat", json={"message": "which exam is the hardest", "chat_history": [entry]})
+
+    assert response.status_code == 422
+    assert stub_agent.calls == 0
+
+
+def test_cache_respects_history_and_catalog_version(client: TestClient, stub_agent: StubAgent) -> None:
+    """Different history or a new catalog version forces a fresh agent run."""
+
+    client.post("/api/chat", json={"message": "which exam is the hardest"})
+    client.post(
+        "/api/chat",
+        json={
+            "message": "which exam is the hardest",
+            "chat_history": [{"role": "user", "content": "hi"}],
+        },
+    )
+    assert stub_agent.calls == 2
+
+    bump_catalog_version()
+    client.post("/api/chat", json={"message": "which exam is the hardest"})
+    assert stub_agent.calls == 3
+
+
+def test_conversation_history_is_kept_server_side(client: TestClient, stub_agent: StubAgent, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Follow-up turns reuse stored history referenced by conversation_id."""
+
+    seen: list[list[dict]] = []
+    original_invoke = stub_agent.invoke
+
+    def recording_invoke(inputs: dict) -> dict:
+        seen.append(list(inputs["messages"]))
+        return original_invoke(inputs)
+
+    monkeypatch.setattr(stub_agent, "invoke", recording_invoke)
+
+    first = client.post("/api/chat", json={"message": "best universities in KZ for me"}).json()
+    client.post(
+        "/api/chat",
+        json={"message": "which one is in Astana", "conversation_id": first["conversation_id"]},
+    )
+
+    assert [m["content"] for m in seen[-1]] == [
+        "best universities in KZ for me",
+        "answer 1",
+        "which one is in Astana",
+    ]
+
+
+def test_saturated_gate_fast_fails_with_retry_after(
+    client: TestClient, stub_agent: StubAgent, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """When no slot or queue space is free the agent is not invoked."""
+
+    monkeypatch.setattr(chat_api, "_gate", ConcurrencyGate(limit=0, max_queue=0))
+
+    response = client.post("/api/chat", json={"message": "cheapest universities in TR"})
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert stub_agent.calls == 0
+
+
+def test_client_rate_limit_returns_429(
+    client: TestClient, stub_agent: StubAgent, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A client exceeding its token bucket is rejected until tokens refill."""
+
+    monkeypatch.setattr(chat_api, "_rate_limiter", TokenBucketLimiter(rate=0.5, burst=1))
+
+    assert client.post("/api/chat", json={"message": "first"}).status_code == 200
+    response = client.post("/api/chat", json={"message": "second"})
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "2"
+
+
+def test_forwarded_header_is_ignored_from_untrusted_peers(
+    client: TestClient, stub_agent: StubAgent, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A client cannot dodge its bucket by sending a fresh X-Forwarded-For each time."""
+
+    monkeypatch.setattr(chat_api, "_rate_limiter", TokenBucketLimiter(rate=0.5, burst=1))
+
+    first = client.post("/api/chat", json={"message": "first"}, headers={"X-Forwarded-For": "10.0.0.1"})
+    second = client.post("/api/chat", json={"message": "second"}, headers={"X-Forwarded-For": "10.0.0.2"})
+
+    assert first.status_code == 200
+    assert second.status_code == 429
+
+
+def test_forwarded_client_is_used_behind_trusted_proxy(
+    client: TestClient, stub_agent: StubAgent, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Behind a trusted proxy, the nearest untrusted forwarded hop is the client."""
+
+    from app.core.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "trusted_proxies", ["testclient", "10.0.0.0/8"])
+    monkeypatch.setattr(chat_api, "_rate_limiter", TokenBucketLimiter(rate=0.5, burst=1))
+
+    def post(forwarded: str) -> int:
+        return client.post("/api/chat", json={"message": "hi"}, headers={"X-Forwarded-For": forwarded}).status_code
+
+    assert post("203.0.113.5") == 200
+    assert post("198.51.100.7, 10.1.2.3") == 200
+    # A spoofed leftmost hop does not change the address the proxy appended.
+    assert post("1.2.3.4, 203.0.113.5") == 429
+
+
+@pytest.mark.parametrize(
+    ("message", "expected"),
+    [
+        ("Which countries do you have?", "Kazakhstan (KZ)"),
+        ("show me university 1", "Nazarbayev University (ID 1)"),
+        ("universities in KZ with IELTS", "I found 1 universities matching Kazakhstan, IELTS"),
+    ],
+)
+def test_simple_lookups_skip_the_llm(
+    client: TestClient, stub_agent: StubAgent, message: str, expected: str
+) -> None:
+    """Pure catalog lookups are answered from templates on the fast path."""
+
+    response = client.post("/api/chat", json={"message": message})
+
+    assert response.status_code == 200
+    assert expected in response.json()["response"]
+    assert stub_agent.calls == 0
+
+
+def test_code_like_words_in_prose_go_to_the_llm(
+    client: TestClient, stub_agent: StubAgent, session_factory: sessionmaker
+) -> None:
+    """Capitalized words that happen to be country codes only filter after "in"/"from"."""
+
+    with session_factory() as session:
+        session.get(Country, 2).code = "IT"
+        session.commit()
+    try:
+        for message in ("Do IT universities accept IELTS", "IT universities with IELTS", "IELTS for IT"):
+            reply = client.post("/api/chat", json={"message": message}).json()["response"]
+            assert reply.startswith("answer"), message
+        assert stub_agent.calls == 3
+
+        reply = client.post("/api/chat", json={"message": "universities in IT with IELTS"}).json()["response"]
+        assert "matching Turkey, IELTS" in reply
+        assert stub_agent.calls == 3
+    finally:
+        with session_factory() as session:
+            session.get(Country, 2).code = "TR"
+            session.commit()
+
+
+def test_partial_answers_are_flagged_and_not_cached(
+    client: TestClient, stub_agent: StubAgent, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A turn that runs out of budget returns its partial answer without caching it."""
+
+    from app import agent as agent_module
+    from app.core import metrics
+
+    budgets = []
+
+    def out_of_time(inputs: dict) -> dict:
+        budget = agent_module._turn_budget.get()  # propagated into the worker thread
+        budgets.append(budget)
+        budget.expire("deadline")
+        text = f"{agent_module.PARTIAL_ANSWER_MARKER} I stopped early."
+        return {"messages": [*inputs["messages"], AIMessage(content=text)]}
+
+    monkeypatch.setattr(stub_agent, "invoke", out_of_time)
+    before = metrics.counter("chat.budget_exhausted.deadline")
+
+    first = client.post("/api/chat", json={"message": "plan my applications"}).json()
+    second = client.post("/api/chat", json={"message": "plan my applications"}).json()
+
+    assert first["partial"] and second["partial"]
+    assert len(budgets) == 2 and budgets[0] is not None
+    assert metrics.counter("chat.budget_exhausted.deadline") == before + 2
+    assert client.get("/api/metrics").json()["chat_budget"]["exhausted_deadline"] >= 2
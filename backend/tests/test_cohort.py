@@ -0,0 +1,94 @@
+"""Tests for batch cohort matching."""
+
+from __future__ import annotations
+
+import csv
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.api.admin import _cohort_jobs
+from app.core.config import get_settings
+from app.services.cohort import CohortJobRegistry, run_cohort_match
+from app.services.matching import RequirementMatrix
+
+COHORT_CSV = "student_id,IELTS,SAT\ns1,6.5,\ns2,7.5,1400\ns3,,\n"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_cohort_matches_stream_to_output(session_factory: sessionmaker, tmp_path: Path, workers: int) -> None:
+    """Each student gets one output row per eligible program, in input order."""
+
+    with session_factory() as session:
+        matrix = RequirementMatrix.from_session(session)
+    source = tmp_path / "students.csv"
+    source.write_text(COHORT_CSV)
+    target = tmp_path / "matches.csv"
+
+    stats = run_cohort_match(matrix, source, target, workers=workers, chunk_size=2)
+
+    with open(target, newline="") as handle:
+        rows = list(csv.DictReader(handle))
+    assert stats.students == 3
+    assert stats.matches == len(rows) == 5
+    assert [row["student_id"] for row in rows] == ["s1", "s2", "s2", "s2", "s2"]
+
+
+def test_admin_cohort_job_can_be_polled_and_downloaded(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Uploading a CSV starts a job whose result becomes downloadable."""
+
+    monkeypatch.setattr(get_settings(), "admin_token", "secret")
+    headers = {"X-Admin-Token": "secret", "Content-Type": "text/csv"}
+
+    assert client.post("/api/admin/cohort-match", content=COHORT_CSV).status_code == 403
+
+    job = client.post("/api/admin/cohort-match", content=COHORT_CSV, headers=headers).json()
+    for _ in range(100):
+        job = client.get(f"/api/admin/cohort-match/{job['id']}", headers=headers).json()
+        if job["status"] in {"completed", "failed"}:
+            break
+        time.sleep(0.02)
+
+    assert job["status"] == "completed"
+    assert job["students"] == 3
+    result = client.get(job["result_url"], headers=headers)
+    assert result.status_code == 200
+    assert result.text.splitlines()[0].startswith("student_id,university_id")
+
+
+def test_admin_cohort_upload_is_size_limited(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Oversized uploads are rejected and leave no job or file behind."""
+
+    settings = get_settings()
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    monkeypatch.setattr(settings, "cohort_max_upload_bytes", 16)
+    headers = {"X-Admin-Token": "secret", "Content-Type": "text/csv"}
+    before = set(_cohort_jobs.directory.glob("*")) if _cohort_jobs.directory.exists() else set()
+
+    declared = client.post("/api/admin/cohort-match", content=COHORT_CSV, headers=headers)
+    streamed = client.post("/api/admin/cohort-match", content=iter([COHORT_CSV.encode()]), headers=headers)
+
+    assert declared.status_code == streamed.status_code == 413
+    assert set(_cohort_jobs.directory.glob("*")) == before
+
+
+def test_finished_cohort_jobs_expire_with_their_files(session_factory: sessionmaker, tmp_path: Path) -> None:
+    """Jobs are forgotten and their files deleted once their TTL has passed."""
+
+    with session_factory() as session:
+        matrix = RequirementMatrix.from_session(session)
+    registry = CohortJobRegistry(tmp_path, workers=1, ttl_seconds=60)
+    job = registry.create()
+    job.input_path.write_text(COHORT_CSV)
+    registry._run(job, matrix)
+    assert job.status == "completed" and job.output_path.exists()
+
+    assert registry.expire(now=job.finished_at + 30) == []
+    assert registry.expire(now=job.finished_at + 60) == [job.id]
+    assert registry.get(job.id) is None
+    assert list(tmp_path.iterdir()) == []
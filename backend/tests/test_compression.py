@@ -0,0 +1,74 @@
+"""Tests for response compression and precompressed cached payloads."""
+
+from __future__ import annotations
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core import compression, metrics
+from app.core.compression import CompressionMiddleware, choose_encoding
+from app.core.config import get_settings
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("gzip, deflate", "gzip"),
+        ("deflate", None),
+        ("gzip;q=0", None),
+        ("*", compression.supported_encodings()[0]),
+        ("", None),
+    ],
+)
+def test_choose_encoding(header: str, expected: str | None) -> None:
+    assert choose_encoding(header) == expected
+
+
+def test_middleware_compresses_large_bodies_only() -> None:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/large")
+    def large() -> PlainTextResponse:
+        return PlainTextResponse("catalog " * 100)
+
+    @app.get("/small")
+    def small() -> PlainTextResponse:
+        return PlainTextResponse("ok")
+
+    @app.get("/stream")
+    def stream() -> StreamingResponse:
+        return StreamingResponse(iter([b"a" * 500, b"b" * 500]), media_type="text/csv")
+
+    client = TestClient(app)
+    headers = {"Accept-Encoding": "gzip"}
+
+    large_response = client.get("/large", headers=headers)
+    assert large_response.headers["content-encoding"] == "gzip"
+    assert large_response.text == "catalog " * 100
+    assert int(large_response.headers["content-length"]) < 800
+
+    assert "content-encoding" not in client.get("/small", headers=headers).headers
+    assert "content-encoding" not in client.get("/stream", headers=headers).headers
+    assert "content-encoding" not in client.get("/large", headers={"Accept-Encoding": "identity"}).headers
+
+
+def test_cached_meta_is_served_precompressed(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(get_settings(), "compression_min_bytes", 0)
+    compression._payload_cache.clear()
+
+    first = client.get("/api/meta", headers={"Accept-Encoding": "gzip"})
+    hits_before = metrics.counter("compression.precompressed_hits")
+    second = client.get("/api/meta", headers={"Accept-Encoding": "gzip"})
+
+    assert first.headers["content-encoding"] == "gzip"
+    assert second.json() == first.json()
+    assert metrics.counter("compression.precompressed_hits") == hits_before + 1
+
+    raw = client.get("/api/meta", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in raw.headers
+    assert raw.json() == first.json()
@@ -0,0 +1,48 @@
+"""Tests for server-side conversation history compaction."""
+
+from __future__ import annotations
+
+from app.core.encoding import estimate_tokens
+from app.services.conversation_store import ConversationStore, InMemoryConversationBackend
+
+
+def test_old_turns_are_folded_into_bounded_summary() -> None:
+    """History stays within the token budget as the conversation grows."""
+
+    store = ConversationStore(InMemoryConversationBackend(), token_budget=100, summary_token_budget=60)
+    conversation = store.get_or_create()
+
+    for turn in range(50):
+        store.append_turn(conversation, f"question {turn} " + "x" * 80, f"answer {turn} " + "y" * 80)
+
+    restored = store.get_or_create(conversation.id)
+    assert restored is conversation
+    assert sum(estimate_tokens(t["content"]) for t in conversation.turns) <= 100
+    assert estimate_tokens(conversation.summary) <= 60
+    assert conversation.turns[-1]["content"].startswith("answer 49")
+    assert "question 49" not in conversation.summary
+    assert conversation.summary.startswith("- ")
+
+
+def test_unknown_ids_get_a_fresh_server_id() -> None:
+    """Client-chosen IDs that miss the store are replaced, not adopted."""
+
+    store = ConversationStore(InMemoryConversationBackend())
+
+    conversation = store.get_or_create("attacker-chosen")
+
+    assert conversation.id != "attacker-chosen"
+    assert len(conversation.id) == 32
+    assert store.get_or_create("attacker-chosen") is not conversation
+
+
+def test_seed_only_fills_empty_conversations() -> None:
+    """Client history seeds a new conversation once, under the store lock."""
+
+    store = ConversationStore(InMemoryConversationBackend())
+    conversation = store.get_or_create()
+
+    store.seed(conversation, [{"role": "user", "content": "hi"}])
+    store.seed(conversation, [{"role": "user", "content": "again"}])
+
+    assert conversation.turns == [{"role": "user", "content": "hi"}]
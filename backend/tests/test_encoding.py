@@ -0,0 +1,48 @@
+"""Tests for compact tool-output encoding."""
+
+from __future__ import annotations
+
+import json
+
+from app.core.encoding import encode_tool_output, estimate_tokens
+
+
+def _rows(count: int) -> list[dict]:
+    return [
+        {"id": index, "name": f"University {index}", "city": "Almaty", "country": None}
+        for index in range(count)
+    ]
+
+
+def test_uniform_lists_are_encoded_as_tables() -> None:
+    """Lists of objects become column/row tables without null values."""
+
+    encoded = encode_tool_output({"found": 3, "universities": _rows(3)})
+    payload = json.loads(encoded)
+
+    assert payload["universities"]["columns"] == ["id", "name", "city"]
+    assert payload["universities"]["rows"][0] == [0, "University 0", "Almaty"]
+    assert " " not in encoded.replace("University ", "")
+
+
+def test_token_budget_truncates_longest_list_with_summary() -> None:
+    """Outputs over budget keep a prefix of rows plus an "and N more" note."""
+
+    encoded = encode_tool_output({"found": 200, "universities": _rows(200)}, token_budget=200)
+    payload = json.loads(encoded)
+
+    assert estimate_tokens(encoded) <= 200
+    kept = len(payload["universities"]["rows"])
+    assert 0 < kept < 200
+    assert payload["truncated"] == f"and {200 - kept} more universities"
+
+
+def test_count_key_reports_rows_kept_after_truncation() -> None:
+    """The count field reflects the rows left after truncation, not the input."""
+
+    payload = {"found": 200, "showing": 200, "universities": _rows(200)}
+    truncated = json.loads(encode_tool_output(payload, token_budget=200, count_key="showing"))
+    assert truncated["showing"] == len(truncated["universities"]["rows"]) < 200
+
+    untouched = json.loads(encode_tool_output({**payload, "showing": 3, "universities": _rows(3)}, count_key="showing"))
+    assert untouched["showing"] == 3
@@ -0,0 +1,48 @@
+"""Tests for the typo-tolerant name index."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.services.fuzzy import MAX_CANDIDATES, FuzzyNameIndex, bounded_levenshtein
+
+
+@pytest.mark.parametrize(
+    ("a", "b", "limit", "expected"),
+    [
+        ("kitten", "sitting", 3, 3),
+        ("kitten", "sitting", 2, None),
+        ("nazarbaev", "nazarbayev", 2, 1),
+        ("", "abc", 3, 3),
+        ("abc", "abcdef", 2, None),
+    ],
+)
+def test_bounded_levenshtein(a: str, b: str, limit: int, expected: int | None) -> None:
+    assert bounded_levenshtein(a, b, limit) == expected
+
+
+def test_index_ranks_closest_names_first() -> None:
+    index = FuzzyNameIndex(
+        [
+            (1, "Al-Farabi Kazakh National University"),
+            (2, "Nazarbayev University"),
+            (3, "Nazareth College"),
+            (4, "Babeș-Bolyai University"),
+        ]
+    )
+
+    assert index.search("Nazarbaev")[0] == (2, 1)
+    assert index.search("al farabi") == [(1, 0)]
+    assert index.search("babes bolyai") == [(4, 0)]
+    assert [entry_id for entry_id, _ in index.search("nazar")] == [2, 3]
+    assert index.search("Nazarbaev", max_distance=0) == []
+
+
+def test_search_within_ranks_only_the_given_ids() -> None:
+    """Filtered searches are not cut off by matches outside the filter."""
+
+    index = FuzzyNameIndex([(n, f"Technical University {n:03d}") for n in range(MAX_CANDIDATES + 100)])
+    last = MAX_CANDIDATES + 99
+
+    assert last not in [entry_id for entry_id, _ in index.search("technical universty", limit=None)]
+    assert index.search("technical universty", within={last, 5}) == [(5, 1), (last, 1)]
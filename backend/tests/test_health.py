@@ -2,7 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
+
+import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+
+from app import warmup
+from app.core.config import get_settings
+from app.warmup import WARMUP_REQUESTS, WarmupState
 
 
 def test_health_endpoint_returns_ok(client: TestClient) -> None:
@@ -13,3 +21,113 @@ def test_health_endpoint_returns_ok(client: TestClient) -> None:
     payload = response.json()
     assert payload["status"] == "ok"
     assert "timestamp" in payload
+
+
+def test_readiness_reports_completed_warmup(client: TestClient) -> None:
+    """Startup warm-up opens connections and primes the hot endpoints."""
+
+    response = client.get("/api/health/ready")
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["status"] == "ready"
+    assert payload["steps"]["database"]["status"] == "ok"
+    assert payload["steps"]["requests"] == {
+        "status": "ok",
+        "seconds": payload["steps"]["requests"]["seconds"],
+        "requests": len(WARMUP_REQUESTS),
+        "failed": 0,
+        "skipped": 0,
+    }
+    assert client.get("/api/metrics").json()["warmup"]["status"] == "ready"
+
+
+def test_readiness_is_503_until_warm(client: TestClient, app_fixture) -> None:
+    """Load balancers keep traffic away while warm-up is still running."""
+
+    warm = app_fixture.state.warmup
+    app_fixture.state.warmup = WarmupState(status="running")
+    try:
+        response = client.get("/api/health/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "running"
+        # Liveness is independent of warm-up.
+        assert client.get("/api/health").status_code == 200
+    finally:
+        app_fixture.state.warmup = warm
+
+
+def test_warmup_retries_database_until_reachable(app_fixture, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A database outage at startup keeps the worker unready and retries."""
+
+    attempts = []
+    real_open = warmup._open_connections
+
+    def flaky_open():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise OperationalError("SELECT 1", {}, Exception("connection refused"))
+        return real_open()
+
+    monkeypatch.setattr(warmup, "_open_connections", flaky_open)
+    monkeypatch.setattr(get_settings(), "warmup_retry_seconds", 0.0)
+    monkeypatch.setattr(get_settings(), "warmup_agent", False)
+    state = WarmupState()
+
+    asyncio.run(warmup.warm_up(app_fixture, state))
+
+    assert state.ready
+    assert len(attempts) == 3
+    assert state.steps["database"]["status"] == "ok"
+
+
+def test_warmup_counts_non_2xx_requests_as_failed(app_fixture, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Client errors during warm-up are failures too, not only server errors."""
+
+    monkeypatch.setattr(
+        warmup,
+        "WARMUP_REQUESTS",
+        [("GET", "/api/meta", None), ("GET", "/api/universities/999999", None), ("GET", "/api/nowhere", None)],
+    )
+
+    assert asyncio.run(warmup._prime_requests(app_fixture)) == {"requests": 3, "failed": 2, "skipped": 0}
+
+
+def test_warmup_request_errors_do_not_stop_the_rest(app_fixture, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A request that raises is counted as failed and the remaining ones still run."""
+
+    real_request = warmup._request
+    paths = []
+
+    async def broken_meta(app, method, path, body):
+        paths.append(path)
+        if path == "/api/meta":
+            raise RuntimeError("boom")
+        return await real_request(app, method, path, body)
+
+    monkeypatch.setattr(warmup, "_request", broken_meta)
+    monkeypatch.setattr(warmup, "WARMUP_REQUESTS", [("GET", "/api/meta", None), ("GET", "/api/universities", None)])
+
+    assert asyncio.run(warmup._prime_requests(app_fixture)) == {"requests": 2, "failed": 1, "skipped": 0}
+    assert paths == ["/api/meta", "/api/universities"]
+
+
+def test_warmup_detail_request_uses_an_id_from_the_listing(app_fixture, monkeypatch: pytest.MonkeyPatch) -> None:
+    """The detail route is warmed with a real ID, and skipped when none is known."""
+
+    real_request = warmup._request
+    paths = []
+
+    async def recorded(app, method, path, body):
+        paths.append(path)
+        return await real_request(app, method, path, body)
+
+    monkeypatch.setattr(warmup, "_request", recorded)
+    detail = ("GET", "/api/universities/{university_id}", None)
+
+    monkeypatch.setattr(warmup, "WARMUP_REQUESTS", [detail])
+    assert asyncio.run(warmup._prime_requests(app_fixture)) == {"requests": 0, "failed": 0, "skipped": 1}
+
+    monkeypatch.setattr(warmup, "WARMUP_REQUESTS", [("GET", "/api/universities", None), detail])
+    assert asyncio.run(warmup._prime_requests(app_fixture)) == {"requests": 2, "failed": 0, "skipped": 0}
+    assert paths == ["/api/universities", "/api/universities/2"]
@@ -0,0 +1,36 @@
+"""Tests for the eligibility matching endpoint."""
+
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+
+def test_match_returns_programs_whose_requirements_are_met(client: TestClient) -> None:
+    """IELTS 6.5 alone qualifies only for programs requiring nothing else."""
+
+    response = client.post("/api/match", json={"scores": {"ielts": 6.5}})
+    assert response.status_code == 200
+    payload = response.json()
+
+    # Nazarbayev CS also needs SAT, Data Science needs IELTS 7.0.
+    assert [(i["university_name"], i["program_name"]) for i in payload["items"]] == [
+        ("Istanbul Technical University", "Computer Science"),
+    ]
+    assert payload["items"][0]["requirements"] == [
+        {"exam": "IELTS", "min_score": 6.5, "score": 6.5}
+    ]
+
+
+def test_match_ranks_by_margin_and_reports_unknown_exams(client: TestClient) -> None:
+    """Comfortable matches come first; unrecognized exams are echoed back."""
+
+    response = client.post(
+        "/api/match", json={"scores": {"IELTS": 7.5, "SAT": 1400, "GRE": 320}}
+    )
+    payload = response.json()
+
+    assert payload["total"] == 4
+    assert payload["unknown_exams"] == ["GRE"]
+    margins = [item["margin"] for item in payload["items"]]
+    assert margins == sorted(margins, reverse=True)
+    assert payload["items"][-1]["program_name"] == "Computer Science"
@@ -0,0 +1,111 @@
+"""Tests for the denormalized university_search table."""
+
+from __future__ import annotations
+
+import pytest
+import sqlalchemy as sa
+from fastapi.testclient import TestClient
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import get_settings
+from app.models import Requirement, UniversitySearch
+from app.services.search_table import check_search_table, refresh_search_rows
+
+from .test_universities import recorded_statements
+
+
+def _search_rows(session_factory: sessionmaker, university_id: int) -> set[tuple]:
+    with session_factory() as session:
+        rows = session.execute(
+            sa.select(UniversitySearch.program_id, UniversitySearch.exam_id, UniversitySearch.min_score).where(
+                UniversitySearch.university_id == university_id
+            )
+        )
+        return set(map(tuple, rows))
+
+
+def _assert_consistent(session_factory: sessionmaker) -> None:
+    with session_factory() as session:
+        assert check_search_table(session).consistent
+
+
+def test_seeded_table_is_consistent(client: TestClient, session_factory: sessionmaker) -> None:
+    _assert_consistent(session_factory)
+    assert (1, 1, 6.5) in _search_rows(session_factory, 1)
+    with session_factory() as session:
+        assert session.scalar(
+            sa.select(UniversitySearch.program_count).where(UniversitySearch.university_id == 2).limit(1)
+        ) == 2
+
+
+def test_orm_writes_refresh_search_rows(client: TestClient, session_factory: sessionmaker) -> None:
+    with session_factory() as session:
+        session.get(Requirement, 5).min_score = 5.5
+        session.commit()
+
+    try:
+        _assert_consistent(session_factory)
+        assert (2, 1, 5.5) in _search_rows(session_factory, 2)
+        assert (2, 1, 7.0) not in _search_rows(session_factory, 2)
+    finally:
+        with session_factory() as session:
+            session.get(Requirement, 5).min_score = 7.0
+            session.commit()
+    _assert_consistent(session_factory)
+
+
+def test_bulk_writes_refresh_search_rows(client: TestClient, session_factory: sessionmaker) -> None:
+    headers = {"X-Admin-Token": "secret"}
+    url = "/api/admin/universities/bulk"
+    item = {
+        "op": "create",
+        "name": "Search Test University",
+        "city": "Almaty",
+        "country": "KZ",
+        "programs": [{"name": "Computer Science", "degree_level": "bachelor", "requirements": {"SAT": 1100}}],
+    }
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(get_settings(), "admin_token", "secret")
+        created = client.post(url, json={"items": [item]}, headers=headers).json()["results"][0]["id"]
+        try:
+            _assert_consistent(session_factory)
+            assert _search_rows(session_factory, created) == {(1, 2, 1100.0)}
+            payload = client.get("/api/universities", params={"exam": "SAT", "country": "kz"}).json()
+            assert created in [university["id"] for university in payload["items"]]
+        finally:
+            client.post(url, json={"items": [{"op": "delete", "id": created}]}, headers=headers)
+
+    assert _search_rows(session_factory, created) == set()
+    _assert_consistent(session_factory)
+
+
+def test_check_detects_and_repairs_drift(client: TestClient, session_factory: sessionmaker) -> None:
+    with session_factory() as session:
+        session.execute(sa.update(UniversitySearch).where(UniversitySearch.university_id == 1).values(min_score=0))
+        session.execute(sa.delete(UniversitySearch).where(UniversitySearch.university_id == 2))
+        session.execute(
+            sa.insert(UniversitySearch).values(
+                university_id=999, country_id=1, name="ghost", program_count=0
+            )
+        )
+        session.commit()
+
+        report = check_search_table(session)
+        assert (report.missing, report.stale, report.orphaned) == ([2], [1], [999])
+
+        refresh_search_rows(session, [*report.missing, *report.stale, *report.orphaned])
+        session.commit()
+        assert check_search_table(session).consistent
+
+
+def test_filtered_listing_reads_search_table(client: TestClient, engine: Engine) -> None:
+    with recorded_statements(engine) as statements:
+        response = client.get(
+            "/api/universities", params={"country": "TR", "program": "Data Science", "exam": "IELTS", "min_score": 6}
+        )
+
+    assert [item["id"] for item in response.json()["items"]] == [2]
+    listing = [statement for statement in statements if "university_search" in statement]
+    assert listing
+    assert not any("from requirements" in statement or "exists" in statement for statement in listing)
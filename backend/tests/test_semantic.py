@@ -0,0 +1,47 @@
+"""Tests for the hashed TF-IDF semantic index."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from app.services import semantic
+from app.services.semantic import SemanticIndex, tokenize
+
+DOCUMENTS = {
+    1: "Flagship research university with strong STEM programs",
+    2: "Internationally focused business school",
+    3: "Historic engineering school on the coast",
+    4: "Conservatory of music and performing arts",
+}
+
+
+def test_tokenize_folds_plurals_and_adds_bigrams() -> None:
+    assert tokenize("The Business Schools") == ["business", "school", "business school"]
+
+
+def test_exact_search_ranks_matching_documents() -> None:
+    index = SemanticIndex(list(DOCUMENTS), list(DOCUMENTS.values()))
+
+    assert index.search("research university")[0][0] == 1
+    assert [uid for uid, _ in index.search("business school")][:2] == [2, 3]
+    assert index.search("unrelated words only") == []
+
+
+def test_approximate_search_agrees_with_exact_on_clustered_data(monkeypatch) -> None:
+    monkeypatch.setattr(semantic, "APPROXIMATE_MIN_ROWS", 50)
+    topics = [text.split() for text in DOCUMENTS.values()]
+    documents = [" ".join(topics[i % 4][j % len(topics[i % 4])] for j in range(i % 7 + 3)) for i in range(200)]
+    index = SemanticIndex(list(range(200)), documents)
+
+    exact = {uid for uid, _ in index.search("music conservatory", limit=5)}
+    approximate = {uid for uid, _ in index.search("music conservatory", limit=5, approximate=True)}
+
+    assert approximate == exact
+
+
+def test_approximate_search_with_empty_probed_clusters_returns_nothing(monkeypatch) -> None:
+    monkeypatch.setattr(semantic, "APPROXIMATE_MIN_ROWS", 4)
+    index = SemanticIndex(list(DOCUMENTS), list(DOCUMENTS.values()))
+    index._members = [np.array([], dtype=np.intp) for _ in index._members]
+
+    assert index.search("research university", approximate=True) == []
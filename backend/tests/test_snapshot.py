@@ -0,0 +1,88 @@
+"""Tests for the memory-mapped catalog snapshot."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core.catalog import bump_catalog_version
+from app.core.config import get_settings
+from app.services import matching, snapshot
+from app.services.matching import RequirementMatrix
+from app.services.snapshot import CatalogSnapshot, SnapshotError, SnapshotHandle, export_snapshot
+
+
+def test_snapshot_round_trips_catalog(session_factory: sessionmaker, tmp_path: Path) -> None:
+    path = tmp_path / "catalog.snap"
+    with session_factory() as session:
+        export_snapshot(session, path, catalog_version=7)
+
+    mapped = CatalogSnapshot(path)
+
+    assert mapped.version == 7
+    assert mapped.rows("universities") == 2
+    assert mapped.strings(mapped.column("universities", "name")) == [
+        "Nazarbayev University",
+        "Istanbul Technical University",
+    ]
+    assert mapped.strings(mapped.column("programs", "degree_level")) == ["bachelor", "master"]
+    assert mapped.column("requirements", "min_score").tolist() == [6.5, 1350.0, 7.0, 6.5, 7.0]
+    assert not mapped.column("requirements", "min_score").flags.writeable
+
+
+def test_matrix_from_snapshot_matches_database(session_factory: sessionmaker, tmp_path: Path) -> None:
+    path = tmp_path / "catalog.snap"
+    with session_factory() as session:
+        export_snapshot(session, path)
+        expected = RequirementMatrix.from_session(session)
+
+    actual = RequirementMatrix.from_snapshot(CatalogSnapshot(path))
+
+    assert actual.rows == expected.rows
+    assert actual.exams == expected.exams
+    np.testing.assert_array_equal(actual.thresholds, expected.thresholds)
+
+
+def test_handle_picks_up_atomic_swap(session_factory: sessionmaker, tmp_path: Path) -> None:
+    path = tmp_path / "catalog.snap"
+    handle = SnapshotHandle(path)
+    assert handle.current() is None
+
+    with session_factory() as session:
+        export_snapshot(session, path, catalog_version=1)
+        first = handle.current()
+        names = first.column("universities", "name")
+        export_snapshot(session, path, catalog_version=2)
+
+    assert handle.current().version == 2
+    assert handle.current() is handle.current()
+    # Readers of the replaced snapshot keep a valid mapping.
+    assert first.strings(names)[0] == "Nazarbayev University"
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_stale_snapshot_is_ignored(
+    session_factory: sessionmaker, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "catalog.snap"
+    monkeypatch.setattr(get_settings(), "catalog_snapshot_path", str(path))
+    monkeypatch.setattr(snapshot, "_handles", {})
+
+    with session_factory() as session:
+        export_snapshot(session, path)
+        assert snapshot.get_catalog_snapshot() is not None
+        assert matching.get_requirement_matrix(session).exams == ["IELTS", "SAT"]
+
+    bump_catalog_version()
+    assert snapshot.get_catalog_snapshot() is None
+
+
+def test_rejects_foreign_files(tmp_path: Path) -> None:
+    path = tmp_path / "catalog.snap"
+    path.write_bytes(b"not a snapshot at all, just text padding" * 2)
+
+    with pytest.raises(SnapshotError):
+        CatalogSnapshot(path)
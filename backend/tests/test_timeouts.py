@@ -0,0 +1,169 @@
+"""Tests for per-route statement timeouts and cancellation on client disconnect."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+import sqlalchemy as sa
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.core import metrics
+from app.core.config import get_settings
+from app.core.timeouts import StatementTimeoutMiddleware, route_timeout, statement_budget
+
+# Counts to 100 million: runs for many seconds unless interrupted.
+SLOW_QUERY = sa.text(
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 100000000) "
+    "SELECT count(*) FROM c"
+)
+SHORT_QUERY = sa.text(
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 10000) SELECT count(*) FROM c"
+)
+
+
+@pytest.fixture()
+def slow_app(session_factory: sessionmaker, monkeypatch: pytest.MonkeyPatch) -> FastAPI:
+    monkeypatch.setattr(get_settings(), "statement_timeout_routes", {"/slow": 50, "/patient": 30_000})
+    app = FastAPI()
+    app.add_middleware(StatementTimeoutMiddleware)
+
+    def run_slow_query() -> dict:
+        with session_factory() as session:
+            return {"count": session.scalar(SLOW_QUERY)}
+
+    app.get("/slow")(run_slow_query)
+    app.get("/patient")(run_slow_query)
+    return app
+
+
+def test_route_timeout_uses_longest_prefix(monkeypatch: pytest.MonkeyPatch) -> None:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "statement_timeout_ms", 2000)
+    monkeypatch.setattr(settings, "statement_timeout_routes", {"/api/admin": 60_000, "/api/admin/jobs": 0})
+
+    assert route_timeout("/api/universities") == 2.0
+    assert route_timeout("/api/admin/universities/bulk") == 60.0
+    assert route_timeout("/api/admin/jobs/1") == 0
+
+
+def test_budget_interrupts_long_statements(session_factory: sessionmaker) -> None:
+    started = time.monotonic()
+    with statement_budget(0.05) as budget, session_factory() as session:
+        with pytest.raises(OperationalError) as raised:
+            session.execute(SLOW_QUERY)
+
+    assert time.monotonic() - started < 5
+    assert budget.timed_out
+    assert budget.outcome(raised.value) == "timeout"
+
+    # The connection is returned to the pool without the budget's progress handler.
+    time.sleep(0.06)
+    with session_factory() as session:
+        assert session.scalar(SHORT_QUERY) == 10000
+
+
+def test_timeout_returns_503_with_metrics(slow_app: FastAPI) -> None:
+    before = metrics.counter("db.statement_timeouts./slow")
+
+    with TestClient(slow_app) as client:
+        response = client.get("/slow")
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert "retry" in response.json()["detail"]
+    assert metrics.counter("db.statement_timeouts./slow") == before + 1
+
+
+def test_client_disconnect_cancels_running_statement(slow_app: FastAPI) -> None:
+    before = metrics.counter("db.cancelled")
+    sent: list[dict] = []
+
+    async def call() -> None:
+        messages = iter([{"type": "http.request", "body": b"", "more_body": False}])
+
+        async def receive() -> dict:
+            message = next(messages, None)
+            if message is not None:
+                return message
+            await asyncio.sleep(0.1)  # the client goes away while the query runs
+            return {"type": "http.disconnect"}
+
+        async def send(message: dict) -> None:
+            sent.append(message)
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/patient",
+            "raw_path": b"/patient",
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"host", b"test")],
+            "client": ("127.0.0.1", 0),
+            "server": ("test", 80),
+        }
+        await slow_app(scope, receive, send)
+
+    started = time.monotonic()
+    asyncio.run(call())
+
+    assert time.monotonic() - started < 5
+    assert sent == []
+    assert metrics.counter("db.cancelled") == before + 1
+
+
+def test_request_body_is_streamed_to_the_endpoint(app_fixture, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Body chunks reach the endpoint as it reads them, so size limits apply early."""
+
+    settings = get_settings()
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    monkeypatch.setattr(settings, "cohort_max_upload_bytes", 4096)
+    chunks = 100
+    read = 0
+    sent: list[dict] = []
+
+    async def call() -> None:
+        async def receive() -> dict:
+            nonlocal read
+            if read == chunks:
+                await asyncio.sleep(10)
+                return {"type": "http.disconnect"}
+            read += 1
+            return {"type": "http.request", "body": b"x" * 1024, "more_body": read < chunks}
+
+        async def send(message: dict) -> None:
+            sent.append(message)
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "POST",
+            "scheme": "http",
+            "path": "/api/admin/cohort-match",
+            "raw_path": b"/api/admin/cohort-match",
+            "query_string": b"",
+            "root_path": "",
+            "headers": [
+                (b"host", b"test"),
+                (b"x-admin-token", b"secret"),
+                (b"content-type", b"text/csv"),
+                (b"transfer-encoding", b"chunked"),
+            ],
+            "client": ("127.0.0.1", 0),
+            "server": ("test", 80),
+        }
+        await app_fixture(scope, receive, send)
+
+    asyncio.run(call())
+
+    assert sent[0]["status"] == 413
+    assert read <= 5
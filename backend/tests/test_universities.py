@@ -2,7 +2,38 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator
+from contextlib import contextmanager
+
 from fastapi.testclient import TestClient
+from sqlalchemy import event, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import University
+from app.services.dimensions import DimensionIndex, NamedEntry, load_dimensions
+from app.services.university_service import (
+    LIST_SELECTION,
+    ListShape,
+    UniversityFilters,
+    _list_statements,
+)
+from app.services.fuzzy import MAX_CANDIDATES
+from app.services.suggest import MAX_DEPTH, MAX_SUGGESTIONS, PrefixIndex, Suggestion
+
+
+@contextmanager
+def recorded_statements(engine: Engine) -> Iterator[list[str]]:
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, *args) -> None:
+        statements.append(statement.lower())
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
 
 
 def test_universities_listing_returns_items(client: TestClient) -> None:
@@ -44,3 +75,180 @@ def test_universities_filter_by_country(client: TestClient) -> None:
 
     assert payload["total"] >= 1
     assert all(item["country"]["code"] == "KZ" for item in payload["items"])
+
+
+def test_suggest_returns_typed_prefix_matches(client: TestClient) -> None:
+    """Autocomplete matches word starts across universities, cities and programs."""
+
+    response = client.get("/api/universities/suggest", params={"prefix": "ist"})
+    assert response.status_code == 200
+    items = response.json()["items"]
+
+    assert {"label": "Istanbul Technical University", "type": "university", "value": "2"} in items
+    assert {"label": "Istanbul", "type": "city", "value": "Istanbul"} in items
+    assert items[0]["type"] == "university"
+
+    science = client.get("/api/universities/suggest", params={"prefix": "scien"}).json()
+    assert {item["label"] for item in science["items"]} == {"Computer Science", "Data Science"}
+
+
+def test_suggest_matches_prefixes_longer_than_the_trie() -> None:
+    """Long prefixes find every entry below the deepest node, not only its top entries."""
+
+    labels = [f"University of Technology Campus {n:02d}" for n in range(MAX_SUGGESTIONS + 10)]
+    index = PrefixIndex([Suggestion(label=label, type="university", value=label) for label in labels])
+    assert len(set(label[:MAX_DEPTH] for label in labels)) == 1
+
+    assert [item.label for item in index.suggest("university of technology campus 29")] == [labels[29]]
+    assert len(index.suggest("university of technology campus", limit=50)) == len(labels)
+
+
+def test_fuzzy_query_tolerates_typos(client: TestClient) -> None:
+    """Fuzzy search finds names with misspellings that substring search misses."""
+
+    params = {"q": "Nazarbaev"}
+    assert client.get("/api/universities", params=params).json()["total"] == 0
+
+    payload = client.get("/api/universities", params={**params, "fuzzy": "true"}).json()
+    assert [item["name"] for item in payload["items"]] == ["Nazarbayev University"]
+
+    unrelated = client.get("/api/universities", params={"q": "Sorbonne", "fuzzy": "true"}).json()
+    assert unrelated["total"] == 0
+
+    filtered = {**params, "fuzzy": "true", "country": "KZ", "exam": "IELTS"}
+    assert [item["id"] for item in client.get("/api/universities", params=filtered).json()["items"]] == [1]
+    assert client.get("/api/universities", params={**filtered, "country": "TR"}).json()["total"] == 0
+
+
+def test_fuzzy_query_counts_every_exact_match(client: TestClient, session_factory: sessionmaker) -> None:
+    """Common words are not cut off at the fuzzy index's candidate cap."""
+
+    names = [f"Polytechnic Campus {n:03d}" for n in range(MAX_CANDIDATES + 50)]
+    with session_factory() as session:
+        session.add_all(University(name=name, city="Almaty", country_id=1) for name in names)
+        session.commit()
+    try:
+        params = {"q": "polytechnic", "fuzzy": "true", "limit": 100, "page": 3}
+        payload = client.get("/api/universities", params=params).json()
+        assert payload["total"] == len(names)
+        assert [item["name"] for item in payload["items"]] == names[200:]
+    finally:
+        with session_factory() as session:
+            for university in session.scalars(select(University).where(University.name.in_(names))):
+                session.delete(university)
+            session.commit()
+
+
+def test_semantic_search_ranks_by_description(client: TestClient) -> None:
+    """Free-text search matches descriptions and program names, not just titles."""
+
+    response = client.get("/api/universities/search", params={"text": "strong in research"})
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert items[0]["name"] == "Nazarbayev University"
+    assert items[0]["score"] > 0
+
+    engineering = client.get("/api/universities/search", params={"text": "engineering"}).json()
+    assert [item["name"] for item in engineering["items"]] == ["Istanbul Technical University"]
+
+    unknown = client.get("/api/universities/search", params={"text": "zzzz"}).json()
+    assert unknown["items"] == []
+
+
+def test_list_sparse_fields_skip_columns_and_program_counts(client: TestClient, engine: Engine) -> None:
+    """Unrequested columns are not selected and program counts are not aggregated."""
+
+    with recorded_statements(engine) as statements:
+        response = client.get("/api/universities", params={"fields": "name", "include": "", "limit": 5})
+    assert response.status_code == 200
+
+    assert all(set(item) == {"id", "name"} for item in response.json()["items"])
+    assert statements
+    assert not any("requirements" in statement for statement in statements)
+    assert not any("description" in statement for statement in statements)
+
+
+def test_detail_include_skips_requirement_loading(client: TestClient, engine: Engine) -> None:
+    """Detail payloads only load requirements when programs are included."""
+
+    with recorded_statements(engine) as statements:
+        response = client.get("/api/universities/1", params={"fields": "name", "include": "country"})
+    assert response.status_code == 200
+
+    assert response.json() == {
+        "id": 1,
+        "name": "Nazarbayev University",
+        "country": {"code": "KZ", "name": "Kazakhstan"},
+    }
+    assert not any("requirements" in statement for statement in statements)
+
+    full = client.get("/api/universities/1").json()
+    assert {"description", "programs"}.issubset(full)
+
+
+def test_unknown_sparse_field_is_rejected(client: TestClient) -> None:
+    response = client.get("/api/universities", params={"fields": "name,rank"})
+
+    assert response.status_code == 400
+    assert "rank" in response.json()["detail"]
+
+
+def test_listing_reuses_prebuilt_statements_per_shape(client: TestClient, session_factory: sessionmaker) -> None:
+    """Requests differing only in filter values share one statement object."""
+
+    first = client.get("/api/universities", params={"country": "KZ", "limit": 7}).json()
+    second = client.get("/api/universities", params={"country": "tr", "limit": 7}).json()
+
+    assert [item["name"] for item in first["items"]] == ["Nazarbayev University"]
+    assert [item["name"] for item in second["items"]] == ["Istanbul Technical University"]
+    shape = ListShape.of(UniversityFilters(country_code="KZ"))
+    assert shape == ListShape.of(UniversityFilters(country_code="TR", page=3))
+    assert _list_statements(shape, LIST_SELECTION) is _list_statements(shape, LIST_SELECTION)
+    with session_factory() as session:
+        dimensions = load_dimensions(session)
+    assert shape.params(UniversityFilters(country_code="TR"), dimensions) == {"country_id": 2}
+
+
+def test_filters_resolve_names_to_ids(client: TestClient, session_factory: sessionmaker, engine: Engine) -> None:
+    filters = UniversityFilters(country_code=" kz ", program="computer science", exam="IELTS")
+    with session_factory() as session:
+        dimensions = load_dimensions(session)
+    assert ListShape.of(filters).params(filters, dimensions) == {
+        "country_id": 1,
+        "program_ids": [1],
+        "exam_ids": [1],
+    }
+
+    with recorded_statements(engine) as statements:
+        response = client.get(
+            "/api/universities", params={"country": "KZ", "program": "Computer Science", "exam": "ielts"}
+        )
+
+    assert [item["id"] for item in response.json()["items"]] == [1]
+    listing = [statement for statement in statements if "university_search" in statement]
+    assert listing
+    assert not any(
+        name in statement
+        for statement in listing
+        for name in ("country_code", "program_name", "exam_name", "countries", "lower(")
+    )
+
+
+def test_unknown_filter_names_skip_the_database(client: TestClient, engine: Engine) -> None:
+    client.get("/api/universities", params={"country": "KZ"})  # build the dimension index
+
+    for params in ({"country": "ZZ"}, {"program": "Astrology"}, {"exam": "GRE", "country": "KZ"}):
+        with recorded_statements(engine) as statements:
+            response = client.get("/api/universities", params=params)
+
+        assert response.status_code == 200
+        assert response.json()["items"] == []
+        assert response.json()["total"] == 0
+        assert not any("university" in statement for statement in statements)
+
+
+def test_program_name_matches_every_degree_variant() -> None:
+    dimensions = DimensionIndex(programs={"data science": NamedEntry("Data Science", (2, 5))})
+    filters = UniversityFilters(program="Data Science")
+
+    assert ListShape.of(filters).params(filters, dimensions) == {"program_ids": [2, 5]}
@@ -9,9 +9,13 @@ interface ChatHistory {
 
 interface ChatResponse {
   response: string;
+  conversation_id: string;
   tool_calls: string[] | null;
 }
 
+// History lives on the server; we only keep the conversation reference
+let conversationId: string | null = null;
+
 export const chatService = {
   // Send message to AI assistant
   async sendMessage(content: string, chatHistory: ChatHistory[] = []): Promise<string> {
@@ -22,7 +26,9 @@ export const chatService = {
       },
       body: JSON.stringify({
         message: content,
-        chat_history: chatHistory,
+        conversation_id: conversationId,
+        // Only needed to seed a conversation the server does not know yet
+        chat_history: conversationId ? undefined : chatHistory,
       }),
     });
 
@@ -32,6 +38,7 @@ export const chatService = {
     }
 
     const data: ChatResponse = await response.json();
+    conversationId = data.conversation_id;
     return data.response;
   },
 };